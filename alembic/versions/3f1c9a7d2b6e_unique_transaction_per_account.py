@@ -0,0 +1,37 @@
+"""Unique transaction per account
+
+Revision ID: 3f1c9a7d2b6e
+Revises: 0694a37530a9
+Create Date: 2025-07-02 10:14:27.318402
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3f1c9a7d2b6e"
+down_revision: Union[str, None] = "0694a37530a9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_unique_constraint(
+        "uq_transactions_account_id_transaction_id",
+        "transactions",
+        ["account_id", "transaction_id"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint(
+        "uq_transactions_account_id_transaction_id",
+        "transactions",
+        type_="unique",
+    )
@@ -0,0 +1,99 @@
+"""Add spending stats
+
+Revision ID: 4c7e1a9b3d52
+Revises: f6a2d9c4e803
+Create Date: 2025-07-23 09:17:36.402815
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "4c7e1a9b3d52"
+down_revision: Union[str, None] = "f6a2d9c4e803"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "category_stats",
+        sa.Column("user_id", sa.Uuid(), nullable=False),
+        sa.Column("category", sa.String(length=50), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.Column("mean", sa.Float(), nullable=False),
+        sa.Column("m2", sa.Float(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("user_id", "category"),
+    )
+    op.create_table(
+        "merchant_activity",
+        sa.Column("user_id", sa.Uuid(), nullable=False),
+        sa.Column("merchant", sa.String(), nullable=False),
+        sa.Column("txn_count", sa.Integer(), nullable=False),
+        sa.Column("first_seen", sa.Date(), nullable=False),
+        sa.Column("last_seen", sa.Date(), nullable=False),
+        sa.Column("last_amount", sa.Float(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("user_id", "merchant"),
+    )
+    # Backfill from existing debits. The sum of squared deviations is
+    # derived from the sums, which is exact enough for kobo amounts.
+    op.execute(
+        """
+        INSERT INTO category_stats (user_id, category, count, mean, m2, updated_at)
+        SELECT
+            user_id,
+            COALESCE(category, 'other'),
+            COUNT(*),
+            AVG(amount),
+            SUM(amount * amount) - SUM(amount) * SUM(amount) / COUNT(*),
+            CURRENT_TIMESTAMP
+        FROM transactions
+        WHERE transaction_type = 'debit' AND amount <> 0
+        GROUP BY user_id, COALESCE(category, 'other')
+        """
+    )
+    # The last amount is left unknown, so a duplicate of the last backfilled
+    # charge goes unflagged
+    op.execute(
+        """
+        INSERT INTO merchant_activity (
+            user_id, merchant, txn_count, first_seen, last_seen, last_amount,
+            updated_at
+        )
+        SELECT
+            user_id,
+            normalized_description,
+            COUNT(*),
+            MIN(transaction_date),
+            MAX(transaction_date),
+            0,
+            CURRENT_TIMESTAMP
+        FROM transactions
+        WHERE transaction_type = 'debit'
+            AND amount <> 0
+            AND normalized_description IS NOT NULL
+            AND normalized_description <> ''
+        GROUP BY user_id, normalized_description
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("merchant_activity")
+    op.drop_table("category_stats")
@@ -0,0 +1,56 @@
+"""Add transaction listing indexes
+
+Revision ID: 5d8f2b7c9e14
+Revises: e91a3c5f7d20
+Create Date: 2025-07-11 14:22:05.816330
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5d8f2b7c9e14"
+down_revision: Union[str, None] = "e91a3c5f7d20"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_transactions_account_id_transaction_date_id",
+        "transactions",
+        ["account_id", "transaction_date", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_transactions_account_id_category_transaction_date_id",
+        "transactions",
+        ["account_id", "category", "transaction_date", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_transactions_account_id_transaction_type_transaction_date_id",
+        "transactions",
+        ["account_id", "transaction_type", "transaction_date", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_transactions_account_id_transaction_type_transaction_date_id",
+        table_name="transactions",
+    )
+    op.drop_index(
+        "ix_transactions_account_id_category_transaction_date_id",
+        table_name="transactions",
+    )
+    op.drop_index(
+        "ix_transactions_account_id_transaction_date_id", table_name="transactions"
+    )
@@ -0,0 +1,37 @@
+"""Add sync watermark to linked accounts
+
+Revision ID: 8b2e4d1f6a90
+Revises: 3f1c9a7d2b6e
+Create Date: 2025-07-04 16:42:09.551873
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8b2e4d1f6a90"
+down_revision: Union[str, None] = "3f1c9a7d2b6e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "linked_accounts",
+        sa.Column("last_transaction_date", sa.Date(), nullable=True),
+    )
+    op.add_column(
+        "linked_accounts",
+        sa.Column("last_synced_at", sa.DateTime(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("linked_accounts", "last_synced_at")
+    op.drop_column("linked_accounts", "last_transaction_date")
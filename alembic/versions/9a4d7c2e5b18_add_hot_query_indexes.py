@@ -0,0 +1,57 @@
+"""Add hot query indexes
+
+Revision ID: 9a4d7c2e5b18
+Revises: 4c7e1a9b3d52
+Create Date: 2025-07-29 10:41:17.264508
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9a4d7c2e5b18"
+down_revision: Union[str, None] = "4c7e1a9b3d52"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_transactions_user_id_transaction_date_id",
+        "transactions",
+        ["user_id", "transaction_date", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_transactions_transaction_id",
+        "transactions",
+        ["transaction_id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_linked_accounts_user_id"),
+        "linked_accounts",
+        ["user_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_otp_user_id_is_used",
+        "otp",
+        ["user_id", "is_used"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_otp_user_id_is_used", table_name="otp")
+    op.drop_index(op.f("ix_linked_accounts_user_id"), table_name="linked_accounts")
+    op.drop_index("ix_transactions_transaction_id", table_name="transactions")
+    op.drop_index(
+        "ix_transactions_user_id_transaction_date_id", table_name="transactions"
+    )
@@ -0,0 +1,68 @@
+"""Add daily spend rollup
+
+Revision ID: a3e6c1d8f572
+Revises: 5d8f2b7c9e14
+Create Date: 2025-07-14 16:08:43.120957
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a3e6c1d8f572"
+down_revision: Union[str, None] = "5d8f2b7c9e14"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "daily_spend",
+        sa.Column("user_id", sa.Uuid(), nullable=False),
+        sa.Column("account_id", sa.Uuid(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("category", sa.String(length=50), nullable=False),
+        sa.Column("txn_count", sa.Integer(), nullable=False),
+        sa.Column("debit_total", sa.Float(), nullable=False),
+        sa.Column("credit_total", sa.Float(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["account_id"],
+            ["linked_accounts.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("user_id", "account_id", "day", "category"),
+    )
+    # Backfill from existing transactions
+    op.execute(
+        """
+        INSERT INTO daily_spend (
+            user_id, account_id, day, category,
+            txn_count, debit_total, credit_total, updated_at
+        )
+        SELECT
+            user_id,
+            account_id,
+            transaction_date,
+            COALESCE(category, 'other'),
+            COUNT(*),
+            COALESCE(SUM(CASE WHEN transaction_type = 'debit' THEN amount END), 0),
+            COALESCE(SUM(CASE WHEN transaction_type = 'credit' THEN amount END), 0),
+            CURRENT_TIMESTAMP
+        FROM transactions
+        GROUP BY user_id, account_id, transaction_date, COALESCE(category, 'other')
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("daily_spend")
@@ -0,0 +1,32 @@
+"""Rescan recurring payments by merchant key
+
+Revision ID: a5c8e1f3b920
+Revises: e4b9c2d7a813
+Create Date: 2025-08-12 14:05:51.731260
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a5c8e1f3b920"
+down_revision: Union[str, None] = "e4b9c2d7a813"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Payments were tracked per narration, one row for every transfer
+    # reference, so each account is scanned again from its full history
+    op.execute("DELETE FROM recurring_payments")
+    op.execute("UPDATE linked_accounts SET recurring_scanned_at = NULL")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DELETE FROM recurring_payments")
+    op.execute("UPDATE linked_accounts SET recurring_scanned_at = NULL")
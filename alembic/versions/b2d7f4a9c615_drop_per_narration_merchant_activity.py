@@ -0,0 +1,38 @@
+"""Drop merchant activity tracked per narration
+
+Revision ID: b2d7f4a9c615
+Revises: a5c8e1f3b920
+Create Date: 2025-08-12 15:21:08.946172
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b2d7f4a9c615"
+down_revision: Union[str, None] = "a5c8e1f3b920"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Narrations no merchant was recognised in were tracked verbatim, one row
+    # per transfer reference. Their payees are tracked by merchant key from
+    # the next sync on, and recognised merchants keep their activity.
+    op.execute(
+        "DELETE FROM merchant_activity WHERE EXISTS ("
+        "SELECT 1 FROM transactions "
+        "WHERE transactions.user_id = merchant_activity.user_id "
+        "AND transactions.normalized_description = merchant_activity.merchant "
+        "AND transactions.normalized_description = transactions.raw_description)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # The dropped rows cannot be restored, and are not needed by older code
+    pass
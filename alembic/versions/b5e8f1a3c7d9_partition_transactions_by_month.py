@@ -0,0 +1,148 @@
+"""Partition transactions by month
+
+Revision ID: b5e8f1a3c7d9
+Revises: 9a4d7c2e5b18
+Create Date: 2025-08-04 11:26:39.518207
+
+"""
+
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core import settings
+from app.db.partitions import (
+    add_months,
+    create_default_partition,
+    create_transaction_partitions,
+    month_start,
+    partitioning_enabled,
+)
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b5e8f1a3c7d9"
+down_revision: Union[str, None] = "9a4d7c2e5b18"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Indexes of the transactions table, recreated after a conversion
+TRANSACTION_INDEXES = {
+    "ix_transactions_account_id_transaction_date_id": [
+        "account_id",
+        "transaction_date",
+        "id",
+    ],
+    "ix_transactions_account_id_category_transaction_date_id": [
+        "account_id",
+        "category",
+        "transaction_date",
+        "id",
+    ],
+    "ix_transactions_account_id_transaction_type_transaction_date_id": [
+        "account_id",
+        "transaction_type",
+        "transaction_date",
+        "id",
+    ],
+    "ix_transactions_account_id_created_at": ["account_id", "created_at"],
+    "ix_transactions_user_id_transaction_date_id": [
+        "user_id",
+        "transaction_date",
+        "id",
+    ],
+    "ix_transactions_transaction_id": ["transaction_id"],
+}
+
+
+def _copy_transactions(partitioned: bool) -> None:
+    """
+    Rebuild the transactions table, partitioned by month or not, with its
+    rows. Constraints and indexes are created after the copy.
+    """
+    op.execute("ALTER TABLE transactions RENAME TO transactions_previous")
+    partition_by = " PARTITION BY RANGE (transaction_date)" if partitioned else ""
+    op.execute(
+        "CREATE TABLE transactions "
+        f"(LIKE transactions_previous INCLUDING DEFAULTS){partition_by}"
+    )
+    if partitioned:
+        bind = op.get_bind()
+        oldest = bind.execute(
+            sa.text("SELECT min(transaction_date) FROM transactions_previous")
+        ).scalar()
+        current = month_start(date.today())
+        first = add_months(current, -settings.TRANSACTION_PARTITIONS_HISTORY_MONTHS)
+        if oldest is not None:
+            first = min(first, month_start(oldest))
+        last = add_months(current, settings.TRANSACTION_PARTITIONS_AHEAD_MONTHS)
+        months = []
+        while first <= last:
+            months.append(first)
+            first = add_months(first, 1)
+        create_transaction_partitions(bind, months)
+        create_default_partition(bind)
+    op.execute("INSERT INTO transactions SELECT * FROM transactions_previous")
+    op.execute("DROP TABLE transactions_previous")
+
+    # Unique keys of a partitioned table must include the partition key
+    op.create_primary_key(
+        "transactions_pkey",
+        "transactions",
+        ["id", "transaction_date"] if partitioned else ["id"],
+    )
+    if partitioned:
+        op.create_unique_constraint(
+            "uq_transactions_account_id_transaction_id_transaction_date",
+            "transactions",
+            ["account_id", "transaction_id", "transaction_date"],
+        )
+    else:
+        op.create_unique_constraint(
+            "uq_transactions_account_id_transaction_id",
+            "transactions",
+            ["account_id", "transaction_id"],
+        )
+    op.create_foreign_key(
+        "transactions_account_id_fkey",
+        "transactions",
+        "linked_accounts",
+        ["account_id"],
+        ["id"],
+    )
+    op.create_foreign_key(
+        "transactions_user_id_fkey", "transactions", "users", ["user_id"], ["id"]
+    )
+    for name, columns in TRANSACTION_INDEXES.items():
+        op.create_index(name, "transactions", columns, unique=False)
+
+
+def _is_partitioned() -> bool:
+    return bool(
+        op.get_bind()
+        .execute(
+            sa.text(
+                "SELECT 1 FROM pg_partitioned_table "
+                "WHERE partrelid = 'transactions'::regclass"
+            )
+        )
+        .scalar()
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Only a partitioned table deduplicates on the transaction date too, since
+    # its unique keys must include the partition key. Unpartitioned tables
+    # keep (account_id, transaction_id), which also catches re-dated rows
+    if partitioning_enabled(op.get_bind()):
+        _copy_transactions(partitioned=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql" and _is_partitioned():
+        _copy_transactions(partitioned=False)
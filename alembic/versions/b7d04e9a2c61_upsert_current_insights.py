@@ -0,0 +1,79 @@
+"""Upsert current insights per user, period and kind
+
+Revision ID: b7d04e9a2c61
+Revises: a3e6c1d8f572
+Create Date: 2025-07-16 10:27:35.448201
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b7d04e9a2c61"
+down_revision: Union[str, None] = "a3e6c1d8f572"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# The kind of each message generated before insights had one, by its prefix
+LEGACY_KINDS = {
+    "Total spent in the last 30 days": "total_spent",
+    "Top category in the last 30 days": "top_category",
+    "Bottom category in the last 30 days": "bottom_category",
+    "You've spent over": "high_spending",
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "insights",
+        sa.Column("period", sa.String(length=20), nullable=False, server_default="30d"),
+    )
+    op.add_column(
+        "insights",
+        sa.Column("kind", sa.String(length=50), nullable=False, server_default="info"),
+    )
+    # Every generation appended another copy of each insight, so existing rows
+    # get the kind their message was generated for, and only the newest of
+    # each user's kinds is kept
+    insights = sa.table(
+        "insights", sa.column("message", sa.String), sa.column("kind", sa.String)
+    )
+    op.execute(
+        insights.update().values(
+            kind=sa.case(
+                *(
+                    (insights.c.message.startswith(prefix, autoescape=True), kind)
+                    for prefix, kind in LEGACY_KINDS.items()
+                ),
+                else_="info",
+            )
+        )
+    )
+    op.execute(
+        "DELETE FROM insights WHERE id IN ("
+        "SELECT id FROM (SELECT id, row_number() OVER ("
+        "PARTITION BY user_id, period, kind ORDER BY created_at DESC, id DESC"
+        ") AS position FROM insights) ranked WHERE position > 1)"
+    )
+    op.create_unique_constraint(
+        "uq_insights_user_id_period_kind",
+        "insights",
+        ["user_id", "period", "kind"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint(
+        "uq_insights_user_id_period_kind",
+        "insights",
+        type_="unique",
+    )
+    op.drop_column("insights", "kind")
+    op.drop_column("insights", "period")
@@ -0,0 +1,161 @@
+"""Compact transaction columns
+
+Revision ID: c3f7a9e1d4b6
+Revises: b5e8f1a3c7d9
+Create Date: 2025-08-08 15:03:52.771940
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c3f7a9e1d4b6"
+down_revision: Union[str, None] = "b5e8f1a3c7d9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CATEGORY_INDEX = "ix_transactions_account_id_category_transaction_date_id"
+TRANSACTION_TYPE_INDEX = (
+    "ix_transactions_account_id_transaction_type_transaction_date_id"
+)
+
+
+def _recreate_indexes() -> None:
+    op.create_index(
+        CATEGORY_INDEX,
+        "transactions",
+        ["account_id", "category", "transaction_date", "id"],
+        unique=False,
+    )
+    op.create_index(
+        TRANSACTION_TYPE_INDEX,
+        "transactions",
+        ["account_id", "transaction_type", "transaction_date", "id"],
+        unique=False,
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "transaction_categories",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("name", sa.String(length=50), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("name"),
+    )
+    transaction_types = op.create_table(
+        "transaction_types",
+        sa.Column("id", sa.SmallInteger(), autoincrement=False, nullable=False),
+        sa.Column("name", sa.String(length=10), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("name"),
+    )
+    op.bulk_insert(
+        transaction_types, [{"id": 1, "name": "debit"}, {"id": 2, "name": "credit"}]
+    )
+    op.execute(
+        "INSERT INTO transaction_categories (name) "
+        "SELECT category FROM transactions WHERE category IS NOT NULL "
+        "UNION SELECT category FROM categorization_rules WHERE category IS NOT NULL"
+    )
+
+    op.drop_index(CATEGORY_INDEX, table_name="transactions")
+    op.drop_index(TRANSACTION_TYPE_INDEX, table_name="transactions")
+    # Users' categorization rules create categories, so category codes are
+    # full integers, unlike the two fixed transaction types
+    op.add_column(
+        "transactions", sa.Column("category_code", sa.Integer(), nullable=True)
+    )
+    op.execute(
+        "UPDATE transactions SET category_code = transaction_categories.id "
+        "FROM transaction_categories "
+        "WHERE transaction_categories.name = transactions.category"
+    )
+    op.drop_column("transactions", "category")
+    op.alter_column("transactions", "category_code", new_column_name="category")
+    op.alter_column(
+        "transactions",
+        "transaction_type",
+        type_=sa.SmallInteger(),
+        postgresql_using=(
+            "CASE transaction_type WHEN 'debit' THEN 1 WHEN 'credit' THEN 2 END"
+        ),
+    )
+    op.alter_column(
+        "transactions",
+        "amount",
+        type_=sa.BigInteger(),
+        postgresql_using="round(amount)::bigint",
+    )
+    op.create_foreign_key(
+        "transactions_category_fkey",
+        "transactions",
+        "transaction_categories",
+        ["category"],
+        ["id"],
+    )
+    op.create_foreign_key(
+        "transactions_transaction_type_fkey",
+        "transactions",
+        "transaction_types",
+        ["transaction_type"],
+        ["id"],
+    )
+    _recreate_indexes()
+
+    for column in ("debit_total", "credit_total"):
+        op.alter_column(
+            "daily_spend",
+            column,
+            type_=sa.BigInteger(),
+            postgresql_using=f"round({column})::bigint",
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for column in ("debit_total", "credit_total"):
+        op.alter_column(
+            "daily_spend",
+            column,
+            type_=sa.Float(),
+            postgresql_using=f"{column}::double precision",
+        )
+
+    op.drop_constraint(
+        "transactions_transaction_type_fkey", "transactions", type_="foreignkey"
+    )
+    op.drop_constraint("transactions_category_fkey", "transactions", type_="foreignkey")
+    op.drop_index(CATEGORY_INDEX, table_name="transactions")
+    op.drop_index(TRANSACTION_TYPE_INDEX, table_name="transactions")
+    op.alter_column(
+        "transactions",
+        "amount",
+        type_=sa.Float(),
+        postgresql_using="amount::double precision",
+    )
+    op.alter_column(
+        "transactions",
+        "transaction_type",
+        type_=sa.String(length=10),
+        postgresql_using="CASE transaction_type WHEN 1 THEN 'debit' ELSE 'credit' END",
+    )
+    op.add_column(
+        "transactions", sa.Column("category_name", sa.String(), nullable=True)
+    )
+    op.execute(
+        "UPDATE transactions SET category_name = transaction_categories.name "
+        "FROM transaction_categories "
+        "WHERE transaction_categories.id = transactions.category"
+    )
+    op.drop_column("transactions", "category")
+    op.alter_column("transactions", "category_name", new_column_name="category")
+    _recreate_indexes()
+
+    op.drop_table("transaction_types")
+    op.drop_table("transaction_categories")
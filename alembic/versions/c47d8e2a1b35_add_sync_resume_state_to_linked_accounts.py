@@ -0,0 +1,37 @@
+"""Add sync resume state to linked accounts
+
+Revision ID: c47d8e2a1b35
+Revises: 8b2e4d1f6a90
+Create Date: 2025-07-08 11:03:51.207664
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c47d8e2a1b35"
+down_revision: Union[str, None] = "8b2e4d1f6a90"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "linked_accounts",
+        sa.Column("sync_window_start", sa.Date(), nullable=True),
+    )
+    op.add_column(
+        "linked_accounts",
+        sa.Column("sync_resume_page", sa.Integer(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("linked_accounts", "sync_resume_page")
+    op.drop_column("linked_accounts", "sync_window_start")
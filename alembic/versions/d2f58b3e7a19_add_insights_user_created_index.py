@@ -0,0 +1,34 @@
+"""Add insights (user_id, created_at) index
+
+Revision ID: d2f58b3e7a19
+Revises: b7d04e9a2c61
+Create Date: 2025-07-17 09:12:48.905316
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d2f58b3e7a19"
+down_revision: Union[str, None] = "b7d04e9a2c61"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_insights_user_id_created_at",
+        "insights",
+        ["user_id", "created_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_insights_user_id_created_at", table_name="insights")
@@ -0,0 +1,32 @@
+"""Add sync window end to linked accounts
+
+Revision ID: e4b9c2d7a813
+Revises: c3f7a9e1d4b6
+Create Date: 2025-08-11 09:42:17.304518
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e4b9c2d7a813"
+down_revision: Union[str, None] = "c3f7a9e1d4b6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "linked_accounts",
+        sa.Column("sync_window_end", sa.Date(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("linked_accounts", "sync_window_end")
@@ -0,0 +1,61 @@
+"""Add categorization rules
+
+Revision ID: e91a3c5f7d20
+Revises: c47d8e2a1b35
+Create Date: 2025-07-10 09:41:12.532018
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e91a3c5f7d20"
+down_revision: Union[str, None] = "c47d8e2a1b35"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "categorization_rules",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("user_id", sa.Uuid(), nullable=True),
+        sa.Column("keyword", sa.String(), nullable=False),
+        sa.Column("merchant", sa.String(), nullable=True),
+        sa.Column("category", sa.String(), nullable=True),
+        sa.Column("priority", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_categorization_rules_user_id"),
+        "categorization_rules",
+        ["user_id"],
+        unique=False,
+    )
+    op.create_table(
+        "categorization_rule_version",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("categorization_rule_version")
+    op.drop_index(
+        op.f("ix_categorization_rules_user_id"), table_name="categorization_rules"
+    )
+    op.drop_table("categorization_rules")
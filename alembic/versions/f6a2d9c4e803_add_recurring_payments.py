@@ -0,0 +1,74 @@
+"""Add recurring payments
+
+Revision ID: f6a2d9c4e803
+Revises: d2f58b3e7a19
+Create Date: 2025-07-21 10:42:17.583104
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f6a2d9c4e803"
+down_revision: Union[str, None] = "d2f58b3e7a19"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "recurring_payments",
+        sa.Column("account_id", sa.Uuid(), nullable=False),
+        sa.Column("merchant", sa.String(), nullable=False),
+        sa.Column("user_id", sa.Uuid(), nullable=False),
+        sa.Column("charge_count", sa.Integer(), nullable=False),
+        sa.Column("streak", sa.Integer(), nullable=False),
+        sa.Column("streak_start", sa.Date(), nullable=False),
+        sa.Column("average_amount", sa.Float(), nullable=False),
+        sa.Column("average_interval_days", sa.Float(), nullable=True),
+        sa.Column("last_amount", sa.Float(), nullable=False),
+        sa.Column("last_date", sa.Date(), nullable=False),
+        sa.Column("next_expected_date", sa.Date(), nullable=True),
+        sa.Column("is_recurring", sa.Boolean(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["account_id"],
+            ["linked_accounts.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("account_id", "merchant"),
+    )
+    op.create_index(
+        op.f("ix_recurring_payments_user_id"),
+        "recurring_payments",
+        ["user_id"],
+        unique=False,
+    )
+    op.add_column(
+        "linked_accounts",
+        sa.Column("recurring_scanned_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index(
+        "ix_transactions_account_id_created_at",
+        "transactions",
+        ["account_id", "created_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_transactions_account_id_created_at", table_name="transactions")
+    op.drop_column("linked_accounts", "recurring_scanned_at")
+    op.drop_index(
+        op.f("ix_recurring_payments_user_id"), table_name="recurring_payments"
+    )
+    op.drop_table("recurring_payments")
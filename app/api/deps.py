@@ -1,9 +1,16 @@
 from fastapi.security import OAuth2PasswordBearer
 from fastapi import Depends, HTTPException, status
 from sqlmodel.orm.session import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.concurrency import run_in_threadpool
 from app.models import User
 from sqlmodel import select
-from app.db.session import get_session
+from app.db.session import (
+    async_engine,
+    async_replica_engine,
+    get_async_session,
+    reads_from_primary,
+)
 from passlib.context import CryptContext
 from app.core import settings
 import jwt
@@ -38,6 +45,15 @@ def get_user_by_email(db: Session, email: str) -> User | None:
     return user
 
 
+async def get_user_by_email_async(db: AsyncSession, email: str) -> User | None:
+    """
+    Get a user by email.
+    """
+    hashed_email = hash_email(email)
+    result = await db.exec(select(User).where(User.hashed_email == hashed_email))
+    return result.first()
+
+
 def authenticate_user(db: Session, email: str, password: str) -> User | None:
     """
     Authenticate a user by email and password.
@@ -48,6 +64,21 @@ def authenticate_user(db: Session, email: str, password: str) -> User | None:
     return user
 
 
+async def authenticate_user_async(
+    db: AsyncSession, email: str, password: str
+) -> User | None:
+    """
+    Authenticate a user by email and password.
+    The bcrypt check runs in a worker thread so it doesn't block the event loop.
+    """
+    user = await get_user_by_email_async(db=db, email=email)
+    if not user or not await run_in_threadpool(
+        verify_password, password, user.hashed_password
+    ):
+        return None
+    return user
+
+
 def create_access_token(data: dict, expires_delta: timedelta | None) -> str:
     """
     Create a JWT access token.
@@ -68,8 +99,8 @@ def create_access_token(data: dict, expires_delta: timedelta | None) -> str:
     return encoded_jwt
 
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme), db: Session = Depends(get_session)
+async def get_current_user(
+    token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_session)
 ) -> User:
     """
     Get the current user from the token.
@@ -93,7 +124,7 @@ def get_current_user(
     except jwt.PyJWTError:
         raise credentials_exception
     decrypted_email = security.decrypt(encrypted_data=email)
-    user = get_user_by_email(db=db, email=decrypted_email)
+    user = await get_user_by_email_async(db=db, email=decrypted_email)
     if user is None:
         raise credentials_exception
     return user
@@ -101,7 +132,6 @@ def get_current_user(
 
 def verified_user(
     user: User = Depends(get_current_user),
-    db: Session = Depends(get_session),
 ) -> User:
     """
     Ensure the user is verified.
@@ -112,3 +142,17 @@ def verified_user(
             detail="User email is not verified",
         )
     return user
+
+
+async def get_user_read_session(user: User = Depends(verified_user)):
+    """
+    Creates a read-only AsyncSession for the current user's request. It reads
+    from the replica, unless the user wrote recently and must see their own
+    writes on the primary.
+    """
+    primary = not settings.DATABASE_REPLICA_URL or await run_in_threadpool(
+        reads_from_primary, user.id
+    )
+    bind = async_engine if primary else async_replica_engine
+    async with AsyncSession(bind, expire_on_commit=False) as session:
+        yield session
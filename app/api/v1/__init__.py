@@ -5,6 +5,13 @@ from app.api.v1.endpoints.transactions import router as transactions_router
 from app.api.v1.endpoints.insights import router as insights_router
 from app.api.v1.endpoints.assistant import router as assistant_router
 from app.api.v1.endpoints.webhooks import router as webhooks_router
+from app.api.v1.endpoints.analytics import router as analytics_router
+from app.api.v1.endpoints.recurring_payments import (
+    router as recurring_payments_router,
+)
+from app.api.v1.endpoints.categorization_rules import (
+    router as categorization_rules_router,
+)
 
 __all__ = [
     "accounts_router",
@@ -14,4 +21,7 @@ __all__ = [
     "insights_router",
     "assistant_router",
     "webhooks_router",
+    "categorization_rules_router",
+    "analytics_router",
+    "recurring_payments_router",
 ]
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, Body, status
-from sqlmodel import Session
-from app.db.session import get_session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from app.db.session import get_async_session, mark_recent_write
 from app.services.mono_client import (
     exchange_code_for_token,
     fetch_account_details,
@@ -8,9 +9,9 @@ from app.services.mono_client import (
 from typing import Annotated
 from uuid import uuid4
 from datetime import datetime
-from app.api.deps import verified_user
+from app.api.deps import get_user_read_session, verified_user
 from app.models import User, LinkedAccount
-from app.crud import get_linked_accounts_by_user_id
+from app.crud import get_linked_accounts_by_user_id_async
 from app.services.security import SecurityService
 from app.schemas import LinkedAccountReturnDetails, LinkedAccountReturnList, AccountCode
 from app.utils.logger import logger
@@ -26,7 +27,7 @@ router = APIRouter(prefix="/api/v1/accounts", tags=["Accounts"])
 @router.post("/link", response_model=LinkedAccountReturnDetails, status_code=201)
 async def link_account(
     code: Annotated[AccountCode, Body(description="Authorization code from Mono")],
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     user: User = Depends(verified_user),
 ):
     """
@@ -73,8 +74,9 @@ async def link_account(
             updated_at=datetime.now(),
         )
         session.add(linked_account)
-        session.commit()
-        session.refresh(linked_account)
+        await session.commit()
+        await session.refresh(linked_account)
+        await run_in_threadpool(mark_recent_write, user.id)
 
         # decrypt sensitive fields for the response
         linked_account.provider_account_id = security.decrypt(
@@ -110,11 +112,13 @@ async def link_account(
 
 @router.get("/", status_code=status.HTTP_200_OK)
 async def get_linked_accounts(
-    db: Session = Depends(get_session),
+    db: AsyncSession = Depends(get_user_read_session),
     user: User = Depends(verified_user),
 ):
     try:
-        linked_accounts = get_linked_accounts_by_user_id(db=db, user_id=user.id)
+        linked_accounts = await get_linked_accounts_by_user_id_async(
+            db=db, user_id=user.id
+        )
         decrypted_linked_accounts = []
         for account in linked_accounts:
             # Decrypt sensitive fields
@@ -0,0 +1,123 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import Annotated
+from uuid import UUID
+from datetime import date, timedelta
+from app.api.deps import get_user_read_session, verified_user
+from app.models import User
+from app.crud import (
+    get_category_totals_async,
+    get_daily_totals_async,
+    get_linked_account_by_id_async,
+)
+from app.schemas import CategorySpendReturnList, DailySpendReturnList
+from app.core import settings
+
+
+router = APIRouter(prefix="/api/v1/analytics", tags=["Analytics"])
+
+
+def _date_range(start_date: date | None, end_date: date | None) -> tuple[date, date]:
+    """Default to the last ANALYTICS_DEFAULT_DAYS days and validate the range."""
+    end_date = end_date or date.today()
+    start_date = start_date or end_date - timedelta(
+        days=settings.ANALYTICS_DEFAULT_DAYS
+    )
+    if start_date > end_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start_date must be on or before end_date",
+        )
+    return start_date, end_date
+
+
+async def _owned_account_id(
+    session: AsyncSession, user: User, account_id: UUID | None
+) -> UUID | None:
+    """Resolve an optional account filter, checking it belongs to the user."""
+    if not account_id:
+        return None
+    linked_account = await get_linked_account_by_id_async(
+        db=session, account_id=account_id
+    )
+    if not linked_account or linked_account.user_id != user.id:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized Access"
+        )
+    return linked_account.id
+
+
+@router.get("/daily", response_model=DailySpendReturnList, status_code=200)
+async def get_daily_spend(
+    start_date: Annotated[date | None, Query()] = None,
+    end_date: Annotated[date | None, Query()] = None,
+    account_id: Annotated[
+        UUID | None, Query(description="Only include this linked account")
+    ] = None,
+    session: AsyncSession = Depends(get_user_read_session),
+    user: User = Depends(verified_user),
+):
+    """Get the user's debit and credit totals per day, in kobo.
+    Read from the daily spending rollup, so the cost depends on the number of
+    days in the range rather than the number of transactions.
+
+    Args:
+        start_date (date, optional): Defaults to ANALYTICS_DEFAULT_DAYS ago.
+        end_date (date, optional): Defaults to today.
+        account_id (UUID, optional): Only include this linked account.
+        session (AsyncSession, optional): A read session, on the replica if any.
+    """
+    start_date, end_date = _date_range(start_date, end_date)
+    totals = await get_daily_totals_async(
+        db=session,
+        user_id=user.id,
+        start_date=start_date,
+        end_date=end_date,
+        account_id=await _owned_account_id(session, user, account_id),
+    )
+    return DailySpendReturnList(
+        success=True,
+        status="200",
+        message="Daily spending retrieved successfully",
+        start_date=start_date,
+        end_date=end_date,
+        data=[row._asdict() for row in totals],
+    )
+
+
+@router.get("/categories", response_model=CategorySpendReturnList, status_code=200)
+async def get_category_spend(
+    start_date: Annotated[date | None, Query()] = None,
+    end_date: Annotated[date | None, Query()] = None,
+    account_id: Annotated[
+        UUID | None, Query(description="Only include this linked account")
+    ] = None,
+    session: AsyncSession = Depends(get_user_read_session),
+    user: User = Depends(verified_user),
+):
+    """Get the user's debit and credit totals per category, in kobo.
+    Read from the daily spending rollup, so the cost depends on days times
+    categories rather than the number of transactions.
+
+    Args:
+        start_date (date, optional): Defaults to ANALYTICS_DEFAULT_DAYS ago.
+        end_date (date, optional): Defaults to today.
+        account_id (UUID, optional): Only include this linked account.
+        session (AsyncSession, optional): A read session, on the replica if any.
+    """
+    start_date, end_date = _date_range(start_date, end_date)
+    totals = await get_category_totals_async(
+        db=session,
+        user_id=user.id,
+        start_date=start_date,
+        end_date=end_date,
+        account_id=await _owned_account_id(session, user, account_id),
+    )
+    return CategorySpendReturnList(
+        success=True,
+        status="200",
+        message="Category spending retrieved successfully",
+        start_date=start_date,
+        end_date=end_date,
+        data=[row._asdict() for row in totals],
+    )
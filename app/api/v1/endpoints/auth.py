@@ -1,11 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel.orm.session import Session
-from app.db.session import get_session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.db.session import get_async_session
 from fastapi.security import OAuth2PasswordRequestForm
 from ...deps import (
-    authenticate_user,
+    authenticate_user_async,
     create_access_token,
-    get_user_by_email,
+    get_user_by_email_async,
     get_current_user,
 )
 from datetime import timedelta
@@ -19,7 +19,7 @@ from app.schemas import (
     UserInternalCreate,
     EmailVerificationResponse,
 )
-from app.crud import insert_user, create_otp, verify_otp
+from app.crud import insert_user_async, create_otp_async, verify_otp_async
 from app.jobs.email_jobs.email_jobs import send_verification_email
 from typing import Annotated
 from fastapi import Body
@@ -33,15 +33,15 @@ router = APIRouter(prefix="/api/v1/auth", tags=["Authentication"])
 
 
 @router.post("/login", response_model=Token, status_code=200)
-def login(
+async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_session),
+    db: AsyncSession = Depends(get_async_session),
 ) -> Token | None:
     """
     Login a user.
     """
     try:
-        user = authenticate_user(
+        user = await authenticate_user_async(
             db=db, email=form_data.username, password=form_data.password
         )
 
@@ -76,14 +76,14 @@ def login(
 @router.post("/register", response_model=UserCreateResponse, status_code=201)
 async def create_user(
     user: Annotated[UserCreate, Body()],
-    db: Session = Depends(get_session),
+    db: AsyncSession = Depends(get_async_session),
 ) -> UserCreateResponse | None:
     """
     Create a new user.
     """
 
     try:
-        db_user = get_user_by_email(db=db, email=user.email)
+        db_user = await get_user_by_email_async(db=db, email=user.email)
         if db_user:
             raise HTTPException(
                 status_code=400,
@@ -97,9 +97,9 @@ async def create_user(
             encrypted_email=security.encrypt(data=user.email),
             hashed_email=hash_email(user.email),  # Hash the email for storage
         )
-        data = insert_user(db=db, user=user_internal)
+        data = await insert_user_async(db=db, user=user_internal)
         # Create OTP for the new user
-        otp = create_otp(db=db, user_id=data.id)
+        otp = await create_otp_async(db=db, user_id=data.id)
         if not otp:
             raise HTTPException(status_code=500, detail="Internal server error")
         body = {
@@ -133,10 +133,10 @@ async def create_user(
 
 
 @router.post("/verify-email", status_code=200)
-def verify_email(
+async def verify_email(
     data: Annotated[VerifyEmailBody, Body()],
     user: User = Depends(get_current_user),
-    db: Session = Depends(get_session),
+    db: AsyncSession = Depends(get_async_session),
 ) -> dict:
     """
     Verify user email with OTP.
@@ -147,14 +147,16 @@ def verify_email(
             raise HTTPException(status_code=400, detail="User is already verified")
 
         # Verify the OTP
-        is_otp_valid = verify_otp(db=db, user_id=user.id, otp_code=data.otp_code)
+        is_otp_valid = await verify_otp_async(
+            db=db, user_id=user.id, otp_code=data.otp_code
+        )
         if not is_otp_valid:
             raise HTTPException(status_code=400, detail="Invalid OTP")
 
         # Update user email verification status
         user.is_email_verified = True
         db.add(user)
-        db.commit()
+        await db.commit()
 
         return {"status": "success", "message": "Email verified successfully"}
 
@@ -170,9 +172,9 @@ def verify_email(
 
 
 @router.post("/resend-verification-email", status_code=200)
-def resend_verification_email(
+async def resend_verification_email(
     user: User = Depends(get_current_user),
-    db: Session = Depends(get_session),
+    db: AsyncSession = Depends(get_async_session),
 ) -> dict:
     """
     Resend verification email to the user.
@@ -182,7 +184,7 @@ def resend_verification_email(
             raise HTTPException(status_code=400, detail="User is already verified")
 
         # Create a new OTP for the user
-        otp = create_otp(db=db, user_id=user.id)
+        otp = await create_otp_async(db=db, user_id=user.id)
         if not otp:
             raise HTTPException(status_code=500, detail="Internal server error")
 
@@ -215,7 +217,7 @@ def resend_verification_email(
     response_model=EmailVerificationResponse,
     status_code=200,
 )
-def confirm_email_verification(
+async def confirm_email_verification(
     user: User = Depends(get_current_user),
 ) -> EmailVerificationResponse:
     """
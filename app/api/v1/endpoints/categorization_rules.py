@@ -0,0 +1,97 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlmodel import Session
+from uuid import UUID
+from app.db.session import get_session
+from app.api.deps import verified_user
+from app.models import User, CategorizationRule
+from app.crud import (
+    get_categorization_rule_by_id,
+    get_categorization_rules,
+    create_categorization_rule,
+    delete_categorization_rule,
+)
+from app.jobs.categorization_jobs.categorization_jobs import recategorize_transactions
+from app.schemas import (
+    CategorizationRuleCreate,
+    CategorizationRuleReturnDetails,
+    CategorizationRuleReturnList,
+)
+from app.utils.logger import logger
+from app.core import settings
+
+
+router = APIRouter(prefix="/api/v1/categorization-rules", tags=["Categorization Rules"])
+
+
+@router.get("/", response_model=CategorizationRuleReturnList, status_code=200)
+async def list_rules(
+    session: Session = Depends(get_session),
+    user: User = Depends(verified_user),
+):
+    """
+    Get the user's own categorization rules, in the order they apply.
+    """
+    rules = get_categorization_rules(db=session, user_id=user.id)
+    return CategorizationRuleReturnList(
+        success=True,
+        status="200",
+        message="Categorization rules retrieved successfully",
+        data=rules,
+    )
+
+
+@router.post("/", response_model=CategorizationRuleReturnDetails, status_code=201)
+async def create_rule(
+    rule_in: CategorizationRuleCreate,
+    session: Session = Depends(get_session),
+    user: User = Depends(verified_user),
+):
+    """
+    Add a categorization rule for the user, overriding the global rules.
+    The user's existing transactions are recategorized in the background.
+    """
+    if not rule_in.merchant and not rule_in.category:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A rule needs a merchant, a category or both",
+        )
+    try:
+        rule = create_categorization_rule(
+            db=session,
+            rule=CategorizationRule(user_id=user.id, **rule_in.model_dump()),
+        )
+        recategorize_transactions.delay(str(user.id))
+        return CategorizationRuleReturnDetails(
+            success=True,
+            status="201",
+            message="Categorization rule created successfully",
+            data=rule,
+        )
+    except Exception as e:
+        if settings.DEBUG:
+            logger.error(f"Error creating categorization rule: {e}")
+        else:
+            logger.error("Error creating categorization rule")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        )
+
+
+@router.delete("/{rule_id}", status_code=204)
+async def delete_rule(
+    rule_id: UUID,
+    session: Session = Depends(get_session),
+    user: User = Depends(verified_user),
+):
+    """
+    Delete one of the user's categorization rules.
+    The user's existing transactions are recategorized in the background.
+    """
+    rule = get_categorization_rule_by_id(db=session, rule_id=rule_id)
+    if not rule or rule.user_id != user.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Rule not found"
+        )
+    delete_categorization_rule(db=session, rule=rule)
+    recategorize_transactions.delay(str(user.id))
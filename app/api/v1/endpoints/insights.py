@@ -1,13 +1,18 @@
-from fastapi import APIRouter, Depends
-from sqlmodel import Session, select
-from app.db.session import get_session
-from app.services.insights import generate_insights
-from app.models.insight import Insight
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from typing import Annotated, Literal
+from sqlmodel.ext.asyncio.session import AsyncSession
+from datetime import datetime
+from starlette.concurrency import run_in_threadpool
+from app.db.session import get_async_session, mark_recent_write
+from app.services.insights import INSIGHT_PERIOD, refresh_insights
+from app.crud import get_current_insights_async, get_insights_page_async
+from app.services.exports import EXPORT_MEDIA_TYPES, export_insights
 from uuid import UUID
-from app.api.deps import verified_user
+from app.api.deps import get_user_read_session, verified_user
 from app.models import User
+from app.core import settings
 from ....schemas import InsightGenerateReturnList
-from datetime import datetime, timedelta
 
 
 router = APIRouter(prefix="/api/v1/insights", tags=["Insights"])
@@ -15,56 +20,143 @@ router = APIRouter(prefix="/api/v1/insights", tags=["Insights"])
 
 @router.post("/generate", response_model=InsightGenerateReturnList)
 async def generate_insights_endpoint(
+    force: Annotated[
+        bool, Query(description="Recompute the insights instead of reading them")
+    ] = False,
     user: User = Depends(verified_user),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
 ) -> InsightGenerateReturnList:
     """
-    Generate insights for the current user based on their transactions.
+    Get the current insights for the current user based on their transactions.
+
+    Insights are recomputed for every user nightly, so this is normally a
+    read. They are computed on demand from the daily spending rollup when the
+    user has none yet, or when `force` is set; insights that read every
+    payment are left to the nightly job.
 
     Args:
+        force (bool): Recompute the insights before returning them.
         user (UUID): The ID of the current user.
-        session (Session): The database session.
+        session (AsyncSession): The database session.
 
     Returns:
-        list[Insight]: A list of generated insights for the user.
+        list[Insight]: The user's current insights.
     """
-    insights = generate_insights(db=session, user_id=user.id)
-    for i in insights:
-        session.add(i)
-    session.commit()
-    one_second_ago = datetime.now() - timedelta(seconds=1)
-    insights_query = select(Insight).where(
-        Insight.user_id == user.id, Insight.created_at >= one_second_ago
+    insights = await get_current_insights_async(
+        db=session, user_id=user.id, period=INSIGHT_PERIOD
     )
-    insights = session.exec(insights_query).all()
+    if force or not insights:
+        # The stored rows come back from the upsert itself. The computation is
+        # synchronous, so it runs on the session's connection in a greenlet
+        insights = await session.run_sync(
+            lambda sync_session: refresh_insights(
+                db=sync_session, user_ids=[user.id], payments=False
+            )
+        )
+        await session.commit()
+        await run_in_threadpool(mark_recent_write, user.id)
     return InsightGenerateReturnList(
         success=True,
         status=201,
         message="Insights generated successfully",
-        insights=list(insights),
+        insights=insights,
+    )
+
+
+@router.get("/export")
+async def export_user_insights(
+    export_format: Annotated[
+        Literal["parquet", "arrow"],
+        Query(alias="format", description="The export format"),
+    ] = "parquet",
+    compression: Annotated[
+        Literal["zstd", "none"],
+        Query(description="The compression codec"),
+    ] = "zstd",
+    user: User = Depends(verified_user),
+) -> StreamingResponse:
+    """
+    Export the current user's insights as Parquet or an Arrow IPC stream.
+
+    Args:
+        export_format (str): "parquet" (default) or "arrow".
+        compression (str): "zstd" (default) or "none".
+
+    Returns:
+        StreamingResponse: The insights, newest first.
+    """
+    return StreamingResponse(
+        export_insights(
+            user_id=user.id,
+            export_format=export_format,
+            compression=None if compression == "none" else compression,
+        ),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="insights.{export_format}"'
+        },
     )
 
 
 @router.get("/{user_id}", response_model=InsightGenerateReturnList)
 async def get_user_insights(
     user_id: UUID,
-    session: Session = Depends(get_session),
+    since: Annotated[
+        datetime | None, Query(description="Only insights created at or after this")
+    ] = None,
+    until: Annotated[
+        datetime | None, Query(description="Only insights created before this")
+    ] = None,
+    cursor: Annotated[
+        str | None,
+        Query(description="The next_cursor returned with the previous page"),
+    ] = None,
+    limit: Annotated[
+        int,
+        Query(
+            ge=1,
+            le=settings.INSIGHTS_MAX_PAGE_SIZE,
+            description="The maximum number of insights to return",
+        ),
+    ] = settings.INSIGHTS_PAGE_SIZE,
+    session: AsyncSession = Depends(get_user_read_session),
+    user: User = Depends(verified_user),
 ) -> InsightGenerateReturnList:
     """
-    Get all insights for a specific user.
+    Get a page of insights for a specific user, newest first.
 
     Args:
         user_id (UUID): The ID of the user to fetch insights for.
-        session (Session): The database session.
+        since (datetime, optional): Only insights created at or after this time.
+        until (datetime, optional): Only insights created before this time.
+        cursor (str, optional): The cursor of the page to fetch.
+        limit (int, optional): The page size, capped at INSIGHTS_MAX_PAGE_SIZE.
+        session (AsyncSession): A read session, on the replica if any.
 
     Returns:
-        InsightGenerateReturnList: A list of insights for the specified user.
+        InsightGenerateReturnList: A page of insights for the specified user.
     """
-    statement = select(Insight).where(Insight.user_id == user_id)
-    insights = session.exec(statement).all()
+    if user_id != user.id:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized Access"
+        )
+    try:
+        insights, next_cursor = await get_insights_page_async(
+            db=session,
+            user_id=user_id,
+            limit=limit,
+            since=since,
+            until=until,
+            cursor=cursor,
+        )
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
     return InsightGenerateReturnList(
         success=True,
         status=200,
         message="Insights fetched successfully",
-        insights=list(insights),
+        insights=insights,
+        next_cursor=next_cursor,
     )
@@ -0,0 +1,68 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import Annotated
+from uuid import UUID
+from datetime import date, timedelta
+from app.api.deps import get_user_read_session, verified_user
+from app.models import User
+from app.crud import get_linked_account_by_id_async, get_recurring_payments_async
+from app.schemas import RecurringPaymentReturnList
+from app.services.recurring_payments import cadence
+from app.core import settings
+
+
+router = APIRouter(prefix="/api/v1/recurring-payments", tags=["Recurring Payments"])
+
+
+@router.get("/", response_model=RecurringPaymentReturnList, status_code=200)
+async def list_recurring_payments(
+    account_id: Annotated[
+        UUID | None, Query(description="Only include this linked account")
+    ] = None,
+    include_lapsed: Annotated[
+        bool, Query(description="Include payments that stopped being charged")
+    ] = False,
+    session: AsyncSession = Depends(get_user_read_session),
+    user: User = Depends(verified_user),
+):
+    """Get the user's recurring payments and subscriptions, next due first.
+    Detected as transactions are synced, so this is a plain table read.
+
+    Args:
+        account_id (UUID, optional): Only include this linked account.
+        include_lapsed (bool, optional): Include payments whose next charge is
+            overdue by more than RECURRING_PAYMENT_GRACE_DAYS.
+        session (AsyncSession, optional): A read session, on the replica if any.
+    """
+    linked_account = None
+    if account_id:
+        linked_account = await get_linked_account_by_id_async(
+            db=session, account_id=account_id
+        )
+        if not linked_account or linked_account.user_id != user.id:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized Access"
+            )
+    active_since = None
+    if not include_lapsed:
+        active_since = date.today() - timedelta(
+            days=settings.RECURRING_PAYMENT_GRACE_DAYS
+        )
+    payments = await get_recurring_payments_async(
+        db=session,
+        user_id=user.id,
+        account_id=linked_account.id if linked_account else None,
+        active_since=active_since,
+    )
+    return RecurringPaymentReturnList(
+        success=True,
+        status="200",
+        message="Recurring payments retrieved successfully",
+        data=[
+            {
+                **payment.model_dump(),
+                "cadence": cadence(payment.average_interval_days),
+            }
+            for payment in payments
+        ],
+    )
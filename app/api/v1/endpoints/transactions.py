@@ -1,22 +1,24 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from typing import Dict, Any
-from typing import Annotated
-from sqlmodel import Session
-from app.db.session import get_session
-from app.services.mono_client import fetch_transactions
-from app.services.normalizer import categorize_transaction, normalize_description
-from datetime import datetime
-from app.api.deps import verified_user
-from app.models import User, Transaction
+from typing import Annotated, Literal
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from uuid import UUID
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.db.session import get_async_session
+from app.celery_app import celery_app
+from app.jobs.sync_jobs.sync_jobs import enqueue_account_sync, get_sync_job_owner
+from app.api.deps import get_user_read_session, verified_user
+from app.models import User
 from app.crud import (
-    get_linked_account_by_id,
-    get_transactions as transaction_crud,
-    get_transaction_by_transaction_id,
+    get_linked_account_by_id_async,
+    get_transactions_page_async,
 )
+from app.services.exports import EXPORT_MEDIA_TYPES, export_transactions
 from app.utils.logger import logger
-from app.services import security
 from app.core import settings
 from app.schemas import (
+    TransactionFilter,
     TransactionReturnDetails,
     TransactionSyncResponse,
     TransactionReturnList,
@@ -25,90 +27,62 @@ from app.schemas import (
 
 router = APIRouter(prefix="/api/v1/transactions", tags=["Transactions"])
 
+# Celery task states mapped to the states reported by the sync status endpoint
+SYNC_JOB_STATES = {"PENDING": "queued", "STARTED": "running", "PROGRESS": "running"}
 
-@router.post("/sync", response_model=TransactionSyncResponse, status_code=200)
+
+@router.post("/sync", response_model=TransactionSyncResponse, status_code=202)
 async def sync_transactions(
-    account_id: Annotated[str, Query(description="The account id of the user")],
-    session: Session = Depends(get_session),
+    account_id: Annotated[UUID, Query(description="The account id of the user")],
+    full: Annotated[
+        bool,
+        Query(description="Ignore the sync watermark and backfill all history"),
+    ] = False,
+    session: AsyncSession = Depends(get_async_session),
     user: User = Depends(verified_user),
 ):
-    """Sync transactions for a linked account.
-    This endpoint fetches transactions from the Mono API and stores them in the database.
-    It is assumed that the account_id is already linked to a user in the database.
-    The transactions are fetched using the Mono API and stored in the database.
-    The transactions are associated with the linked account using the account_id.
+    """Enqueue a transaction sync for a linked account.
+    The sync runs in the background, fetching transactions page by page from the
+    Mono API and committing them in chunks. The returned job ID can be polled on
+    `GET /sync/{job_id}`. If a sync for the account is already queued or running,
+    its job ID is returned instead of starting another one.
+    Only transactions on or after the account's last synced transaction date are
+    requested from Mono, unless a full backfill is requested.
 
     Args:
-        account_id (str): The account ID to sync transactions for.
-        session (Session, optional): _description_. Defaults to Depends(get_session).
+        account_id (UUID): The account ID to sync transactions for.
+        full (bool, optional): Force a backfill of the whole history.
+        session (AsyncSession, optional): Defaults to Depends(get_async_session).
     """
     try:
         # Check if the account_id is linked to the user
-        linked_account = get_linked_account_by_id(
+        linked_account = await get_linked_account_by_id_async(
             db=session,
             account_id=account_id,
         )
-        if not linked_account or linked_account not in user.linked_accounts:
+        if not linked_account or linked_account.user_id != user.id:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized Access"
             )
 
-        provider_account_id = linked_account.provider_account_id
-
-        decrypted_provider_account_id = security.decrypt(
-            encrypted_data=provider_account_id
+        # The sync lock and job owner are kept in Redis with a blocking client
+        job_id, enqueued = await run_in_threadpool(
+            enqueue_account_sync,
+            account_id=str(linked_account.id),
+            user_id=str(user.id),
+            full=full,
         )
-        # Fetch transactions from the Mono API
-        transactions_response = await fetch_transactions(decrypted_provider_account_id)
-        transactions = transactions_response.get("data", [])
-
-        if not transactions:
-            return TransactionSyncResponse(
-                success=True, status="200", message="No transactions to sync."
-            )
-
-        # Store transactions in the database
-        for transaction in transactions:
-            transaction["narration"] = normalize_description(
-                transaction.get("narration", "")
-            )
-
-            # Categorize the transaction
-            category = categorize_transaction(transaction.get("narration", ""))
-
-            transaction["category"] = category
-
-            existing_transaction = get_transaction_by_transaction_id(
-                db=session,
-                transaction_id=transaction.get("id"),
-            )
-
-            if existing_transaction:
-                continue
-
-            # Create a new transaction object
-            date = transaction.get("date")
-            new_transaction = Transaction(
-                account_id=account_id,
-                user_id=user.id,
-                transaction_id=transaction.get("id"),
-                category=transaction.get("category"),
-                transaction_type=transaction.get("type"),
-                amount=transaction.get("amount"),
-                currency=transaction.get("currency"),
-                raw_description=transaction.get("narration"),
-                normalized_description=transaction.get("narration"),
-                transaction_date=datetime.fromisoformat(
-                    date.replace("Z", "+00:00"),
-                ),
-            )
-            session.add(new_transaction)
-        session.commit()
 
         return TransactionSyncResponse(
             success=True,
-            status="200",
-            message="Transactions synced successfully.",
+            status=str(status.HTTP_202_ACCEPTED),
+            message=(
+                "Transaction sync queued."
+                if enqueued
+                else "A sync for this account is already in progress."
+            ),
+            job_id=job_id,
+            state="queued" if enqueued else "running",
         )
     except HTTPException:
         raise
@@ -123,42 +97,170 @@ async def sync_transactions(
         )
 
 
+@router.get("/sync/{job_id}", response_model=TransactionSyncResponse, status_code=200)
+async def get_sync_status(
+    job_id: str,
+    user: User = Depends(verified_user),
+):
+    """Get the progress of a transaction sync job.
+
+    Args:
+        job_id (str): The job ID returned when the sync was enqueued.
+    """
+    owner = await run_in_threadpool(get_sync_job_owner, job_id)
+    if not owner or owner.get("user_id") != str(user.id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Sync job not found"
+        )
+
+    result = celery_app.AsyncResult(job_id)
+    info = result.info if isinstance(result.info, dict) else {}
+    errors = info.get("errors", [])
+    if result.state == "SUCCESS":
+        state = "failed" if errors else "completed"
+    elif result.state == "FAILURE":
+        state = "failed"
+        errors = ["Sync failed"]
+    else:
+        state = SYNC_JOB_STATES.get(result.state, "running")
+
+    return TransactionSyncResponse(
+        success=True,
+        status="200",
+        message="Sync job status retrieved successfully",
+        job_id=job_id,
+        state=state,
+        pages_fetched=info.get("pages_fetched", 0),
+        inserted=info.get("inserted", 0),
+        skipped=info.get("skipped", 0),
+        errors=errors,
+    )
+
+
+@router.get("/export", status_code=200)
+async def export_user_transactions(
+    filters: Annotated[TransactionFilter, Depends()],
+    account_id: Annotated[
+        UUID | None,
+        Query(description="Only export this account; all accounts if omitted"),
+    ] = None,
+    export_format: Annotated[
+        Literal["ndjson", "csv", "parquet", "arrow"],
+        Query(alias="format", description="The export format"),
+    ] = "ndjson",
+    compression: Annotated[
+        Literal["zstd", "none"],
+        Query(description="Compression of the parquet and arrow formats"),
+    ] = "zstd",
+    session: AsyncSession = Depends(get_async_session),
+    user: User = Depends(verified_user),
+):
+    """Export the user's transactions, newest first.
+    Rows are streamed from the database as they are read, so exports of any
+    size start immediately and use constant memory. NDJSON and CSV suit
+    downloads; Parquet and Arrow IPC streams load straight into analytics
+    tools, with amounts as integer kobo, dictionary encoded categories and
+    date32 transaction dates.
+
+    Args:
+        filters (TransactionFilter): Optional date, category, type and amount filters.
+        account_id (UUID, optional): The account ID to export transactions for.
+        export_format (str, optional): "ndjson" (default), "csv", "parquet" or "arrow".
+        compression (str, optional): "zstd" (default) or "none".
+    """
+    linked_account_id = None
+    if account_id:
+        # Check if the account_id is linked to the user
+        linked_account = await get_linked_account_by_id_async(
+            db=session,
+            account_id=account_id,
+        )
+        if not linked_account or linked_account.user_id != user.id:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized Access"
+            )
+        linked_account_id = linked_account.id
+
+    return StreamingResponse(
+        export_transactions(
+            user_id=user.id,
+            filters=filters,
+            export_format=export_format,
+            account_id=linked_account_id,
+            compression=None if compression == "none" else compression,
+        ),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="transactions.{export_format}"'
+            )
+        },
+    )
+
+
 @router.get("/", response_model=TransactionReturnList, status_code=200)
 async def get_transactions(
-    account_id: Annotated[str, Query(description="The account id of the user")],
-    session: Session = Depends(get_session),
+    account_id: Annotated[UUID, Query(description="The account id of the user")],
+    filters: Annotated[TransactionFilter, Depends()],
+    cursor: Annotated[
+        str | None,
+        Query(description="The next_cursor returned with the previous page"),
+    ] = None,
+    limit: Annotated[
+        int,
+        Query(
+            ge=1,
+            le=settings.TRANSACTIONS_MAX_PAGE_SIZE,
+            description="The maximum number of transactions to return",
+        ),
+    ] = settings.TRANSACTIONS_PAGE_SIZE,
+    session: AsyncSession = Depends(get_user_read_session),
     user: User = Depends(verified_user),
 ):
-    """Get transactions for a linked account.
+    """Get a page of transactions for a linked account, newest first.
     This endpoint fetches transactions from the database for a given linked account.
     The transactions are associated with the linked account using the account_id.
+    Pass the returned `next_cursor` as `cursor` to fetch the next page; it is
+    null on the last page.
 
     Args:
-        account_id (str): The account ID to fetch transactions for.
-        session (Session, optional): _description_. Defaults to Depends(get_session).
+        account_id (UUID): The account ID to fetch transactions for.
+        filters (TransactionFilter): Optional date, category, type and amount filters.
+        cursor (str, optional): The cursor of the page to fetch.
+        limit (int, optional): The page size, capped at TRANSACTIONS_MAX_PAGE_SIZE.
+        session (AsyncSession, optional): A read session, on the replica if any.
     """
     try:
         # Check if the account_id is linked to the user
-        linked_account = get_linked_account_by_id(
+        linked_account = await get_linked_account_by_id_async(
             db=session,
             account_id=account_id,
         )
-        if not linked_account or linked_account not in user.linked_accounts:
+        if not linked_account or linked_account.user_id != user.id:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized Access"
             )
 
         # Fetch transactions from the database
-        transactions = transaction_crud(
-            db=session,
-            account_id=account_id,
-        )
+        try:
+            transactions, next_cursor = await get_transactions_page_async(
+                db=session,
+                account_id=linked_account.id,
+                limit=limit,
+                filters=filters,
+                cursor=cursor,
+            )
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+            )
 
         return TransactionReturnList(
             success=True,
             status="200",
             message="Transactions retrieved successfully",
             data=transactions,
+            next_cursor=next_cursor,
         )
     except HTTPException:
         raise
@@ -1,5 +1,8 @@
+import redis
 from fastapi import APIRouter, Request, Header, HTTPException
+from starlette.concurrency import run_in_threadpool
 from app.core import settings
+from app.jobs.sync_jobs.sync_jobs import mark_account_dirty
 import logging
 
 router = APIRouter(prefix="/api/v1/webhooks", tags=["Webhooks"])
@@ -35,7 +38,18 @@ async def mono_webhook(
 
     if event_type == "mono.events.account_updated":
         account_info = payload["data"]["account"]
-        # process account update here
+        # Sync the account ahead of others in the next scheduled fan-out. If
+        # that can't be recorded the fan-out still syncs it once it is stale,
+        # so the event is acknowledged either way
+        provider_account_id = account_info.get("_id") or account_info.get("id")
+        if provider_account_id:
+            try:
+                await run_in_threadpool(mark_account_dirty, provider_account_id)
+            except redis.RedisError as e:
+                if settings.DEBUG:
+                    logging.error(f"Error marking account dirty: {e}")
+                else:
+                    logging.error("Error marking account dirty")
         logging.info(f"Updated account info: {account_info}")
 
     return {"status": "ok"}
@@ -1,8 +1,51 @@
+import time
 from celery import Celery
+from celery.signals import task_postrun, worker_process_init
 
 celery_app = Celery("app")
 celery_app.config_from_object("app.celeryconfig")
 import app.jobs.email_jobs.email_jobs
 import app.jobs.schedules.schedules
+import app.jobs.sync_jobs.sync_jobs
+import app.jobs.categorization_jobs.categorization_jobs
+import app.jobs.analytics_jobs.analytics_jobs
+import app.jobs.partition_jobs.partition_jobs
 
-celery_app.autodiscover_tasks(["app.jobs.email_jobs", "app.jobs.schedules"])
+celery_app.autodiscover_tasks(
+    [
+        "app.jobs.email_jobs",
+        "app.jobs.schedules",
+        "app.jobs.sync_jobs",
+        "app.jobs.categorization_jobs",
+        "app.jobs.analytics_jobs",
+        "app.jobs.partition_jobs",
+    ]
+)
+
+
+@worker_process_init.connect
+def reset_db_pool(**kwargs) -> None:
+    """Drop connections inherited from the parent process after a fork."""
+    from app.db.engine import dispose_after_fork
+
+    dispose_after_fork()
+
+
+_pool_stats_logged_at = 0.0
+
+
+@task_postrun.connect
+def log_db_pool_stats(**kwargs) -> None:
+    """
+    Log the worker process's pool gauges and checkout waits at most every
+    DB_POOL_METRICS_LOG_SECONDS, to size the pool of Celery workers.
+    """
+    global _pool_stats_logged_at
+    from app.core import settings
+    from app.db.engine import pool_stats
+    from app.utils.logger import logger
+
+    now = time.monotonic()
+    if now - _pool_stats_logged_at >= settings.DB_POOL_METRICS_LOG_SECONDS:
+        _pool_stats_logged_at = now
+        logger.info(f"Database pool stats: {pool_stats()}")
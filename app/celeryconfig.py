@@ -11,6 +11,12 @@ task_serializer = "json"
 accept_content = ["json"]
 worker_prefetch_multiplier = 1
 task_acks_late = True
+# Lets scheduled syncs of changed accounts jump ahead of routine refreshes
+broker_transport_options = {
+    "priority_steps": list(range(10)),
+    "queue_order_strategy": "priority",
+    "visibility_timeout": settings.CELERY_VISIBILITY_TIMEOUT_SECONDS,
+}
 beat_schedule = {
     "send_reminders": {
         "task": "send_email_verification_reminders",
@@ -18,4 +24,29 @@ beat_schedule = {
         "kwargs": {},
         "schedule": crontab(minute="0", hour="9", day_of_week="saturday"),
     },
+    "sync_linked_accounts": {
+        "task": "sync_all_linked_accounts",
+        "args": (),
+        "kwargs": {},
+        "schedule": crontab(minute=f"*/{settings.SYNC_FANOUT_INTERVAL_MINUTES}"),
+    },
+    "generate_insights": {
+        "task": "generate_all_insights",
+        "args": (),
+        "kwargs": {},
+        "schedule": crontab(minute="0", hour=str(settings.INSIGHTS_NIGHTLY_HOUR)),
+    },
 }
+if settings.TRANSACTIONS_PARTITIONED:
+    beat_schedule["create_transaction_partitions"] = {
+        "task": "create_transaction_partitions",
+        "args": (),
+        "kwargs": {},
+        "schedule": crontab(minute="30", hour="1"),
+    }
+    beat_schedule["detach_transaction_partitions"] = {
+        "task": "detach_transaction_partitions",
+        "args": (),
+        "kwargs": {},
+        "schedule": crontab(minute="45", hour="1", day_of_month="1"),
+    }
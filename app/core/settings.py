@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Literal
+from typing import Literal, Optional
 from dotenv import load_dotenv
 import os
 
@@ -22,13 +22,71 @@ class BaseSettingsConfig(BaseSettings):
     ENV: str
     DEBUG: bool = False
     DATABASE_URL: str
+    # Optional read replica for read-only endpoints and the SQL assistant
+    DATABASE_REPLICA_URL: Optional[str] = None
+    # How long a user's reads stay on the primary after they write
+    REPLICA_READ_YOUR_WRITES_SECONDS: int = 60
+    # Pool of each process's engine; a process can hold up to
+    # DB_POOL_SIZE + DB_MAX_OVERFLOW connections per engine
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # 0 disables the timeout; long running Celery jobs may need it disabled
+    DB_STATEMENT_TIMEOUT_MS: int = 0
+    DB_POOL_METRICS_LOG_SECONDS: int = 300
+    # Sent as the metrics-token header to read /api/v1/db-pool, which is
+    # disabled while unset
+    METRICS_TOKEN: Optional[str] = None
     MONO_BASE_URL: str
     MONO_SECRET_KEY: str
     MONO_WEBHOOK_SECRET: str
+    MONO_TIMEOUT_SECONDS: float = 30.0
+    MONO_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    MONO_MAX_RETRIES: int = 3
+    MONO_BACKOFF_BASE_SECONDS: float = 0.5
+    MONO_BACKOFF_MAX_SECONDS: float = 8.0
+    MONO_MAX_CONNECTIONS: int = 20
+    SYNC_COMMIT_CHUNK_SIZE: int = 1000
+    SYNC_LOCK_TTL_SECONDS: int = 3600
+    SYNC_JOB_TTL_SECONDS: int = 86400
+    SYNC_MAX_CONCURRENT_JOBS: int = 8
+    SYNC_SLOT_RETRY_SECONDS: int = 15
+    SYNC_STALE_AFTER_MINUTES: int = 360
+    SYNC_FANOUT_CHUNK_SIZE: int = 500
+    SYNC_FANOUT_ACCOUNTS_PER_MINUTE: int = 60
+    SYNC_FANOUT_INTERVAL_MINUTES: int = 30
+    MONO_REQUESTS_PER_MINUTE: int = 120
+    CATEGORIZATION_RULES_REFRESH_SECONDS: float = 30.0
+    CATEGORIZATION_RULES_USER_CACHE_SIZE: int = 256
+    RECATEGORIZE_CHUNK_SIZE: int = 1000
+    TRANSACTIONS_PAGE_SIZE: int = 50
+    TRANSACTIONS_MAX_PAGE_SIZE: int = 200
+    # Monthly range partitioning of transactions by transaction_date, on
+    # PostgreSQL only. Set it before running the partitioning migration
+    TRANSACTIONS_PARTITIONED: bool = False
+    TRANSACTION_PARTITIONS_AHEAD_MONTHS: int = 3
+    # Months of history the migration partitions; older rows go to the default
+    TRANSACTION_PARTITIONS_HISTORY_MONTHS: int = 60
+    # Partitions older than this are detached nightly, 0 keeps them attached
+    TRANSACTION_PARTITIONS_RETENTION_MONTHS: int = 0
+    TRANSACTIONS_COLD_TABLESPACE: Optional[str] = None
+    EXPORT_BATCH_SIZE: int = 2000
+    ANALYTICS_DEFAULT_DAYS: int = 30
+    INSIGHTS_CHUNK_SIZE: int = 1000
+    INSIGHTS_NIGHTLY_HOUR: int = 2
+    INSIGHTS_PAGE_SIZE: int = 20
+    INSIGHTS_MAX_PAGE_SIZE: int = 100
+    RECURRING_PAYMENT_GRACE_DAYS: int = 7
     GOOGLE_API_KEY: str
     CELERY_BROKER_URL: str
     CELERY_RESULT_BACKEND: str
     CELERY_TIME_ZONE: str
+    # Unacknowledged Redis broker tasks are redelivered after this long, so
+    # it bounds a task's countdown plus its run time
+    CELERY_VISIBILITY_TIMEOUT_SECONDS: int = 7200
+    REDIS_URL: Optional[str] = None
     SECRET_KEY: str
     ENCRYPTION_KEY: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
@@ -1,23 +1,116 @@
-from .crud_user import insert_user, get_unverified_users
+from .crud_user import insert_user, insert_user_async, get_unverified_users
 from .crud_account import (
     get_linked_account_by_id,
+    get_linked_account_by_id_async,
     get_linked_accounts_by_user_id,
+    get_linked_accounts_by_user_id_async,
 )
 from .crud_transaction import (
     get_transaction_by_id,
     get_transactions,
+    get_transactions_page,
+    get_transactions_page_async,
+    iter_transactions,
     get_transaction_by_transaction_id,
+    bulk_insert_transactions,
+    bulk_update_transaction_categories,
+)
+from .crud_otp import create_otp, create_otp_async, verify_otp, verify_otp_async
+from .crud_daily_spend import (
+    apply_daily_spend,
+    rebuild_daily_spend,
+    get_category_totals,
+    get_category_totals_async,
+    get_category_totals_for_users,
+    get_daily_totals,
+    get_daily_totals_async,
+)
+from .crud_insight import (
+    iter_insights,
+    get_current_insights,
+    get_current_insights_async,
+    get_insights_page,
+    get_insights_page_async,
+    upsert_insights,
+    insert_insights,
+)
+from .crud_recurring_payment import (
+    get_new_debits,
+    get_merchant_debits,
+    get_recurring_payment_states,
+    get_recurring_payments,
+    get_recurring_payments_async,
+    reset_recurring_payments,
+)
+from .crud_spending_stats import (
+    get_category_stats,
+    get_user_debit_counts,
+    get_merchant_activity,
+    apply_category_stats,
+    apply_merchant_activity,
+    reset_spending_stats,
+    iter_user_debits,
+)
+from .crud_categorization_rule import (
+    get_categorization_rules_version,
+    get_categorization_rule_by_id,
+    get_categorization_rules,
+    get_users_with_categorization_rules,
+    create_categorization_rule,
+    delete_categorization_rule,
 )
-from .crud_otp import create_otp, verify_otp
 
 __all__ = [
     "insert_user",
+    "insert_user_async",
     "get_linked_account_by_id",
+    "get_linked_account_by_id_async",
     "get_linked_accounts_by_user_id",
+    "get_linked_accounts_by_user_id_async",
     "get_transaction_by_id",
     "get_transactions",
+    "get_transactions_page",
+    "get_transactions_page_async",
+    "iter_transactions",
     "get_transaction_by_transaction_id",
+    "bulk_insert_transactions",
+    "bulk_update_transaction_categories",
     "create_otp",
+    "create_otp_async",
     "verify_otp",
+    "verify_otp_async",
+    "iter_insights",
+    "get_current_insights",
+    "get_current_insights_async",
+    "get_insights_page",
+    "get_insights_page_async",
+    "upsert_insights",
+    "insert_insights",
+    "apply_daily_spend",
+    "rebuild_daily_spend",
+    "get_category_totals",
+    "get_category_totals_async",
+    "get_category_totals_for_users",
+    "get_daily_totals",
+    "get_daily_totals_async",
     "get_unverified_users",
+    "get_new_debits",
+    "get_merchant_debits",
+    "get_recurring_payment_states",
+    "get_recurring_payments",
+    "get_recurring_payments_async",
+    "reset_recurring_payments",
+    "get_category_stats",
+    "get_user_debit_counts",
+    "get_merchant_activity",
+    "apply_category_stats",
+    "apply_merchant_activity",
+    "reset_spending_stats",
+    "iter_user_debits",
+    "get_categorization_rules_version",
+    "get_categorization_rule_by_id",
+    "get_categorization_rules",
+    "get_users_with_categorization_rules",
+    "create_categorization_rule",
+    "delete_categorization_rule",
 ]
@@ -1,4 +1,5 @@
 from sqlmodel.orm.session import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 from app.models import LinkedAccount
 from sqlmodel import select, UUID
 
@@ -22,3 +23,26 @@ def get_linked_accounts_by_user_id(
     statement = select(LinkedAccount).where(LinkedAccount.user_id == user_id)
     result = db.exec(statement).all()
     return list(result)
+
+
+async def get_linked_account_by_id_async(
+    db: AsyncSession, account_id: UUID
+) -> LinkedAccount | None:
+    """
+    Get a linked account by its ID.
+    """
+    statement = select(LinkedAccount).where(LinkedAccount.id == account_id)
+    result = await db.exec(statement)
+    return result.first()
+
+
+async def get_linked_accounts_by_user_id_async(
+    db: AsyncSession,
+    user_id: UUID,
+) -> list[LinkedAccount]:
+    """
+    Get all linked accounts for a user by their user ID.
+    """
+    statement = select(LinkedAccount).where(LinkedAccount.user_id == user_id)
+    result = await db.exec(statement)
+    return list(result.all())
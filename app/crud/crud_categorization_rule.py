@@ -0,0 +1,97 @@
+from sqlmodel.orm.session import Session
+from sqlmodel import select
+from uuid import UUID
+from datetime import datetime
+from app.db.dialect import dialect_insert
+from app.models import CategorizationRule, CategorizationRuleVersion
+
+
+def get_categorization_rules_version(db: Session) -> int:
+    """
+    Get the current version stamp of the categorization rules.
+    """
+    statement = select(CategorizationRuleVersion.version).where(
+        CategorizationRuleVersion.id == 1
+    )
+    return db.exec(statement).first() or 0
+
+
+def bump_categorization_rules_version(db: Session) -> int:
+    """
+    Mark the categorization rules as changed. Committed with the rule change.
+
+    The stamp is incremented by the database in a single upsert, so rule
+    changes made at the same time each get their own version.
+
+    Returns:
+        int: The new version.
+    """
+    statement = dialect_insert(db)(CategorizationRuleVersion).values(
+        id=1, version=1, updated_at=datetime.now()
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=["id"],
+        set_={
+            "version": CategorizationRuleVersion.version + 1,
+            "updated_at": statement.excluded.updated_at,
+        },
+    ).returning(CategorizationRuleVersion.version)
+    return db.execute(statement).scalar_one()
+
+
+def get_categorization_rule_by_id(
+    db: Session, rule_id: UUID
+) -> CategorizationRule | None:
+    """
+    Get a categorization rule by its ID.
+    """
+    statement = select(CategorizationRule).where(CategorizationRule.id == rule_id)
+    return db.exec(statement).first()
+
+
+def get_categorization_rules(
+    db: Session, user_id: UUID | None = None
+) -> list[CategorizationRule]:
+    """
+    Get the global rules, or a user's own rules, in the order they apply.
+    """
+    statement = (
+        select(CategorizationRule)
+        .where(CategorizationRule.user_id == user_id)
+        .order_by(CategorizationRule.priority, CategorizationRule.created_at)
+    )
+    return list(db.exec(statement).all())
+
+
+def get_users_with_categorization_rules(db: Session) -> set[UUID]:
+    """
+    Get the IDs of users who have their own categorization rules.
+    """
+    statement = (
+        select(CategorizationRule.user_id)
+        .where(CategorizationRule.user_id.is_not(None))
+        .distinct()
+    )
+    return set(db.exec(statement).all())
+
+
+def create_categorization_rule(
+    db: Session, rule: CategorizationRule
+) -> CategorizationRule:
+    """
+    Create a categorization rule and bump the rules version.
+    """
+    db.add(rule)
+    bump_categorization_rules_version(db)
+    db.commit()
+    db.refresh(rule)
+    return rule
+
+
+def delete_categorization_rule(db: Session, rule: CategorizationRule) -> None:
+    """
+    Delete a categorization rule and bump the rules version.
+    """
+    db.delete(rule)
+    bump_categorization_rules_version(db)
+    db.commit()
@@ -0,0 +1,287 @@
+from sqlmodel.orm.session import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel import case, delete, func, insert, select
+from sqlalchemy import literal
+from uuid import UUID
+from datetime import date, datetime
+from typing import Any, Iterable
+from app.db.dialect import dialect_insert
+from app.models import DailySpend, Transaction, TransactionCategory
+
+# Rollup category of transactions without one
+UNCATEGORIZED = "other"
+
+ROLLUP_KEY = ["user_id", "account_id", "day", "category"]
+
+
+def apply_daily_spend(db: Session, transactions: Iterable[Any]) -> None:
+    """
+    Add newly inserted transactions to the daily spending rollup.
+
+    Transactions are first summed per (user_id, account_id, day, category),
+    then each sum is added to its rollup row in one upsert, so the rollup
+    moves in the same database transaction as the inserts. The caller is
+    responsible for committing the session.
+
+    Args:
+        db (Session): The database session.
+        transactions (Iterable): Rows with user_id, account_id,
+            transaction_date, category, transaction_type and amount.
+    """
+    deltas: dict[tuple, list] = {}
+    for transaction in transactions:
+        key = (
+            transaction.user_id,
+            transaction.account_id,
+            transaction.transaction_date,
+            transaction.category or UNCATEGORIZED,
+        )
+        delta = deltas.setdefault(key, [0, 0, 0])
+        delta[0] += 1
+        if transaction.transaction_type == "debit":
+            delta[1] += transaction.amount or 0
+        elif transaction.transaction_type == "credit":
+            delta[2] += transaction.amount or 0
+    if not deltas:
+        return
+
+    now = datetime.now()
+    statement = dialect_insert(db)(DailySpend)
+    statement = statement.on_conflict_do_update(
+        index_elements=ROLLUP_KEY,
+        set_={
+            "txn_count": DailySpend.txn_count + statement.excluded.txn_count,
+            "debit_total": DailySpend.debit_total + statement.excluded.debit_total,
+            "credit_total": DailySpend.credit_total + statement.excluded.credit_total,
+            "updated_at": statement.excluded.updated_at,
+        },
+    )
+    db.execute(
+        statement,
+        [
+            {
+                **dict(zip(ROLLUP_KEY, key)),
+                "txn_count": count,
+                "debit_total": debit_total,
+                "credit_total": credit_total,
+                "updated_at": now,
+            }
+            for key, (count, debit_total, credit_total) in deltas.items()
+        ],
+    )
+
+
+def rebuild_daily_spend(
+    db: Session,
+    user_id: UUID | None = None,
+    start_date: date | None = None,
+    end_date: date | None = None,
+) -> int:
+    """
+    Recompute the daily spending rollup from transactions.
+
+    Rollup rows in the range are deleted and rebuilt with a single
+    INSERT ... SELECT ... GROUP BY. The caller is responsible for committing
+    the session.
+
+    Args:
+        db (Session): The database session.
+        user_id (UUID, optional): Only rebuild this user's rollup.
+        start_date (date, optional): The first day to rebuild.
+        end_date (date, optional): The last day to rebuild.
+
+    Returns:
+        int: The number of rollup rows written.
+    """
+    rollup_conditions = []
+    transaction_conditions = []
+    if user_id is not None:
+        rollup_conditions.append(DailySpend.user_id == user_id)
+        transaction_conditions.append(Transaction.user_id == user_id)
+    if start_date is not None:
+        rollup_conditions.append(DailySpend.day >= start_date)
+        transaction_conditions.append(Transaction.transaction_date >= start_date)
+    if end_date is not None:
+        rollup_conditions.append(DailySpend.day <= end_date)
+        transaction_conditions.append(Transaction.transaction_date <= end_date)
+
+    db.execute(delete(DailySpend).where(*rollup_conditions))
+
+    category = func.coalesce(TransactionCategory.name, UNCATEGORIZED)
+    totals = (
+        select(
+            Transaction.user_id,
+            Transaction.account_id,
+            Transaction.transaction_date,
+            category,
+            func.count(),
+            func.coalesce(
+                func.sum(
+                    case((Transaction.transaction_type == "debit", Transaction.amount))
+                ),
+                0,
+            ),
+            func.coalesce(
+                func.sum(
+                    case((Transaction.transaction_type == "credit", Transaction.amount))
+                ),
+                0,
+            ),
+            literal(datetime.now()),
+        )
+        .outerjoin(TransactionCategory, TransactionCategory.id == Transaction.category)
+        .where(*transaction_conditions)
+        .group_by(
+            Transaction.user_id,
+            Transaction.account_id,
+            Transaction.transaction_date,
+            category,
+        )
+    )
+    result = db.execute(
+        insert(DailySpend).from_select(
+            [
+                "user_id",
+                "account_id",
+                "day",
+                "category",
+                "txn_count",
+                "debit_total",
+                "credit_total",
+                "updated_at",
+            ],
+            totals,
+        )
+    )
+    return result.rowcount
+
+
+def _category_totals_statement(
+    user_id: UUID,
+    start_date: date,
+    end_date: date | None,
+    account_id: UUID | None,
+):
+    statement = select(
+        DailySpend.category,
+        func.sum(DailySpend.txn_count).label("txn_count"),
+        func.sum(DailySpend.debit_total).label("debit_total"),
+        func.sum(DailySpend.credit_total).label("credit_total"),
+    ).where(DailySpend.user_id == user_id, DailySpend.day >= start_date)
+    if end_date is not None:
+        statement = statement.where(DailySpend.day <= end_date)
+    if account_id is not None:
+        statement = statement.where(DailySpend.account_id == account_id)
+    return statement.group_by(DailySpend.category).order_by(DailySpend.category)
+
+
+def get_category_totals(
+    db: Session,
+    user_id: UUID,
+    start_date: date,
+    end_date: date | None = None,
+    account_id: UUID | None = None,
+) -> list[Any]:
+    """
+    Sum a user's rollup per category over a date range.
+
+    Returns:
+        list: Rows with `category`, `txn_count`, `debit_total` and
+            `credit_total`, amounts in kobo.
+    """
+    statement = _category_totals_statement(user_id, start_date, end_date, account_id)
+    return list(db.exec(statement).all())
+
+
+async def get_category_totals_async(
+    db: AsyncSession,
+    user_id: UUID,
+    start_date: date,
+    end_date: date | None = None,
+    account_id: UUID | None = None,
+) -> list[Any]:
+    """
+    Sum a user's rollup per category over a date range. See get_category_totals.
+    """
+    statement = _category_totals_statement(user_id, start_date, end_date, account_id)
+    result = await db.exec(statement)
+    return list(result.all())
+
+
+def get_category_totals_for_users(
+    db: Session,
+    user_ids: list[UUID],
+    start_date: date,
+    end_date: date | None = None,
+) -> list[Any]:
+    """
+    Sum the rollup per user and category for many users in one query.
+
+    Returns:
+        list: Rows with `user_id`, `category`, `txn_count`, `debit_total` and
+            `credit_total`, amounts in kobo.
+    """
+    statement = select(
+        DailySpend.user_id,
+        DailySpend.category,
+        func.sum(DailySpend.txn_count).label("txn_count"),
+        func.sum(DailySpend.debit_total).label("debit_total"),
+        func.sum(DailySpend.credit_total).label("credit_total"),
+    ).where(DailySpend.user_id.in_(user_ids), DailySpend.day >= start_date)
+    if end_date is not None:
+        statement = statement.where(DailySpend.day <= end_date)
+    statement = statement.group_by(DailySpend.user_id, DailySpend.category)
+    return list(db.exec(statement).all())
+
+
+def _daily_totals_statement(
+    user_id: UUID,
+    start_date: date,
+    end_date: date | None,
+    account_id: UUID | None,
+):
+    statement = select(
+        DailySpend.day,
+        func.sum(DailySpend.txn_count).label("txn_count"),
+        func.sum(DailySpend.debit_total).label("debit_total"),
+        func.sum(DailySpend.credit_total).label("credit_total"),
+    ).where(DailySpend.user_id == user_id, DailySpend.day >= start_date)
+    if end_date is not None:
+        statement = statement.where(DailySpend.day <= end_date)
+    if account_id is not None:
+        statement = statement.where(DailySpend.account_id == account_id)
+    return statement.group_by(DailySpend.day).order_by(DailySpend.day)
+
+
+def get_daily_totals(
+    db: Session,
+    user_id: UUID,
+    start_date: date,
+    end_date: date | None = None,
+    account_id: UUID | None = None,
+) -> list[Any]:
+    """
+    Sum a user's rollup per day over a date range, oldest first.
+
+    Returns:
+        list: Rows with `day`, `txn_count`, `debit_total` and `credit_total`,
+            amounts in kobo.
+    """
+    statement = _daily_totals_statement(user_id, start_date, end_date, account_id)
+    return list(db.exec(statement).all())
+
+
+async def get_daily_totals_async(
+    db: AsyncSession,
+    user_id: UUID,
+    start_date: date,
+    end_date: date | None = None,
+    account_id: UUID | None = None,
+) -> list[Any]:
+    """
+    Sum a user's rollup per day over a date range, oldest first. See
+    get_daily_totals.
+    """
+    statement = _daily_totals_statement(user_id, start_date, end_date, account_id)
+    result = await db.exec(statement)
+    return list(result.all())
@@ -0,0 +1,232 @@
+import base64
+import json
+from sqlmodel.orm.session import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel import delete, select
+from sqlalchemy import tuple_
+from uuid import UUID
+from datetime import datetime
+from typing import Any, Iterable, Iterator
+from app.db.dialect import dialect_insert
+from app.models import Insight
+
+
+def iter_insights(
+    db: Session, user_id: UUID, columns: list, batch_size: int = 1000
+) -> Iterator[Any]:
+    """
+    Stream a user's insights, newest first, as rows of the given columns.
+    """
+    statement = (
+        select(*columns)
+        .where(Insight.user_id == user_id)
+        .order_by(Insight.created_at.desc(), Insight.id.desc())
+    )
+    yield from db.exec(statement.execution_options(yield_per=batch_size))
+
+
+def _current_insights_statement(user_id: UUID, period: str):
+    return (
+        select(Insight)
+        .where(Insight.user_id == user_id, Insight.period == period)
+        .order_by(Insight.kind)
+    )
+
+
+def get_current_insights(db: Session, user_id: UUID, period: str) -> list[Insight]:
+    """
+    Get a user's current insights for a period.
+    """
+    return list(db.exec(_current_insights_statement(user_id, period)).all())
+
+
+async def get_current_insights_async(
+    db: AsyncSession, user_id: UUID, period: str
+) -> list[Insight]:
+    """
+    Get a user's current insights for a period.
+    """
+    result = await db.exec(_current_insights_statement(user_id, period))
+    return list(result.all())
+
+
+def encode_insight_cursor(insight: Insight) -> str:
+    """
+    Encode the position after an insight as an opaque page cursor.
+    """
+    position = [insight.created_at.isoformat(), str(insight.id)]
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+
+def decode_insight_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """
+    Decode a page cursor into the (created_at, id) it points after.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        created_at, insight_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(created_at), UUID(insight_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def _insights_page_statement(
+    user_id: UUID,
+    limit: int,
+    since: datetime | None,
+    until: datetime | None,
+    cursor: str | None,
+):
+    """Select one row more than the page, to tell whether another page follows."""
+    statement = select(Insight).where(Insight.user_id == user_id)
+    if since:
+        statement = statement.where(Insight.created_at >= since)
+    if until:
+        statement = statement.where(Insight.created_at < until)
+    if cursor:
+        statement = statement.where(
+            tuple_(Insight.created_at, Insight.id)
+            < tuple_(*decode_insight_cursor(cursor))
+        )
+    return statement.order_by(Insight.created_at.desc(), Insight.id.desc()).limit(
+        limit + 1
+    )
+
+
+def _insights_page(
+    insights: list[Insight], limit: int
+) -> tuple[list[Insight], str | None]:
+    if len(insights) <= limit:
+        return insights, None
+    insights = insights[:limit]
+    return insights, encode_insight_cursor(insights[-1])
+
+
+def get_insights_page(
+    db: Session,
+    user_id: UUID,
+    limit: int,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    cursor: str | None = None,
+) -> tuple[list[Insight], str | None]:
+    """
+    Get a page of a user's insights, newest first.
+
+    Args:
+        db (Session): The database session.
+        user_id (UUID): The user whose insights to get.
+        limit (int): The maximum number of insights to return.
+        since (datetime, optional): Only insights created at or after this time.
+        until (datetime, optional): Only insights created before this time.
+        cursor (str, optional): The cursor returned with the previous page.
+
+    Returns:
+        tuple[list[Insight], str | None]: The insights, and the cursor of the
+            next page or None if this is the last page.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    statement = _insights_page_statement(user_id, limit, since, until, cursor)
+    return _insights_page(list(db.exec(statement).all()), limit)
+
+
+async def get_insights_page_async(
+    db: AsyncSession,
+    user_id: UUID,
+    limit: int,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    cursor: str | None = None,
+) -> tuple[list[Insight], str | None]:
+    """
+    Get a page of a user's insights, newest first. See get_insights_page.
+    """
+    statement = _insights_page_statement(user_id, limit, since, until, cursor)
+    result = await db.exec(statement)
+    return _insights_page(list(result.all()), limit)
+
+
+def upsert_insights(
+    db: Session,
+    user_ids: list[UUID],
+    period: str,
+    insights: list[Insight],
+    keep_kinds: Iterable[str] = (),
+) -> list[Insight]:
+    """
+    Replace the current insights of many users for a period.
+
+    Insights are upserted on (user_id, period, kind), so each user keeps one
+    row per kind instead of accumulating duplicates, and kinds no longer
+    produced for a user are deleted, except those in keep_kinds. A
+    regenerated insight takes the new created_at, so pages list it by when it
+    was last generated. The stored rows come back from the same statement
+    through RETURNING. The caller is responsible for committing the session.
+
+    Args:
+        db (Session): The database session.
+        user_ids (list[UUID]): The users whose insights were computed.
+        period (str): The period the insights cover.
+        insights (list[Insight]): The new insights of those users.
+        keep_kinds (Iterable[str], optional): Kinds that were not recomputed,
+            whose stored rows are kept as they are.
+
+    Returns:
+        list[Insight]: The users' current insights, as persisted.
+    """
+    keep_kinds = list(keep_kinds)
+    current = [(insight.user_id, insight.kind) for insight in insights]
+    stale = delete(Insight).where(
+        Insight.user_id.in_(user_ids), Insight.period == period
+    )
+    if current:
+        stale = stale.where(tuple_(Insight.user_id, Insight.kind).not_in(current))
+    if keep_kinds:
+        stale = stale.where(Insight.kind.not_in(keep_kinds))
+    db.execute(stale)
+
+    stored = []
+    if insights:
+        statement = dialect_insert(db)(Insight)
+        statement = statement.on_conflict_do_update(
+            index_elements=["user_id", "period", "kind"],
+            set_={
+                "message": statement.excluded.message,
+                "type": statement.excluded.type,
+                "created_at": statement.excluded.created_at,
+                "updated_at": statement.excluded.updated_at,
+            },
+        )
+        statement = statement.returning(Insight).execution_options(
+            populate_existing=True
+        )
+        stored = list(
+            db.scalars(statement, [insight.model_dump() for insight in insights]).all()
+        )
+    if keep_kinds:
+        kept = select(Insight).where(
+            Insight.user_id.in_(user_ids),
+            Insight.period == period,
+            Insight.kind.in_(keep_kinds),
+        )
+        if current:
+            kept = kept.where(tuple_(Insight.user_id, Insight.kind).not_in(current))
+        stored += db.exec(kept).all()
+    return stored
+
+
+def insert_insights(db: Session, insights: list[Insight]) -> None:
+    """
+    Insert insights, skipping any whose (user_id, period, kind) already
+    exists. The caller is responsible for committing the session.
+    """
+    if not insights:
+        return
+    statement = dialect_insert(db)(Insight).on_conflict_do_nothing(
+        index_elements=["user_id", "period", "kind"]
+    )
+    db.execute(statement, [insight.model_dump() for insight in insights])
@@ -2,6 +2,8 @@ from app.models import OTP
 from ..utils.helpers import hash_otp, generate_otp, verify_otp as v_otp
 from uuid import UUID
 from sqlmodel import select, Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.concurrency import run_in_threadpool
 
 
 def create_otp(db: Session, user_id: UUID) -> str:
@@ -49,3 +51,32 @@ def verify_otp(db: Session, user_id: UUID, otp_code: str) -> bool:
         return True
 
     return False  # OTP verification failed
+
+
+async def create_otp_async(db: AsyncSession, user_id: UUID) -> str:
+    """
+    Create a new OTP for the user and store it in the database.
+    The OTP is hashed in a worker thread so it doesn't block the event loop.
+    """
+    otp = generate_otp()
+    new_otp = OTP(user_id=user_id, otp_code=await run_in_threadpool(hash_otp, otp))
+    db.add(new_otp)
+    await db.commit()
+    return otp
+
+
+async def verify_otp_async(db: AsyncSession, user_id: UUID, otp_code: str) -> bool:
+    """
+    Verify the OTP for the user.
+    """
+    statement = select(OTP).where(OTP.user_id == user_id, OTP.is_used == False)
+    otp = (await db.exec(statement)).first()
+    if not otp:
+        raise ValueError("Invalid OTP")
+
+    if await run_in_threadpool(v_otp, otp_code, otp.otp_code):
+        otp.is_used = True  # Mark the OTP as used
+        await db.commit()
+        return True
+
+    return False  # OTP verification failed
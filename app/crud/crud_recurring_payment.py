@@ -0,0 +1,141 @@
+from sqlmodel.orm.session import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel import delete, or_, select, update
+from uuid import UUID
+from datetime import date, datetime
+from typing import Any
+from app.models import LinkedAccount, RecurringPayment, Transaction
+
+
+def get_new_debits(db: Session, account_id: UUID, since: datetime | None) -> list[Any]:
+    """
+    Get the debits of an account stored after `since`, or all of them.
+
+    Returns:
+        list: Rows with raw_description, normalized_description, amount,
+            transaction_date and created_at, oldest first.
+    """
+    statement = select(
+        Transaction.raw_description,
+        Transaction.normalized_description,
+        Transaction.amount,
+        Transaction.transaction_date,
+        Transaction.created_at,
+    ).where(
+        Transaction.account_id == account_id,
+        Transaction.transaction_type == "debit",
+    )
+    if since is not None:
+        statement = statement.where(Transaction.created_at > since)
+    statement = statement.order_by(Transaction.transaction_date, Transaction.id)
+    return list(db.exec(statement).all())
+
+
+def get_merchant_debits(db: Session, account_id: UUID, merchant: str) -> list[Any]:
+    """
+    Get the debits of an account that may belong to a merchant, oldest first:
+    those normalized to its name, and those no merchant was recognised in,
+    whose merchant key is derived from the narration.
+
+    Returns:
+        list: Rows with raw_description, normalized_description, amount and
+            transaction_date.
+    """
+    statement = (
+        select(
+            Transaction.raw_description,
+            Transaction.normalized_description,
+            Transaction.amount,
+            Transaction.transaction_date,
+        )
+        .where(
+            Transaction.account_id == account_id,
+            Transaction.transaction_type == "debit",
+            or_(
+                Transaction.normalized_description == merchant,
+                Transaction.normalized_description == Transaction.raw_description,
+            ),
+        )
+        .order_by(Transaction.transaction_date, Transaction.id)
+    )
+    return list(db.exec(statement).all())
+
+
+def get_recurring_payment_states(
+    db: Session, account_id: UUID, merchants: list[str]
+) -> dict[str, RecurringPayment]:
+    """
+    Get the stored detection state of some merchants of an account.
+    """
+    if not merchants:
+        return {}
+    statement = select(RecurringPayment).where(
+        RecurringPayment.account_id == account_id,
+        RecurringPayment.merchant.in_(merchants),
+    )
+    return {payment.merchant: payment for payment in db.exec(statement).all()}
+
+
+def _recurring_payments_statement(
+    user_id: UUID, account_id: UUID | None, active_since: date | None
+):
+    statement = select(RecurringPayment).where(
+        RecurringPayment.user_id == user_id,
+        RecurringPayment.is_recurring,
+    )
+    if account_id:
+        statement = statement.where(RecurringPayment.account_id == account_id)
+    if active_since:
+        statement = statement.where(RecurringPayment.next_expected_date >= active_since)
+    return statement.order_by(
+        RecurringPayment.next_expected_date, RecurringPayment.merchant
+    )
+
+
+def get_recurring_payments(
+    db: Session,
+    user_id: UUID,
+    account_id: UUID | None = None,
+    active_since: date | None = None,
+) -> list[RecurringPayment]:
+    """
+    Get a user's detected recurring payments, next due first.
+
+    Args:
+        db (Session): The database session.
+        user_id (UUID): The user whose payments to get.
+        account_id (UUID, optional): Only include this linked account.
+        active_since (date, optional): Leave out payments that were expected
+            before this date and never charged.
+    """
+    statement = _recurring_payments_statement(user_id, account_id, active_since)
+    return list(db.exec(statement).all())
+
+
+async def get_recurring_payments_async(
+    db: AsyncSession,
+    user_id: UUID,
+    account_id: UUID | None = None,
+    active_since: date | None = None,
+) -> list[RecurringPayment]:
+    """
+    Get a user's detected recurring payments, next due first.
+    See get_recurring_payments.
+    """
+    statement = _recurring_payments_statement(user_id, account_id, active_since)
+    result = await db.exec(statement)
+    return list(result.all())
+
+
+def reset_recurring_payments(db: Session, user_id: UUID) -> None:
+    """
+    Forget a user's detected recurring payments, so the next scan of each of
+    their accounts starts over from the full history. The caller is
+    responsible for committing the session.
+    """
+    db.execute(delete(RecurringPayment).where(RecurringPayment.user_id == user_id))
+    db.execute(
+        update(LinkedAccount)
+        .where(LinkedAccount.user_id == user_id)
+        .values(recurring_scanned_at=None)
+    )
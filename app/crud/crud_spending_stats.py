@@ -0,0 +1,194 @@
+from sqlmodel.orm.session import Session
+from sqlmodel import case, delete, func, select
+from sqlalchemy import tuple_
+from uuid import UUID
+from datetime import date, datetime
+from typing import Any, Iterator
+from app.db.categories import transaction_categories
+from app.db.dialect import dialect_insert
+from app.models import CategoryStats, MerchantActivity, Transaction
+
+
+def get_category_stats(
+    db: Session, keys: list[tuple[UUID, str]]
+) -> dict[tuple[UUID, str], CategoryStats]:
+    """
+    Get the running statistics of some (user_id, category) pairs.
+    """
+    if not keys:
+        return {}
+    statement = select(CategoryStats).where(
+        tuple_(CategoryStats.user_id, CategoryStats.category).in_(keys)
+    )
+    return {(row.user_id, row.category): row for row in db.exec(statement).all()}
+
+
+def get_user_debit_counts(db: Session, user_ids: list[UUID]) -> dict[UUID, int]:
+    """
+    Get the number of debits each user's statistics were built from.
+    """
+    if not user_ids:
+        return {}
+    statement = (
+        select(CategoryStats.user_id, func.sum(CategoryStats.count))
+        .where(CategoryStats.user_id.in_(user_ids))
+        .group_by(CategoryStats.user_id)
+    )
+    return dict(db.exec(statement).all())
+
+
+def get_merchant_activity(
+    db: Session, keys: list[tuple[UUID, str]]
+) -> dict[tuple[UUID, str], MerchantActivity]:
+    """
+    Get the activity of some (user_id, merchant) pairs.
+    """
+    if not keys:
+        return {}
+    statement = select(MerchantActivity).where(
+        tuple_(MerchantActivity.user_id, MerchantActivity.merchant).in_(keys)
+    )
+    return {(row.user_id, row.merchant): row for row in db.exec(statement).all()}
+
+
+def apply_category_stats(
+    db: Session, stats: dict[tuple[UUID, str], tuple[int, float, float]]
+) -> None:
+    """
+    Merge the statistics of a batch of debits into the stored ones.
+
+    Each batch's (count, mean, m2) is combined with the stored row inside the
+    upsert using the parallel form of Welford's method, so concurrent syncs
+    of the same user never overwrite each other's updates. The caller is
+    responsible for committing the session.
+
+    Args:
+        db (Session): The database session.
+        stats (dict): (count, mean, m2) of the batch per (user_id, category).
+    """
+    if not stats:
+        return
+    now = datetime.now()
+    statement = dialect_insert(db)(CategoryStats)
+    excluded = statement.excluded
+    count = CategoryStats.count + excluded.count
+    delta = excluded.mean - CategoryStats.mean
+    statement = statement.on_conflict_do_update(
+        index_elements=["user_id", "category"],
+        set_={
+            "count": count,
+            "mean": CategoryStats.mean + delta * excluded.count / count,
+            "m2": CategoryStats.m2
+            + excluded.m2
+            + delta * delta * CategoryStats.count * excluded.count / count,
+            "updated_at": excluded.updated_at,
+        },
+    )
+    db.execute(
+        statement,
+        [
+            {
+                "user_id": user_id,
+                "category": category,
+                "count": count,
+                "mean": mean,
+                "m2": m2,
+                "updated_at": now,
+            }
+            for (user_id, category), (count, mean, m2) in stats.items()
+        ],
+    )
+
+
+def apply_merchant_activity(
+    db: Session, activity: dict[tuple[UUID, str], tuple[int, date, date, float]]
+) -> None:
+    """
+    Merge the merchant activity of a batch of debits into the stored one.
+    The caller is responsible for committing the session.
+
+    Args:
+        db (Session): The database session.
+        activity (dict): (txn_count, first_seen, last_seen, last_amount) of
+            the batch per (user_id, merchant).
+    """
+    if not activity:
+        return
+    now = datetime.now()
+    statement = dialect_insert(db)(MerchantActivity)
+    excluded = statement.excluded
+    is_later = excluded.last_seen >= MerchantActivity.last_seen
+    statement = statement.on_conflict_do_update(
+        index_elements=["user_id", "merchant"],
+        set_={
+            "txn_count": MerchantActivity.txn_count + excluded.txn_count,
+            "first_seen": case(
+                (
+                    excluded.first_seen < MerchantActivity.first_seen,
+                    excluded.first_seen,
+                ),
+                else_=MerchantActivity.first_seen,
+            ),
+            "last_seen": case(
+                (is_later, excluded.last_seen), else_=MerchantActivity.last_seen
+            ),
+            "last_amount": case(
+                (is_later, excluded.last_amount), else_=MerchantActivity.last_amount
+            ),
+            "updated_at": excluded.updated_at,
+        },
+    )
+    db.execute(
+        statement,
+        [
+            {
+                "user_id": user_id,
+                "merchant": merchant,
+                "txn_count": txn_count,
+                "first_seen": first_seen,
+                "last_seen": last_seen,
+                "last_amount": last_amount,
+                "updated_at": now,
+            }
+            for (user_id, merchant), (
+                txn_count,
+                first_seen,
+                last_seen,
+                last_amount,
+            ) in activity.items()
+        ],
+    )
+
+
+def reset_spending_stats(db: Session, user_id: UUID) -> None:
+    """
+    Delete a user's category statistics and merchant activity.
+    The caller is responsible for committing the session.
+    """
+    db.execute(delete(CategoryStats).where(CategoryStats.user_id == user_id))
+    db.execute(delete(MerchantActivity).where(MerchantActivity.user_id == user_id))
+
+
+def iter_user_debits(
+    db: Session, user_id: UUID, batch_size: int = 1000
+) -> Iterator[Any]:
+    """
+    Stream a user's debits, oldest first, with the columns the spending
+    statistics are built from.
+    """
+    transaction_categories.load(db)
+    statement = (
+        select(
+            Transaction.id,
+            Transaction.user_id,
+            Transaction.transaction_date,
+            Transaction.category,
+            Transaction.transaction_type,
+            Transaction.amount,
+            Transaction.raw_description,
+            Transaction.normalized_description,
+        )
+        .where(Transaction.user_id == user_id, Transaction.transaction_type == "debit")
+        .order_by(Transaction.transaction_date, Transaction.id)
+    )
+    yield from db.exec(statement.execution_options(yield_per=batch_size))
@@ -1,12 +1,35 @@
+import base64
+import json
+from datetime import date
+from uuid import UUID
 from sqlmodel.orm.session import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import Integer, bindparam, false, tuple_, type_coerce
+from app.crud.crud_daily_spend import apply_daily_spend
+from app.db.categories import categories_table, transaction_categories
+from app.db.dialect import dialect_insert
+from app.db.partitions import partitioning_enabled
 from app.models import Transaction
-from sqlmodel import select
+from app.models.types import TRANSACTION_TYPE_CODES
+from app.schemas import TransactionFilter
+from sqlmodel import select, update
+from typing import Any, Iterator, NamedTuple
+
+# Rows per INSERT statement; keeps bound parameters well under the
+# PostgreSQL (65535) and SQLite (32766) limits.
+BULK_INSERT_BATCH_SIZE = 1000
+
+# The unique key transactions are deduplicated on, and the wider one of a
+# table partitioned by month, whose unique keys must include transaction_date
+DEDUPE_KEY = ["account_id", "transaction_id"]
+PARTITIONED_DEDUPE_KEY = [*DEDUPE_KEY, "transaction_date"]
 
 
 def get_transaction_by_id(db: Session, id: int) -> Transaction | None:
     """
     Get a transaction by its ID.
     """
+    transaction_categories.load(db)
     statement = select(Transaction).where(Transaction.id == id)
     result = db.exec(statement).first()
     return result
@@ -16,17 +39,340 @@ def get_transactions(db: Session, account_id: str) -> list[Transaction]:
     """
     Get all transactions for a user by their user ID.
     """
+    transaction_categories.load(db)
     statement = select(Transaction).where(Transaction.account_id == account_id)
     result = db.exec(statement).all()
     return list(result)
 
 
+def encode_transaction_cursor(transaction: Transaction) -> str:
+    """
+    Encode the position after a transaction as an opaque page cursor.
+    """
+    position = [transaction.transaction_date.isoformat(), str(transaction.id)]
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+
+def decode_transaction_cursor(cursor: str) -> tuple[date, UUID]:
+    """
+    Decode a page cursor into the (transaction_date, id) it points after.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        transaction_date, transaction_id = json.loads(
+            base64.urlsafe_b64decode(cursor.encode())
+        )
+        return date.fromisoformat(transaction_date), UUID(transaction_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def filter_transactions(statement, filters: TransactionFilter | None):
+    """
+    Apply the optional transaction filters to a select statement.
+    """
+    if filters is None:
+        return statement
+    if filters.start_date:
+        statement = statement.where(Transaction.transaction_date >= filters.start_date)
+    if filters.end_date:
+        statement = statement.where(Transaction.transaction_date <= filters.end_date)
+    # A category missing from the cache, e.g. one no transaction uses yet, is
+    # resolved by the database instead of failing to bind
+    if filters.category:
+        if transaction_categories.cached_code(filters.category) is None:
+            statement = statement.where(
+                Transaction.category
+                == select(categories_table.c.id)
+                .where(categories_table.c.name == filters.category)
+                .scalar_subquery()
+            )
+        else:
+            statement = statement.where(Transaction.category == filters.category)
+    # Types without a code can't match any transaction
+    if filters.transaction_type:
+        if filters.transaction_type not in TRANSACTION_TYPE_CODES:
+            statement = statement.where(false())
+        else:
+            statement = statement.where(
+                Transaction.transaction_type == filters.transaction_type
+            )
+    if filters.min_amount is not None:
+        statement = statement.where(Transaction.amount >= filters.min_amount)
+    if filters.max_amount is not None:
+        statement = statement.where(Transaction.amount <= filters.max_amount)
+    return statement
+
+
+def _transactions_page_statement(
+    account_id: str | UUID,
+    limit: int,
+    filters: TransactionFilter | None,
+    cursor: str | None,
+):
+    """Select one row more than the page, to tell whether another page follows."""
+    statement = filter_transactions(
+        select(Transaction).where(Transaction.account_id == account_id), filters
+    )
+    if cursor:
+        cursor_date, cursor_id = decode_transaction_cursor(cursor)
+        # The plain date bound lets later monthly partitions be pruned, which
+        # the row comparison alone does not
+        statement = statement.where(
+            Transaction.transaction_date <= cursor_date,
+            tuple_(Transaction.transaction_date, Transaction.id)
+            < tuple_(cursor_date, cursor_id),
+        )
+    return statement.order_by(
+        Transaction.transaction_date.desc(), Transaction.id.desc()
+    ).limit(limit + 1)
+
+
+def _transactions_page(
+    transactions: list[Transaction], limit: int
+) -> tuple[list[Transaction], str | None]:
+    if len(transactions) <= limit:
+        return transactions, None
+    transactions = transactions[:limit]
+    return transactions, encode_transaction_cursor(transactions[-1])
+
+
+def get_transactions_page(
+    db: Session,
+    account_id: str | UUID,
+    limit: int,
+    filters: TransactionFilter | None = None,
+    cursor: str | None = None,
+) -> tuple[list[Transaction], str | None]:
+    """
+    Get a page of an account's transactions, newest first.
+
+    Pages are addressed by keyset on (transaction_date, id) rather than by
+    offset, so every page is a bounded index range scan however deep into
+    the history it is.
+
+    Args:
+        db (Session): The database session.
+        account_id (str | UUID): The linked account ID.
+        limit (int): The maximum number of transactions to return.
+        filters (TransactionFilter, optional): Filters to apply.
+        cursor (str, optional): The cursor returned with the previous page.
+
+    Returns:
+        tuple[list[Transaction], str | None]: The transactions, and the cursor
+            of the next page or None if this is the last page.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    transaction_categories.load(db)
+    statement = _transactions_page_statement(account_id, limit, filters, cursor)
+    return _transactions_page(list(db.exec(statement).all()), limit)
+
+
+async def get_transactions_page_async(
+    db: AsyncSession,
+    account_id: str | UUID,
+    limit: int,
+    filters: TransactionFilter | None = None,
+    cursor: str | None = None,
+) -> tuple[list[Transaction], str | None]:
+    """
+    Get a page of an account's transactions, newest first.
+    See get_transactions_page.
+    """
+    await transaction_categories.load_async(db)
+    statement = _transactions_page_statement(account_id, limit, filters, cursor)
+    result = await db.exec(statement)
+    return _transactions_page(list(result.all()), limit)
+
+
+def iter_transactions(
+    db: Session,
+    user_id: UUID,
+    columns: list,
+    account_id: UUID | None = None,
+    filters: TransactionFilter | None = None,
+    batch_size: int = 1000,
+) -> Iterator[Any]:
+    """
+    Stream a user's transactions, newest first, as rows of the given columns.
+
+    Rows are fetched batch_size at a time from a server side cursor where the
+    database supports one, so memory use does not grow with the result size.
+
+    Args:
+        db (Session): The database session.
+        user_id (UUID): The user whose transactions to stream.
+        columns (list): The columns of each row.
+        account_id (UUID, optional): Only stream this linked account's rows.
+        filters (TransactionFilter, optional): Filters to apply.
+        batch_size (int, optional): Rows fetched per round trip.
+    """
+    transaction_categories.load(db)
+    statement = select(*columns).where(Transaction.user_id == user_id)
+    if account_id is not None:
+        statement = statement.where(Transaction.account_id == account_id)
+    statement = filter_transactions(statement, filters).order_by(
+        Transaction.transaction_date.desc(), Transaction.id.desc()
+    )
+    yield from db.exec(statement.execution_options(yield_per=batch_size))
+
+
 def get_transaction_by_transaction_id(
     db: Session, transaction_id: str
 ) -> Transaction | None:
     """
     Get a transaction by its transaction ID.
     """
+    transaction_categories.load(db)
     statement = select(Transaction).where(Transaction.transaction_id == transaction_id)
     result = db.exec(statement).first()
     return result
+
+
+class InsertedTransaction(NamedTuple):
+    """The columns of a newly inserted transaction that the sync builds on."""
+
+    id: UUID
+    user_id: UUID
+    account_id: UUID
+    transaction_date: date
+    category: str | None
+    transaction_type: str
+    amount: int
+    raw_description: str | None
+    normalized_description: str | None
+
+
+def _new_provider_transactions(
+    db: Session, transactions: list[dict[str, Any]]
+) -> list[dict[str, Any]]:
+    """
+    Leave out rows whose provider ID is already stored on their account, on
+    any date, or repeated earlier in the batch.
+    """
+    unique = {}
+    for transaction in transactions:
+        unique.setdefault(
+            (transaction["account_id"], transaction["transaction_id"]), transaction
+        )
+    stored = db.execute(
+        select(Transaction.account_id, Transaction.transaction_id).where(
+            Transaction.account_id.in_({account_id for account_id, _ in unique}),
+            Transaction.transaction_id.in_(
+                {transaction_id for _, transaction_id in unique}
+            ),
+        )
+    ).all()
+    for key in stored:
+        unique.pop(tuple(key), None)
+    return list(unique.values())
+
+
+def bulk_insert_transactions(
+    db: Session, transactions: list[dict[str, Any]]
+) -> tuple[list[Any], int]:
+    """
+    Insert a batch of transactions, skipping rows that already exist.
+
+    Duplicates are detected by the database through the unique constraint on
+    (account_id, transaction_id), so a whole batch is deduplicated in one
+    statement instead of one SELECT per row. When transactions are
+    partitioned, that constraint also includes transaction_date, so provider
+    IDs are first checked in one query per batch, which keeps a transaction
+    the provider re-dated from being stored twice. The rows actually inserted
+    are returned by the statement and added to the daily spending rollup in
+    the same transaction. Categories are registered in their lookup table up
+    front and written as their codes. The caller is responsible for
+    committing the session.
+
+    Returns:
+        tuple[list[InsertedTransaction], int]: The inserted rows, and the
+            number of skipped rows.
+    """
+    if not transactions:
+        return [], 0
+    codes = transaction_categories.register(
+        db=db, names={transaction.get("category") for transaction in transactions}
+    )
+    transactions = [
+        {**transaction, "category": codes.get(transaction.get("category"))}
+        for transaction in transactions
+    ]
+    partitioned = partitioning_enabled(db.connection())
+    statement = (
+        dialect_insert(db)(Transaction)
+        .on_conflict_do_nothing(
+            index_elements=PARTITIONED_DEDUPE_KEY if partitioned else DEDUPE_KEY
+        )
+        .returning(
+            *(
+                getattr(Transaction, field)
+                for field in InsertedTransaction._fields
+                if field != "category"
+            ),
+            # New codes are only cached once the session commits, so they are
+            # returned as they are and mapped back to the registered names
+            type_coerce(Transaction.category, Integer).label("category"),
+        )
+    )
+    names = {code: name for name, code in codes.items()}
+    inserted = []
+    for start in range(0, len(transactions), BULK_INSERT_BATCH_SIZE):
+        batch = transactions[start : start + BULK_INSERT_BATCH_SIZE]
+        if partitioned:
+            batch = _new_provider_transactions(db, batch)
+            if not batch:
+                continue
+        inserted.extend(
+            InsertedTransaction(
+                **{**row._asdict(), "category": names.get(row.category)}
+            )
+            for row in db.execute(statement, batch)
+        )
+    apply_daily_spend(db=db, transactions=inserted)
+    return inserted, len(transactions) - len(inserted)
+
+
+def bulk_update_transaction_categories(
+    db: Session, updates: list[dict[str, Any]]
+) -> None:
+    """
+    Update the normalized description and category of many transactions.
+
+    Each update holds the transaction `id` and `transaction_date` with its new
+    `normalized_description` and `category`, and is applied in a single
+    executemany. Matching on the date as well as the id finds each row in a
+    single monthly partition. The caller is responsible for committing the
+    session.
+    """
+    if updates:
+        codes = transaction_categories.register(
+            db=db, names={row["category"] for row in updates}
+        )
+        statement = (
+            update(Transaction.__table__)
+            .where(
+                Transaction.id == bindparam("b_id"),
+                Transaction.transaction_date == bindparam("b_transaction_date"),
+            )
+            .values(
+                normalized_description=bindparam("normalized_description"),
+                category=bindparam("category"),
+            )
+        )
+        db.connection().execute(
+            statement,
+            [
+                {
+                    "b_id": row["id"],
+                    "b_transaction_date": row["transaction_date"],
+                    "normalized_description": row["normalized_description"],
+                    "category": codes.get(row["category"]),
+                }
+                for row in updates
+            ],
+        )
@@ -1,4 +1,6 @@
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.concurrency import run_in_threadpool
 from app.models import User
 from app.schemas import UserInternalCreate
 from sqlmodel import select
@@ -20,6 +22,19 @@ def insert_user(db: Session, user: UserInternalCreate) -> User:
     return return_message
 
 
+async def insert_user_async(db: AsyncSession, user: UserInternalCreate) -> User:
+    """
+    Create a new user in the database.
+    The password is hashed in a worker thread so it doesn't block the event loop.
+    """
+    user.hashed_password = await run_in_threadpool(password_hash, user.hashed_password)
+    db_user = User.model_validate(user)
+    db.add(db_user)
+    await db.commit()
+    await db.refresh(db_user)
+    return db_user
+
+
 def get_unverified_users(db: Session):
     """
     Retrieve all unverified users from the database.
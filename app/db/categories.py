@@ -0,0 +1,146 @@
+import threading
+from typing import Iterable
+from sqlalchemy import Integer, String, column, event, or_, select, table
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.db.dialect import dialect_insert
+
+# The lookup table of transaction category codes, as a lightweight table so
+# the models can depend on this module
+categories_table = table(
+    "transaction_categories",
+    column("id", Integer),
+    column("name", String),
+)
+
+# Codes registered by a session but not yet committed, kept in Session.info
+_PENDING = "pending_transaction_categories"
+
+
+class TransactionCategories:
+    """
+    A process wide cache of the transaction_categories lookup table, mapping
+    category names to the integer codes stored on transactions.
+
+    The cache only holds committed codes and never queries the database on
+    its own: CRUD functions load new codes through their session before
+    reading transactions, and codes registered by a session are only cached
+    once it commits.
+    """
+
+    def __init__(self):
+        self._codes: dict[str, int] = {}
+        self._names: dict[int, str] = {}
+        self._lock = threading.Lock()
+        # Every code up to _loaded_through is cached, except the _gaps, which
+        # were rolled back or not yet committed when the table was read
+        self._loaded_through = 0
+        self._gaps: set[int] = set()
+
+    def _cache(self, rows: Iterable) -> None:
+        with self._lock:
+            for code, name in rows:
+                self._codes[name] = code
+                self._names[code] = name
+            self._loaded_through = max(self._names, default=0)
+            self._gaps = set(range(1, self._loaded_through + 1)) - self._names.keys()
+
+    def _new_codes_statement(self):
+        """Select the codes committed since the cache was last loaded."""
+        new = categories_table.c.id > self._loaded_through
+        if self._gaps:
+            new = or_(new, categories_table.c.id.in_(self._gaps))
+        return select(categories_table.c.id, categories_table.c.name).where(new)
+
+    def _cache_committed(self, db: Session | AsyncSession, rows: Iterable) -> None:
+        # The session's own uncommitted codes are cached after it commits
+        pending = db.info.get(_PENDING, {})
+        self._cache((code, name) for code, name in rows if name not in pending)
+
+    def load(self, db: Session) -> None:
+        """
+        Cache the codes created since the last load, e.g. by another process,
+        through the caller's session. Called before reading transactions, so
+        their categories can be mapped back to names.
+        """
+        self._cache_committed(db, db.execute(self._new_codes_statement()).all())
+
+    async def load_async(self, db: AsyncSession) -> None:
+        """Cache the codes created since the last load. See load."""
+        result = await db.execute(self._new_codes_statement())
+        self._cache_committed(db, result.all())
+
+    def cached_code(self, name: str) -> int | None:
+        """The code of a category if it is cached."""
+        return self._codes.get(name)
+
+    def code(self, name: str) -> int:
+        """
+        The code of a category.
+
+        Raises:
+            ValueError: If the category's code is not cached.
+        """
+        try:
+            return self._codes[name]
+        except KeyError:
+            raise ValueError(f"Unregistered transaction category {name!r}") from None
+
+    def name(self, code: int) -> str:
+        """
+        The category name of a code.
+
+        Raises:
+            LookupError: If the code is not cached.
+        """
+        try:
+            return self._names[code]
+        except KeyError:
+            raise LookupError(
+                f"Transaction category code {code} is not loaded"
+            ) from None
+
+    def register(self, db: Session, names: Iterable[str | None]) -> dict[str, int]:
+        """
+        Create the codes of new categories in the session's transaction, before
+        rows using them are written. The caller is responsible for committing
+        the session; the new codes are cached once it commits.
+
+        Returns:
+            dict[str, int]: The code of each category name.
+        """
+        names = {name for name in names if name is not None}
+        codes = {name: self._codes[name] for name in names if name in self._codes}
+        missing = names - codes.keys()
+        if not missing:
+            return codes
+        # Existing categories are looked up first, so they don't use up
+        # sequence values on conflicting inserts
+        statement = select(categories_table.c.id, categories_table.c.name)
+        rows = db.execute(statement.where(categories_table.c.name.in_(missing)))
+        new = missing - {name for _, name in rows}
+        if new:
+            db.execute(
+                dialect_insert(db)(categories_table)
+                .values([{"name": name} for name in sorted(new)])
+                .on_conflict_do_nothing(index_elements=["name"])
+            )
+        rows = db.execute(statement.where(categories_table.c.name.in_(missing))).all()
+        db.info.setdefault(_PENDING, {}).update({name: code for code, name in rows})
+        codes.update({name: code for code, name in rows})
+        return codes
+
+
+transaction_categories = TransactionCategories()
+
+
+@event.listens_for(Session, "after_commit")
+def _cache_registered_categories(session: Session) -> None:
+    pending = session.info.pop(_PENDING, None)
+    if pending:
+        transaction_categories._cache((code, name) for name, code in pending.items())
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_registered_categories(session: Session) -> None:
+    session.info.pop(_PENDING, None)
@@ -0,0 +1,208 @@
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from sqlalchemy import Engine, create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from app.core import settings
+
+# The asyncio driver of each database, used by the async engine
+ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+
+@dataclass
+class PoolMetrics:
+    """Checkout wait times of one engine's pool, since the process started."""
+
+    name: str
+    checkouts: int = 0
+    timeouts: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def observe(self, wait_seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_seconds_total += wait_seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, wait_seconds)
+
+
+# Metrics of every engine created in this process, by name
+pool_metrics: dict[str, PoolMetrics] = {}
+_engines: dict[str, Engine | AsyncEngine] = {}
+
+
+def _instrumented_pool(base: type[QueuePool], metrics: PoolMetrics) -> type[QueuePool]:
+    """
+    A subclass of a queue pool that times every checkout. The metrics live on
+    the class, so they survive the pool being recreated by engine.dispose().
+    """
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = base._do_get(self)
+        except PoolTimeoutError:
+            metrics.observe(time.perf_counter() - start, timed_out=True)
+            raise
+        metrics.observe(time.perf_counter() - start)
+        return connection
+
+    return type(f"Instrumented{base.__name__}", (base,), {"_do_get": _do_get})
+
+
+def async_database_url(database_url: str):
+    """
+    Get the URL of the same database through its asyncio driver.
+    The libpq `sslmode` option is passed to asyncpg as `ssl`.
+    """
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    url = url.set(drivername=ASYNC_DRIVERS.get(backend, url.drivername))
+    if backend == "postgresql" and "sslmode" in url.query:
+        url = url.difference_update_query(["sslmode"]).update_query_dict(
+            {"ssl": url.query["sslmode"]}
+        )
+    return url
+
+
+def _engine_options(url, name: str, is_async: bool, read_only: bool) -> dict:
+    """Pool, statement timeout and read-only options for an engine."""
+    if url.get_backend_name() == "sqlite":
+        # SQLite is only used locally and in tests, keep its default pool
+        return {}
+    metrics = pool_metrics.setdefault(name, PoolMetrics(name=name))
+    options = {
+        "poolclass": _instrumented_pool(
+            AsyncAdaptedQueuePool if is_async else QueuePool, metrics
+        ),
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    server_settings = {}
+    if settings.DB_STATEMENT_TIMEOUT_MS:
+        server_settings["statement_timeout"] = str(settings.DB_STATEMENT_TIMEOUT_MS)
+    if read_only:
+        server_settings["default_transaction_read_only"] = "on"
+    if server_settings:
+        if is_async:
+            options["connect_args"] = {"server_settings": server_settings}
+        else:
+            options["connect_args"] = {
+                "options": " ".join(
+                    f"-c {key}={value}" for key, value in server_settings.items()
+                )
+            }
+    return options
+
+
+def _set_sqlite_query_only(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA query_only = ON")
+    cursor.close()
+
+
+def _create_engine(
+    name: str, database_url: str, is_async: bool, read_only: bool = False
+) -> Engine | AsyncEngine:
+    if name not in _engines:
+        url = async_database_url(database_url) if is_async else make_url(database_url)
+        options = _engine_options(url, name, is_async=is_async, read_only=read_only)
+        if is_async:
+            _engines[name] = create_async_engine(url, **options)
+        else:
+            _engines[name] = create_engine(url, **options)
+        if read_only and url.get_backend_name() == "sqlite":
+            sync_engine = _engines[name].sync_engine if is_async else _engines[name]
+            event.listen(sync_engine, "connect", _set_sqlite_query_only)
+    return _engines[name]
+
+
+def get_engine() -> Engine:
+    """
+    Get the shared sync engine of this process, creating it on first use.
+    Every sync caller (sessions, Celery tasks, exports) goes through it, so
+    the process holds a single pool.
+    """
+    return _create_engine("default", settings.DATABASE_URL, is_async=False)
+
+
+def get_async_engine() -> AsyncEngine:
+    """
+    Get the shared async engine of this process, creating it on first use.
+    """
+    return _create_engine("async", settings.DATABASE_URL, is_async=True)
+
+
+def get_replica_engine() -> Engine:
+    """
+    Get the sync engine of the read replica at DATABASE_REPLICA_URL, whose
+    connections are read-only. Falls back to the primary's engine when no
+    replica is configured.
+    """
+    if not settings.DATABASE_REPLICA_URL:
+        return get_engine()
+    return _create_engine(
+        "replica", settings.DATABASE_REPLICA_URL, is_async=False, read_only=True
+    )
+
+
+def get_async_replica_engine() -> AsyncEngine:
+    """
+    Get the async engine of the read replica, or the primary's when no
+    replica is configured.
+    """
+    if not settings.DATABASE_REPLICA_URL:
+        return get_async_engine()
+    return _create_engine(
+        "async_replica", settings.DATABASE_REPLICA_URL, is_async=True, read_only=True
+    )
+
+
+def dispose_after_fork() -> None:
+    """Drop the sync connections a forked process inherited from its parent."""
+    for engine in _engines.values():
+        if isinstance(engine, Engine):
+            engine.dispose(close=False)
+
+
+def pool_stats() -> dict:
+    """
+    Get the pool gauges and checkout wait times of this process's engines.
+
+    Returns:
+        dict: The process ID, and per engine the configured size, the
+            connections checked out, idle and in overflow, and the number of
+            checkouts, timeouts and their total and maximum wait in seconds.
+    """
+    engines = {}
+    for name, engine in _engines.items():
+        pool = engine.pool
+        stats = {"pool": type(pool).__name__}
+        if isinstance(pool, QueuePool):
+            stats.update(
+                size=pool.size(),
+                checked_out=pool.checkedout(),
+                checked_in=pool.checkedin(),
+                overflow=max(pool.overflow(), 0),
+            )
+        metrics = pool_metrics.get(name)
+        if metrics:
+            stats.update(
+                checkouts=metrics.checkouts,
+                timeouts=metrics.timeouts,
+                wait_seconds_total=round(metrics.wait_seconds_total, 6),
+                wait_seconds_max=round(metrics.wait_seconds_max, 6),
+            )
+        engines[name] = stats
+    return {"pid": os.getpid(), "engines": engines}
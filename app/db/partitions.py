@@ -0,0 +1,140 @@
+import re
+from datetime import date
+from typing import Iterable
+from sqlalchemy import Connection, text
+from app.core import settings
+
+# The partitioned table, its catch-all partition for rows outside every month
+TRANSACTIONS_TABLE = "transactions"
+DEFAULT_PARTITION = "transactions_default"
+
+# Advisory lock serializing partition DDL between processes
+PARTITION_LOCK_ID = 7_342_001
+
+_MONTHLY_PARTITION = re.compile(r"^transactions_y(\d{4})m(\d{2})$")
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def add_months(month: date, months: int) -> date:
+    """The first day of the month `months` after (or before) a month."""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    """The name of a month's partition, e.g. transactions_y2025m07."""
+    return f"transactions_y{month.year}m{month.month:02d}"
+
+
+def archive_name(month: date) -> str:
+    """The name a month's partition is given once detached."""
+    return f"transactions_archive_y{month.year}m{month.month:02d}"
+
+
+def partitioning_enabled(connection: Connection) -> bool:
+    """Whether transactions are range partitioned by month on this database."""
+    return settings.TRANSACTIONS_PARTITIONED and connection.dialect.name == "postgresql"
+
+
+def get_transaction_partitions(connection: Connection) -> dict[date, str]:
+    """
+    Get the monthly partitions attached to the transactions table.
+
+    Returns:
+        dict[date, str]: Partition names by the first day of their month.
+    """
+    names = connection.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = :table"
+        ),
+        {"table": TRANSACTIONS_TABLE},
+    ).scalars()
+    partitions = {}
+    for name in names:
+        match = _MONTHLY_PARTITION.match(name)
+        if match:
+            partitions[date(int(match[1]), int(match[2]), 1)] = name
+    return partitions
+
+
+def create_transaction_partitions(
+    connection: Connection, months: Iterable[date]
+) -> list[str]:
+    """
+    Create the missing partitions of the given months.
+
+    A month can only be created while the default partition holds none of
+    its rows, which is why future months are created ahead of time. The
+    caller is responsible for committing; the new partitions lock the
+    transactions table until then, so commit promptly.
+
+    Returns:
+        list[str]: The names of the partitions created.
+    """
+    existing = get_transaction_partitions(connection)
+    missing = sorted({month_start(month) for month in months} - set(existing))
+    if not missing:
+        return []
+    connection.execute(
+        text("SELECT pg_advisory_xact_lock(:id)"), {"id": PARTITION_LOCK_ID}
+    )
+    for month in missing:
+        connection.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS {partition_name(month)} "
+                f"PARTITION OF {TRANSACTIONS_TABLE} "
+                f"FOR VALUES FROM ('{month}') TO ('{add_months(month, 1)}')"
+            )
+        )
+    return [partition_name(month) for month in missing]
+
+
+def create_default_partition(connection: Connection) -> None:
+    """Create the partition holding rows dated outside every monthly one."""
+    connection.execute(
+        text(
+            f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} "
+            f"PARTITION OF {TRANSACTIONS_TABLE} DEFAULT"
+        )
+    )
+
+
+def detach_transaction_partitions(connection: Connection, before: date) -> list[str]:
+    """
+    Detach the monthly partitions of months before `before`, for cold storage.
+
+    Each detached partition becomes a standalone table named by archive_name,
+    moved to TRANSACTIONS_COLD_TABLESPACE when one is configured, which can
+    then be dumped and dropped. Its rows no longer appear in any query. The
+    caller is responsible for committing.
+
+    Returns:
+        list[str]: The archive tables.
+    """
+    connection.execute(
+        text("SELECT pg_advisory_xact_lock(:id)"), {"id": PARTITION_LOCK_ID}
+    )
+    archived = []
+    for month, name in sorted(get_transaction_partitions(connection).items()):
+        if month >= month_start(before):
+            break
+        archive = archive_name(month)
+        connection.execute(
+            text(f"ALTER TABLE {TRANSACTIONS_TABLE} DETACH PARTITION {name}")
+        )
+        connection.execute(text(f"ALTER TABLE {name} RENAME TO {archive}"))
+        if settings.TRANSACTIONS_COLD_TABLESPACE:
+            connection.execute(
+                text(
+                    f"ALTER TABLE {archive} "
+                    f"SET TABLESPACE {settings.TRANSACTIONS_COLD_TABLESPACE}"
+                )
+            )
+        archived.append(archive)
+    return archived
@@ -0,0 +1,15 @@
+import redis
+from functools import lru_cache
+from app.core import settings
+
+
+@lru_cache
+def get_redis() -> redis.Redis:
+    """
+    Get the shared Redis client used for locks and job bookkeeping.
+    Falls back to the Celery broker when REDIS_URL is not set.
+    """
+    return redis.Redis.from_url(
+        settings.REDIS_URL or settings.CELERY_BROKER_URL,
+        decode_responses=True,
+    )
@@ -1,12 +1,86 @@
-from sqlmodel import Session, create_engine
+import redis
+from uuid import UUID
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 from app.core import settings
+from app.db.engine import (
+    get_async_engine,
+    get_async_replica_engine,
+    get_engine,
+    get_replica_engine,
+)
+from app.db.redis import get_redis
+from app.utils.logger import logger
 
-
-DATABASE_URL = settings.DATABASE_URL
-engine = create_engine(DATABASE_URL)
+# Used by alembic, Celery tasks and the endpoints not yet moved to async
+engine = get_engine()
+async_engine = get_async_engine()
+# The read replica's engines, or the primary's when no replica is configured
+replica_engine = get_replica_engine()
+async_replica_engine = get_async_replica_engine()
 
 
 def get_session():
     """Creates a Session for a transaction"""
     with Session(engine) as session:
         yield session
+
+
+async def get_async_session():
+    """
+    Creates an AsyncSession for a transaction. Objects are not expired on
+    commit, so they can still be read without lazy loading afterwards.
+    """
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
+
+
+def get_read_session():
+    """Creates a read-only Session on the read replica"""
+    with Session(replica_engine) as session:
+        yield session
+
+
+async def get_async_read_session():
+    """Creates a read-only AsyncSession on the read replica"""
+    async with AsyncSession(async_replica_engine, expire_on_commit=False) as session:
+        yield session
+
+
+def primary_reads_key(user_id: UUID | str) -> str:
+    """Redis key present while a user's reads must go to the primary."""
+    return f"db:primary_reads:{user_id}"
+
+
+def mark_recent_write(user_id: UUID | str) -> None:
+    """
+    Route a user's reads to the primary for REPLICA_READ_YOUR_WRITES_SECONDS,
+    so they see their own writes before the replica catches up. Does nothing
+    when no replica is configured.
+    """
+    if not settings.DATABASE_REPLICA_URL:
+        return
+    try:
+        get_redis().set(
+            primary_reads_key(user_id),
+            1,
+            ex=settings.REPLICA_READ_YOUR_WRITES_SECONDS,
+        )
+    except redis.RedisError as e:
+        if settings.DEBUG:
+            logger.error(f"Error marking recent write: {e}")
+        else:
+            logger.error("Error marking recent write")
+
+
+def reads_from_primary(user_id: UUID | str) -> bool:
+    """
+    Whether a user's reads must go to the primary: when no replica is
+    configured, after a recent write, or when that can't be checked.
+    """
+    if not settings.DATABASE_REPLICA_URL:
+        return True
+    try:
+        return bool(get_redis().exists(primary_reads_key(user_id)))
+    except redis.RedisError:
+        return True
@@ -0,0 +1,75 @@
+from datetime import date
+from uuid import UUID
+from sqlmodel import Session, select
+from app.celery_app import celery_app
+from app.core import settings
+from app.crud import rebuild_daily_spend
+from app.db.session import engine
+from app.models import User
+from app.services.insights import refresh_insights
+from app.utils.logger import logger
+
+
+@celery_app.task(name="rebuild_daily_spend")
+def rebuild_daily_spend_job(
+    user_id: str | None = None,
+    start_date: str | None = None,
+    end_date: str | None = None,
+) -> int:
+    """
+    Rebuild the daily spending rollup from transactions, for repairs.
+
+    Args:
+        user_id (str, optional): Only rebuild this user's rollup.
+        start_date (str, optional): The first day to rebuild, as YYYY-MM-DD.
+        end_date (str, optional): The last day to rebuild, as YYYY-MM-DD.
+
+    Returns:
+        int: The number of rollup rows written.
+    """
+    with Session(engine) as db:
+        written = rebuild_daily_spend(
+            db=db,
+            user_id=UUID(user_id) if user_id else None,
+            start_date=date.fromisoformat(start_date) if start_date else None,
+            end_date=date.fromisoformat(end_date) if end_date else None,
+        )
+        db.commit()
+    logger.info(
+        f"Rebuilt {written} daily spend rows "
+        f"(user {user_id or 'all'}, {start_date or 'start'} to {end_date or 'end'})"
+    )
+    return written
+
+
+@celery_app.task(name="generate_all_insights")
+def generate_all_insights() -> int:
+    """
+    Recompute the current insights of every user.
+
+    Users are walked by ID in INSIGHTS_CHUNK_SIZE chunks; each chunk's
+    insights are computed from one rollup query and upserted together, then
+    committed.
+
+    Returns:
+        int: The number of insights stored.
+    """
+    stored = 0
+    last_id = None
+    with Session(engine) as db:
+        while True:
+            statement = (
+                select(User.id).order_by(User.id).limit(settings.INSIGHTS_CHUNK_SIZE)
+            )
+            if last_id is not None:
+                statement = statement.where(User.id > last_id)
+            user_ids = list(db.exec(statement).all())
+            if not user_ids:
+                break
+            last_id = user_ids[-1]
+
+            stored += len(refresh_insights(db=db, user_ids=user_ids))
+            db.commit()
+
+    logger.info(f"Stored {stored} insights")
+    return stored
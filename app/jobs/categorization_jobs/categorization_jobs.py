@@ -0,0 +1,106 @@
+from uuid import UUID
+from sqlmodel import Session, select
+from app.celery_app import celery_app
+from app.core import settings
+from app.crud import (
+    bulk_update_transaction_categories,
+    get_linked_accounts_by_user_id,
+    rebuild_daily_spend,
+    reset_recurring_payments,
+)
+from app.db.categories import transaction_categories
+from app.db.session import engine, mark_recent_write
+from app.models import Transaction
+from app.services.anomaly_detection import rebuild_spending_stats
+from app.services.categorization_rules import categorization_rules
+from app.services.recurring_payments import detect_recurring_payments
+from app.utils.logger import logger
+
+
+@celery_app.task(name="recategorize_transactions")
+def recategorize_transactions(user_id: str | None = None) -> dict:
+    """
+    Reapply the current categorization rules to stored transactions.
+
+    Transactions are walked in RECATEGORIZE_CHUNK_SIZE chunks by primary key,
+    and only rows whose normalized description or category changed are
+    updated. Each chunk is committed on its own, so the job holds no long
+    running transaction and can safely be run again if interrupted. The daily
+    spending rollup, spending statistics and recurring payments of every user
+    with a changed row are then rebuilt. Rows without a narration have
+    nothing to match and keep their current category.
+
+    Args:
+        user_id (str, optional): Only recategorize this user's transactions.
+    """
+    scanned = updated = 0
+    last_id = None
+    changed_users: set[UUID] = set()
+    with Session(engine) as db:
+        categorization_rules.refresh(db, force=True)
+        while True:
+            statement = (
+                select(
+                    Transaction.id,
+                    Transaction.user_id,
+                    Transaction.raw_description,
+                    Transaction.normalized_description,
+                    Transaction.category,
+                    Transaction.transaction_date,
+                )
+                .where(Transaction.raw_description.is_not(None))
+                .order_by(Transaction.id)
+                .limit(settings.RECATEGORIZE_CHUNK_SIZE)
+            )
+            if user_id is not None:
+                statement = statement.where(Transaction.user_id == UUID(user_id))
+            if last_id is not None:
+                statement = statement.where(Transaction.id > last_id)
+            transaction_categories.load(db)
+            chunk = db.exec(statement).all()
+            if not chunk:
+                break
+            last_id = chunk[-1].id
+
+            by_user: dict[UUID, list] = {}
+            for row in chunk:
+                by_user.setdefault(row.user_id, []).append(row)
+
+            updates = []
+            for owner_id, rows in by_user.items():
+                matcher = categorization_rules.matcher_for(db, owner_id)
+                matches = matcher.match_many([row.raw_description for row in rows])
+                for row, (normalized, category) in zip(rows, matches):
+                    if (normalized, category) != (
+                        row.normalized_description,
+                        row.category,
+                    ):
+                        changed_users.add(owner_id)
+                        updates.append(
+                            {
+                                "id": row.id,
+                                "transaction_date": row.transaction_date,
+                                "normalized_description": normalized,
+                                "category": category,
+                            }
+                        )
+
+            bulk_update_transaction_categories(db=db, updates=updates)
+            db.commit()
+            scanned += len(chunk)
+            updated += len(updates)
+
+        for owner_id in changed_users:
+            rebuild_daily_spend(db=db, user_id=owner_id)
+            rebuild_spending_stats(db=db, user_id=owner_id)
+            # Merchants may have been renamed, so rescan the full history
+            reset_recurring_payments(db=db, user_id=owner_id)
+            for linked_account in get_linked_accounts_by_user_id(
+                db=db, user_id=owner_id
+            ):
+                detect_recurring_payments(db=db, linked_account=linked_account)
+            db.commit()
+            mark_recent_write(owner_id)
+
+    logger.info(f"Recategorized {updated} of {scanned} transactions")
+    return {"scanned": scanned, "updated": updated}
@@ -0,0 +1,78 @@
+from datetime import date
+from sqlalchemy.exc import SQLAlchemyError
+from app.celery_app import celery_app
+from app.core import settings
+from app.db.partitions import (
+    add_months,
+    create_transaction_partitions,
+    detach_transaction_partitions,
+    month_start,
+    partitioning_enabled,
+)
+from app.db.session import engine
+from app.utils.logger import logger
+
+
+@celery_app.task(name="create_transaction_partitions")
+def create_transaction_partitions_job() -> list[str]:
+    """
+    Create the monthly transaction partitions of the current month and the
+    next TRANSACTION_PARTITIONS_AHEAD_MONTHS, before any row needs them.
+
+    Returns:
+        list[str]: The partitions created.
+    """
+    current = month_start(date.today())
+    months = [
+        add_months(current, offset)
+        for offset in range(settings.TRANSACTION_PARTITIONS_AHEAD_MONTHS + 1)
+    ]
+    with engine.connect() as connection:
+        if not partitioning_enabled(connection):
+            return []
+        try:
+            created = create_transaction_partitions(connection, months)
+            connection.commit()
+        except SQLAlchemyError as e:
+            # A month whose rows already sit in the default partition can't be
+            # created until they are moved out
+            if settings.DEBUG:
+                logger.error(f"Error creating transaction partitions: {e}")
+            else:
+                logger.error("Error creating transaction partitions")
+            raise
+    if created:
+        logger.info(f"Created transaction partitions {', '.join(created)}")
+    return created
+
+
+@celery_app.task(name="detach_transaction_partitions")
+def detach_transaction_partitions_job(before: str | None = None) -> list[str]:
+    """
+    Detach the transaction partitions of months before `before`, for cold
+    storage. Without it, partitions older than
+    TRANSACTION_PARTITIONS_RETENTION_MONTHS are detached, and none when that
+    is 0.
+
+    Args:
+        before (str, optional): The first month kept attached, as YYYY-MM-DD.
+
+    Returns:
+        list[str]: The archive tables of the detached partitions.
+    """
+    if before is not None:
+        cutoff = date.fromisoformat(before)
+    elif settings.TRANSACTION_PARTITIONS_RETENTION_MONTHS:
+        cutoff = add_months(
+            month_start(date.today()), -settings.TRANSACTION_PARTITIONS_RETENTION_MONTHS
+        )
+    else:
+        return []
+    with engine.connect() as connection:
+        if not partitioning_enabled(connection):
+            return []
+        archived = detach_transaction_partitions(connection, before=cutoff)
+        connection.commit()
+    if archived:
+        logger.info(f"Detached transaction partitions to {', '.join(archived)}")
+    return archived
@@ -0,0 +1,335 @@
+import asyncio
+import threading
+import time
+from dataclasses import asdict
+from datetime import datetime, timedelta
+from uuid import UUID, uuid4
+from sqlmodel import Session, select
+from app.celery_app import celery_app
+from app.core import settings
+from app.crud import get_linked_account_by_id
+from app.db.redis import get_redis
+from app.db.session import engine, mark_recent_write
+from app.models import LinkedAccount
+from app.services import security
+from app.services.mono_client import MonoClient
+from app.services.transaction_sync import SyncProgress, sync_account_transactions
+from app.utils.logger import logger
+from app.utils.rate_limit import RedisRateLimiter, RedisSemaphore
+
+# Mono account IDs reported as changed by webhooks, scored by time
+DIRTY_ACCOUNTS_KEY = "sync:dirty"
+
+# Caps the number of syncs running at once across all workers
+sync_slots = RedisSemaphore(
+    key="sync:slots",
+    limit=settings.SYNC_MAX_CONCURRENT_JOBS,
+    timeout=settings.SYNC_LOCK_TTL_SECONDS,
+)
+
+# Requests per minute allowed against each provider's API, across all workers
+PROVIDER_REQUESTS_PER_MINUTE = {"mono": settings.MONO_REQUESTS_PER_MINUTE}
+
+# Celery priorities for the scheduled fan-out (0 is the highest)
+DIRTY_ACCOUNT_PRIORITY = 0
+STALE_ACCOUNT_PRIORITY = 6
+
+# Deletes a lock only if it is still held by the given job
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+# Takes a lock, or extends it if the given job already holds it
+CLAIM_LOCK_SCRIPT = """
+local holder = redis.call("get", KEYS[1])
+if not holder or holder == ARGV[1] then
+    redis.call("set", KEYS[1], ARGV[1], "EX", ARGV[2])
+    return 1
+end
+return 0
+"""
+
+# Extends a lock's expiry only if it is still held by the given job
+REFRESH_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("expire", KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+
+def sync_lock_key(account_id: str) -> str:
+    """Redis key holding the ID of the sync job in flight for an account."""
+    return f"sync:account:{account_id}"
+
+
+def sync_job_key(job_id: str) -> str:
+    """Redis key holding the owner of a sync job."""
+    return f"sync:job:{job_id}"
+
+
+def provider_rate_limiter(provider: str) -> RedisRateLimiter:
+    """Get the shared request rate limiter for a provider's API."""
+    return RedisRateLimiter(
+        key=f"ratelimit:{provider}",
+        limit=PROVIDER_REQUESTS_PER_MINUTE.get(
+            provider, settings.MONO_REQUESTS_PER_MINUTE
+        ),
+    )
+
+
+def mark_account_dirty(provider_account_id: str) -> None:
+    """Record that the provider reported new data for an account."""
+    get_redis().zadd(DIRTY_ACCOUNTS_KEY, {provider_account_id: time.time()})
+
+
+def enqueue_account_sync(
+    account_id: str,
+    user_id: str,
+    full: bool = False,
+    countdown: float | None = None,
+    priority: int | None = None,
+) -> tuple[str, bool]:
+    """
+    Enqueue a sync for a linked account, unless one is already in flight.
+
+    Returns:
+        tuple[str, bool]: The job ID, and whether a new job was enqueued. When
+            a sync for the account is already queued or running, its job ID is
+            returned instead.
+    """
+    redis = get_redis()
+    lock_key = sync_lock_key(account_id)
+    job_id = str(uuid4())
+    lock_ttl = settings.SYNC_LOCK_TTL_SECONDS + int(countdown or 0)
+    while not redis.set(lock_key, job_id, nx=True, ex=lock_ttl):
+        existing_job_id = redis.get(lock_key)
+        if existing_job_id:
+            return existing_job_id, False
+        # The lock expired between the two calls, try to take it again
+
+    redis.hset(
+        sync_job_key(job_id),
+        mapping={"account_id": account_id, "user_id": user_id},
+    )
+    redis.expire(sync_job_key(job_id), settings.SYNC_JOB_TTL_SECONDS)
+    sync_account_transactions_job.apply_async(
+        args=(account_id, full),
+        task_id=job_id,
+        countdown=countdown,
+        priority=priority,
+    )
+    return job_id, True
+
+
+def get_sync_job_owner(job_id: str) -> dict[str, str]:
+    """Get the account and user a sync job was enqueued for."""
+    return get_redis().hgetall(sync_job_key(job_id))
+
+
+def _keep_sync_claimed(job_id: str, account_id: str, stop: threading.Event) -> None:
+    """
+    Refresh the job's concurrency slot and account lock until stop is set, so
+    a sync outliving SYNC_LOCK_TTL_SECONDS keeps both.
+    """
+    while not stop.wait(settings.SYNC_LOCK_TTL_SECONDS / 3):
+        try:
+            sync_slots.refresh(job_id)
+            get_redis().eval(
+                REFRESH_LOCK_SCRIPT,
+                1,
+                sync_lock_key(account_id),
+                job_id,
+                settings.SYNC_LOCK_TTL_SECONDS,
+            )
+        except Exception as e:
+            if settings.DEBUG:
+                logger.error(f"Error refreshing sync job {job_id}: {e}")
+            else:
+                logger.error("Error refreshing sync job")
+
+
+async def _run_sync(db: Session, linked_account, full: bool, on_progress):
+    """Run the sync on a Mono client bound to this task's event loop."""
+    rate_limiter = provider_rate_limiter(linked_account.provider)
+    async with MonoClient(rate_limiter=rate_limiter) as client:
+        return await sync_account_transactions(
+            db=db,
+            linked_account=linked_account,
+            full=full,
+            client=client,
+            on_progress=on_progress,
+        )
+
+
+@celery_app.task(name="sync_account_transactions", bind=True, max_retries=None)
+def sync_account_transactions_job(self, account_id: str, full: bool = False) -> dict:
+    """
+    Sync a linked account's transactions from Mono, reporting progress.
+    Waits for a free slot when SYNC_MAX_CONCURRENT_JOBS syncs are running.
+
+    The account's lock is claimed again on every attempt, so it is kept for
+    however long the job waits for a slot. If it expired and another sync of
+    the account took it meanwhile, this job stops without syncing.
+    """
+    if not get_redis().eval(
+        CLAIM_LOCK_SCRIPT,
+        1,
+        sync_lock_key(account_id),
+        self.request.id,
+        settings.SYNC_LOCK_TTL_SECONDS + settings.SYNC_SLOT_RETRY_SECONDS,
+    ):
+        return {
+            "account_id": account_id,
+            **asdict(
+                SyncProgress(errors=["A sync for this account is already running"])
+            ),
+        }
+    if not sync_slots.acquire(self.request.id):
+        raise self.retry(countdown=settings.SYNC_SLOT_RETRY_SECONDS)
+
+    progress = SyncProgress()
+    user_id = None
+    stop_refreshing = threading.Event()
+    threading.Thread(
+        target=_keep_sync_claimed,
+        args=(self.request.id, account_id, stop_refreshing),
+        daemon=True,
+    ).start()
+
+    def report(current: SyncProgress) -> None:
+        nonlocal progress
+        progress = current
+        self.update_state(
+            state="PROGRESS", meta={"account_id": account_id, **asdict(current)}
+        )
+
+    try:
+        with Session(engine) as db:
+            linked_account = get_linked_account_by_id(
+                db=db, account_id=UUID(account_id)
+            )
+            if not linked_account:
+                progress.errors.append("Linked account not found")
+            else:
+                user_id = linked_account.user_id
+                progress = asyncio.run(_run_sync(db, linked_account, full, report))
+    except Exception as e:
+        if settings.DEBUG:
+            logger.exception(f"Error syncing account {account_id}: {e}")
+        else:
+            logger.exception("Error syncing account")
+        progress.errors.append(str(e) if settings.DEBUG else "Sync failed")
+    finally:
+        stop_refreshing.set()
+        # Let the user read the synced rows before the replica catches up
+        if user_id:
+            mark_recent_write(user_id)
+        sync_slots.release(self.request.id)
+        get_redis().eval(
+            RELEASE_LOCK_SCRIPT, 1, sync_lock_key(account_id), self.request.id
+        )
+
+    return {"account_id": account_id, **asdict(progress)}
+
+
+@celery_app.task(name="sync_all_linked_accounts")
+def sync_all_linked_accounts() -> None:
+    """
+    Enqueue a sync for every linked account that needs one.
+
+    Accounts the provider reported as changed are enqueued first with a higher
+    priority, followed by accounts not synced within SYNC_STALE_AFTER_MINUTES,
+    least recently synced first. Jobs for each provider are spread out so the
+    fan-out never enqueues faster than SYNC_FANOUT_ACCOUNTS_PER_MINUTE.
+    """
+    redis = get_redis()
+    started_at = time.time()
+    dirty = set(redis.zrangebyscore(DIRTY_ACCOUNTS_KEY, "-inf", started_at))
+    stale_before = datetime.now() - timedelta(minutes=settings.SYNC_STALE_AFTER_MINUTES)
+
+    # (is_stale, last_synced_at, account_id, user_id, provider_account_id) per
+    # provider
+    due: dict[str, list[tuple]] = {}
+    last_id = None
+    with Session(engine) as db:
+        while True:
+            statement = (
+                select(
+                    LinkedAccount.id,
+                    LinkedAccount.user_id,
+                    LinkedAccount.provider,
+                    LinkedAccount.provider_account_id,
+                    LinkedAccount.last_synced_at,
+                )
+                .order_by(LinkedAccount.id)
+                .limit(settings.SYNC_FANOUT_CHUNK_SIZE)
+            )
+            if last_id is not None:
+                statement = statement.where(LinkedAccount.id > last_id)
+            chunk = db.exec(statement).all()
+            if not chunk:
+                break
+            last_id = chunk[-1].id
+
+            for account in chunk:
+                provider_account_id = (
+                    security.decrypt(encrypted_data=account.provider_account_id)
+                    if dirty
+                    else None
+                )
+                is_dirty = provider_account_id in dirty
+                is_stale = not account.last_synced_at or (
+                    account.last_synced_at < stale_before
+                )
+                if is_dirty or is_stale:
+                    due.setdefault(account.provider, []).append(
+                        (
+                            not is_dirty,
+                            account.last_synced_at or datetime.min,
+                            str(account.id),
+                            str(account.user_id),
+                            provider_account_id,
+                        )
+                    )
+
+    # Countdowns stay within one fan-out interval, so runs never overlap, and
+    # far enough below the broker's visibility timeout that a waiting job is
+    # not redelivered. Accounts past that are left for the next run
+    interval = 60 / settings.SYNC_FANOUT_ACCOUNTS_PER_MINUTE
+    max_countdown = min(
+        settings.SYNC_FANOUT_INTERVAL_MINUTES * 60,
+        settings.CELERY_VISIBILITY_TIMEOUT_SECONDS - settings.SYNC_LOCK_TTL_SECONDS,
+    )
+    enqueued = 0
+    deferred_dirty = []
+    for provider, accounts in due.items():
+        accounts.sort()
+        for position, account in enumerate(accounts):
+            is_stale, _, account_id, user_id, provider_account_id = account
+            countdown = position * interval
+            if countdown >= max_countdown:
+                if not is_stale:
+                    deferred_dirty.append(provider_account_id)
+                continue
+            _, created = enqueue_account_sync(
+                account_id=account_id,
+                user_id=user_id,
+                countdown=countdown,
+                priority=STALE_ACCOUNT_PRIORITY if is_stale else DIRTY_ACCOUNT_PRIORITY,
+            )
+            enqueued += created
+
+    # Webhooks received while the fan-out ran are kept for the next run, as
+    # are changed accounts it had no room for
+    redis.zremrangebyscore(DIRTY_ACCOUNTS_KEY, "-inf", started_at)
+    if deferred_dirty:
+        redis.zadd(
+            DIRTY_ACCOUNTS_KEY,
+            {provider_account_id: started_at for provider_account_id in deferred_dirty},
+            nx=True,
+        )
+    logger.info(f"Enqueued {enqueued} scheduled account syncs")
@@ -2,6 +2,7 @@ import os
 import json
 from langchain_community.utilities import SQLDatabase
 from app.core import settings
+from app.db.session import replica_engine
 from langchain.chat_models import init_chat_model
 from langgraph.checkpoint.memory import MemorySaver
 from langgraph.graph import StateGraph, START, END
@@ -16,7 +17,10 @@ from datetime import date
 
 
 os.environ["GOOGLE_API_KEY"] = settings.GOOGLE_API_KEY
-db = SQLDatabase.from_uri(settings.DATABASE_URL)
+# Assistant generated SQL runs on the read replica when DATABASE_REPLICA_URL
+# is set, whose connections are read-only. Without one it runs on the
+# primary's read-write connections, so only the prompt keeps it to reads
+db = SQLDatabase(replica_engine)
 llm = init_chat_model(model="gemini-2.0-flash", model_provider="google_genai")
 
 system = """
@@ -47,6 +51,8 @@ just return all the balances or balance and not the sum total
 
 Most importantly You are writing SQL for a PostgreSQL database. Use PostgreSQL date/time functions, not SQLite functions
 Also, In PostgreSQL, always use single quotes for string values in SQL queries."
+In transactions, category and transaction_type are integer codes: join transaction_categories (id, name) on transactions.category = transaction_categories.id for the category name, and transaction_types (id, name) on transactions.transaction_type = transaction_types.id for 'debit' or 'credit'. Always filter and group by those names, never by guessed codes.
+When limiting transactions to a time range, compare transaction_date itself to date literals (e.g. transaction_date >= '2025-01-01'), never a function of it, so only the matching months of the table are read.
 Lastly and MOST IMPORTANTLY, institution column of linked_accounts is of type JSON. When grouping or selecting distinct institutions, use institution->>'name' for the name, or institution::text to group by the whole object.
 """
 
@@ -1,6 +1,15 @@
-from fastapi import FastAPI
+import secrets
+from fastapi import Depends, FastAPI, Header, HTTPException, status
 from app.utils.logger import logger
-from app.db.session import get_session
+from app.db.engine import pool_stats
+from app.db.session import (
+    async_engine,
+    async_replica_engine,
+    engine,
+    get_async_session,
+    replica_engine,
+)
+from app.services.mono_client import mono_client
 from app.api.v1 import (
     accounts_router,
     users_router,
@@ -9,10 +18,13 @@ from app.api.v1 import (
     insights_router,
     assistant_router,
     webhooks_router,
+    categorization_rules_router,
+    analytics_router,
+    recurring_payments_router,
 )
 from fastapi.middleware.cors import CORSMiddleware
 from sqlmodel import select
-from app.models import User
+from sqlmodel.ext.asyncio.session import AsyncSession
 from app.core import settings
 from contextlib import asynccontextmanager
 
@@ -21,7 +33,13 @@ from contextlib import asynccontextmanager
 async def lifespan(app: FastAPI):
 
     logger.info("🚀 Application startup")
+    await mono_client.open()
     yield
+    await mono_client.aclose()
+    await async_engine.dispose()
+    await async_replica_engine.dispose()
+    engine.dispose()
+    replica_engine.dispose()
     logger.info("🛑 Application shutdown")
 
 
@@ -48,6 +66,9 @@ app.include_router(transactions_router)
 app.include_router(insights_router)
 app.include_router(assistant_router)
 app.include_router(webhooks_router)
+app.include_router(categorization_rules_router)
+app.include_router(analytics_router)
+app.include_router(recurring_payments_router)
 
 
 @app.get("/api/v1/health")
@@ -58,11 +79,37 @@ async def health_check():
 
 
 @app.get("/api/v1/db-health")
-async def db_health_check():
+async def db_health_check(db: AsyncSession = Depends(get_async_session)):
     """Database health check endpoint."""
     try:
-        db = next(get_session())
-        db.exec(select(User))
+        await db.exec(select(1))
         return {"status": "ok"}
     except Exception as e:
         return {"status": "error", "detail": str(e)}
+
+
+def verify_metrics_token(
+    metrics_token: str = Header(None, alias="metrics-token"),
+) -> None:
+    """Allow only callers holding METRICS_TOKEN, hiding the route while unset."""
+    if not settings.METRICS_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not metrics_token or not secrets.compare_digest(
+        metrics_token, settings.METRICS_TOKEN
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Unauthorized request"
+        )
+
+
+@app.get(
+    "/api/v1/db-pool",
+    dependencies=[Depends(verify_metrics_token)],
+    include_in_schema=False,
+)
+async def db_pool_metrics():
+    """
+    Connection pool gauges and checkout wait times of this worker process,
+    for monitoring that sends the metrics-token header.
+    """
+    return pool_stats()
@@ -1,7 +1,26 @@
 from .account import LinkedAccount
 from .transaction import Transaction
+from .transaction_category import TransactionCategory, TransactionType
 from .user import User
 from .insight import Insight
 from .otp import OTP
+from .categorization_rule import CategorizationRule, CategorizationRuleVersion
+from .daily_spend import DailySpend
+from .recurring_payment import RecurringPayment
+from .spending_stats import CategoryStats, MerchantActivity
 
-__all__ = ["User", "LinkedAccount", "Transaction", "Insight", "OTP"]
+__all__ = [
+    "User",
+    "LinkedAccount",
+    "Transaction",
+    "TransactionCategory",
+    "TransactionType",
+    "Insight",
+    "OTP",
+    "CategorizationRule",
+    "CategorizationRuleVersion",
+    "DailySpend",
+    "RecurringPayment",
+    "CategoryStats",
+    "MerchantActivity",
+]
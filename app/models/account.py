@@ -3,13 +3,13 @@ from sqlalchemy import Column
 from sqlalchemy.dialects.sqlite import JSON
 from uuid import uuid4, UUID
 from typing import Optional, Dict, Any
-from datetime import datetime
+from datetime import date, datetime
 
 
 class LinkedAccount(SQLModel, table=True):
     __tablename__ = "linked_accounts"
     id: UUID = Field(default_factory=uuid4, primary_key=True)
-    user_id: UUID = Field(foreign_key="users.id")
+    user_id: UUID = Field(foreign_key="users.id", index=True)
     provider: str = Field(default="mono", max_length=50)
     provider_account_id: str
     account_name: str
@@ -20,6 +20,12 @@ class LinkedAccount(SQLModel, table=True):
     institution: Optional[Dict[str, Any]] = Field(sa_column=Column(JSON))
     user: Optional["User"] = Relationship(back_populates="linked_accounts")
     transactions: list["Transaction"] = Relationship(back_populates="account")
+    last_transaction_date: Optional[date] = None
+    last_synced_at: Optional[datetime] = None
+    sync_window_start: Optional[date] = None
+    sync_window_end: Optional[date] = None
+    sync_resume_page: Optional[int] = None
+    recurring_scanned_at: Optional[datetime] = None
     created_at: datetime = Field(default_factory=datetime.now)
     updated_at: datetime = Field(default_factory=datetime.now)
 
@@ -0,0 +1,35 @@
+from sqlmodel import SQLModel, Field
+from uuid import UUID, uuid4
+from typing import Optional
+from datetime import datetime
+
+
+class CategorizationRule(SQLModel, table=True):
+    """
+    A keyword rule for normalizing and categorizing transaction narrations.
+    Rules without a user apply to everyone; a user's own rules take precedence.
+    """
+
+    __tablename__ = "categorization_rules"
+
+    id: UUID = Field(default_factory=uuid4, primary_key=True)
+    user_id: Optional[UUID] = Field(default=None, foreign_key="users.id", index=True)
+    keyword: str = Field(max_length=100)
+    merchant: Optional[str] = Field(default=None, max_length=100)
+    category: Optional[str] = Field(default=None, max_length=50)
+    priority: int = Field(default=0)
+    created_at: datetime = Field(default_factory=datetime.now)
+    updated_at: datetime = Field(default_factory=datetime.now)
+
+
+class CategorizationRuleVersion(SQLModel, table=True):
+    """
+    A single row stamp bumped on every rule change, so workers can tell when
+    their compiled rules are stale without reloading them.
+    """
+
+    __tablename__ = "categorization_rule_version"
+
+    id: int = Field(default=1, primary_key=True)
+    version: int = Field(default=0)
+    updated_at: datetime = Field(default_factory=datetime.now)
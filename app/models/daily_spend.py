@@ -0,0 +1,22 @@
+from sqlmodel import SQLModel, Field
+from sqlalchemy import BigInteger
+from uuid import UUID
+from datetime import date, datetime
+
+
+class DailySpend(SQLModel, table=True):
+    """
+    Transactions rolled up per user, account, day and category. Amounts are
+    in kobo. Kept up to date as transactions are inserted.
+    """
+
+    __tablename__ = "daily_spend"
+
+    user_id: UUID = Field(foreign_key="users.id", primary_key=True)
+    account_id: UUID = Field(foreign_key="linked_accounts.id", primary_key=True)
+    day: date = Field(primary_key=True)
+    category: str = Field(primary_key=True, max_length=50)
+    txn_count: int = Field(default=0)
+    debit_total: int = Field(default=0, sa_type=BigInteger)
+    credit_total: int = Field(default=0, sa_type=BigInteger)
+    updated_at: datetime = Field(default_factory=datetime.now)
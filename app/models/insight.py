@@ -1,15 +1,24 @@
 from sqlmodel import SQLModel, Field
+from sqlalchemy import Index, UniqueConstraint
 from uuid import UUID, uuid4
 from datetime import datetime
 
 
 class Insight(SQLModel, table=True):
-    """The insight table"""
+    """The insight table. Each user has one current insight per period and kind."""
 
     __tablename__ = "insights"
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id", "period", "kind", name="uq_insights_user_id_period_kind"
+        ),
+        Index("ix_insights_user_id_created_at", "user_id", "created_at"),
+    )
 
     id: UUID = Field(default_factory=uuid4, primary_key=True)
     user_id: UUID = Field(foreign_key="users.id")
+    period: str = Field(default="30d", max_length=20)
+    kind: str = Field(default="info", max_length=50)
     message: str
     type: str = Field(default="info")
     created_at: datetime = Field(default_factory=datetime.now)
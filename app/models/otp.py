@@ -1,4 +1,5 @@
 from sqlmodel import SQLModel, Field, Relationship
+from sqlalchemy import Index
 from uuid import UUID, uuid4
 from datetime import datetime
 
@@ -8,6 +9,8 @@ class OTP(SQLModel, table=True):
     Represents a One-Time Password (OTP) for user authentication.
     """
 
+    __table_args__ = (Index("ix_otp_user_id_is_used", "user_id", "is_used"),)
+
     id: UUID = Field(default_factory=uuid4, primary_key=True)
     user_id: UUID = Field(foreign_key="users.id", nullable=False)
     otp_code: str = Field(nullable=False)
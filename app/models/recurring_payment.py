@@ -0,0 +1,28 @@
+from sqlmodel import SQLModel, Field
+from uuid import UUID
+from typing import Optional
+from datetime import date, datetime
+
+
+class RecurringPayment(SQLModel, table=True):
+    """
+    The charge history of one merchant on a linked account, reduced to the
+    state needed to detect a recurring payment. Amounts are in kobo. Updated
+    incrementally from the debits stored by each sync.
+    """
+
+    __tablename__ = "recurring_payments"
+
+    account_id: UUID = Field(foreign_key="linked_accounts.id", primary_key=True)
+    merchant: str = Field(primary_key=True)
+    user_id: UUID = Field(foreign_key="users.id", index=True)
+    charge_count: int = Field(default=0)
+    streak: int = Field(default=0)
+    streak_start: date
+    average_amount: float = Field(default=0)
+    average_interval_days: Optional[float] = None
+    last_amount: float = Field(default=0)
+    last_date: date
+    next_expected_date: Optional[date] = None
+    is_recurring: bool = Field(default=False)
+    updated_at: datetime = Field(default_factory=datetime.now)
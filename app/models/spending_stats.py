@@ -0,0 +1,37 @@
+from sqlmodel import SQLModel, Field
+from uuid import UUID
+from datetime import date, datetime
+
+
+class CategoryStats(SQLModel, table=True):
+    """
+    Running statistics of a user's debit amounts in a category, in kobo.
+    The mean and sum of squared deviations (m2) are kept with Welford's
+    method, so each new transaction updates them in constant time.
+    """
+
+    __tablename__ = "category_stats"
+
+    user_id: UUID = Field(foreign_key="users.id", primary_key=True)
+    category: str = Field(primary_key=True, max_length=50)
+    count: int = Field(default=0)
+    mean: float = Field(default=0)
+    m2: float = Field(default=0)
+    updated_at: datetime = Field(default_factory=datetime.now)
+
+
+class MerchantActivity(SQLModel, table=True):
+    """
+    When a user was first and last charged by a merchant, and the amount of
+    the last charge in kobo.
+    """
+
+    __tablename__ = "merchant_activity"
+
+    user_id: UUID = Field(foreign_key="users.id", primary_key=True)
+    merchant: str = Field(primary_key=True)
+    txn_count: int = Field(default=0)
+    first_seen: date
+    last_seen: date
+    last_amount: float = Field(default=0)
+    updated_at: datetime = Field(default_factory=datetime.now)
@@ -1,19 +1,74 @@
 from sqlmodel import SQLModel, Field, Relationship
+from sqlalchemy import BigInteger, Index, UniqueConstraint
 from uuid import uuid4, UUID
 from typing import Optional, Type
 from datetime import date, datetime
+from app.models.types import CategoryCode, TransactionTypeCode
 
 
 class Transaction(SQLModel, table=True):
     __tablename__ = "transactions"
+    __table_args__ = (
+        # When transactions are partitioned by month, the migration adds the
+        # partition key transaction_date to it, as every unique key of a
+        # partitioned table must include it
+        UniqueConstraint(
+            "account_id",
+            "transaction_id",
+            name="uq_transactions_account_id_transaction_id",
+        ),
+        # Keyset pagination and the filters of GET /transactions
+        Index(
+            "ix_transactions_account_id_transaction_date_id",
+            "account_id",
+            "transaction_date",
+            "id",
+        ),
+        Index(
+            "ix_transactions_account_id_category_transaction_date_id",
+            "account_id",
+            "category",
+            "transaction_date",
+            "id",
+        ),
+        Index(
+            "ix_transactions_account_id_transaction_type_transaction_date_id",
+            "account_id",
+            "transaction_type",
+            "transaction_date",
+            "id",
+        ),
+        # Debits stored since the last recurring payment scan of an account
+        Index("ix_transactions_account_id_created_at", "account_id", "created_at"),
+        # A user's transactions across accounts: exports, analytics and rollups
+        Index(
+            "ix_transactions_user_id_transaction_date_id",
+            "user_id",
+            "transaction_date",
+            "id",
+        ),
+        # Provider transaction lookups, e.g. from webhooks
+        Index("ix_transactions_transaction_id", "transaction_id"),
+    )
     id: UUID = Field(default_factory=uuid4, primary_key=True)
     account_id: UUID = Field(foreign_key="linked_accounts.id")
     user_id: UUID = Field(foreign_key="users.id")
     transaction_id: str
-    amount: float
+    # In kobo
+    amount: int = Field(sa_type=BigInteger)
     currency: str
-    category: Optional[str] = None
-    transaction_type: str = Field(default="debit", max_length=10)
+    # Stored as integer codes of the transaction_categories and
+    # transaction_types lookup tables, read and written as their names
+    category: Optional[str] = Field(
+        default=None,
+        sa_type=CategoryCode,
+        foreign_key="transaction_categories.id",
+    )
+    transaction_type: str = Field(
+        default="debit",
+        sa_type=TransactionTypeCode,
+        foreign_key="transaction_types.id",
+    )
     raw_description: Optional[str] = None
     normalized_description: Optional[str] = None
     transaction_date: date
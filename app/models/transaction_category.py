@@ -0,0 +1,34 @@
+from sqlmodel import SQLModel, Field
+from sqlalchemy import Column, Integer, SmallInteger, event, insert
+from typing import Optional
+from app.models.types import TRANSACTION_TYPE_CODES
+
+
+class TransactionCategory(SQLModel, table=True):
+    """A transaction category and the integer code transactions store."""
+
+    __tablename__ = "transaction_categories"
+
+    id: Optional[int] = Field(
+        default=None,
+        sa_column=Column(Integer, primary_key=True, autoincrement=True),
+    )
+    name: str = Field(max_length=50, unique=True)
+
+
+class TransactionType(SQLModel, table=True):
+    """A transaction type and its code, fixed by TRANSACTION_TYPE_CODES."""
+
+    __tablename__ = "transaction_types"
+
+    id: int = Field(sa_type=SmallInteger, primary_key=True)
+    name: str = Field(max_length=10, unique=True)
+
+
+@event.listens_for(TransactionType.__table__, "after_create")
+def _insert_transaction_types(target, connection, **kwargs) -> None:
+    """Fill the transaction types when the table is created outside alembic."""
+    connection.execute(
+        insert(target),
+        [{"id": code, "name": name} for name, code in TRANSACTION_TYPE_CODES.items()],
+    )
@@ -0,0 +1,49 @@
+from sqlalchemy import Integer, SmallInteger
+from sqlalchemy.types import TypeDecorator
+from app.db.categories import transaction_categories
+
+# Codes of the transaction types, also in the transaction_types lookup table
+TRANSACTION_TYPE_CODES = {"debit": 1, "credit": 2}
+TRANSACTION_TYPE_NAMES = {code: name for name, code in TRANSACTION_TYPE_CODES.items()}
+
+
+class TransactionTypeCode(TypeDecorator):
+    """A transaction type, "debit" or "credit", stored as its small integer code."""
+
+    impl = SmallInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        try:
+            return TRANSACTION_TYPE_CODES[value]
+        except KeyError:
+            raise ValueError(f"Unknown transaction type {value!r}") from None
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else TRANSACTION_TYPE_NAMES[value]
+
+
+class CategoryCode(TypeDecorator):
+    """
+    A transaction category stored as its code in the transaction_categories
+    lookup table, mapped through the codes already cached, without querying.
+    New categories must be registered with transaction_categories.register
+    before rows using them are written, and new codes loaded with
+    transaction_categories.load before rows are read. Codes the caller
+    resolved itself, e.g. ones registered but not yet committed, are bound
+    as they are. Categories can be created by users' categorization rules,
+    so codes are full integers.
+    """
+
+    impl = Integer
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None or isinstance(value, int):
+            return value
+        return transaction_categories.code(value)
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else transaction_categories.name(value)
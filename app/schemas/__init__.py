@@ -12,10 +12,18 @@ from .insight import InsightGenerateReturnList
 from .assistant import LLMResponse, LLMQuery
 from .account import LinkedAccountReturnDetails, LinkedAccountReturnList, AccountCode
 from .transaction import (
+    TransactionFilter,
     TransactionReturnDetails,
     TransactionReturnList,
     TransactionSyncResponse,
 )
+from .analytics import DailySpendReturnList, CategorySpendReturnList
+from .recurring_payment import RecurringPaymentReturnList
+from .categorization_rule import (
+    CategorizationRuleCreate,
+    CategorizationRuleReturnDetails,
+    CategorizationRuleReturnList,
+)
 
 __all__ = [
     "UserCreate",
@@ -32,4 +40,10 @@ __all__ = [
     "UserInternalCreate",
     "AccountCode",
     "EmailVerificationResponse",
+    "CategorizationRuleCreate",
+    "CategorizationRuleReturnDetails",
+    "CategorizationRuleReturnList",
+    "DailySpendReturnList",
+    "CategorySpendReturnList",
+    "RecurringPaymentReturnList",
 ]
@@ -0,0 +1,40 @@
+from sqlmodel import SQLModel, Field
+from datetime import date
+
+
+class DailySpendDetail(SQLModel):
+    day: date
+    txn_count: int
+    debit_total: float
+    credit_total: float
+
+
+class CategorySpendDetail(SQLModel):
+    category: str
+    txn_count: int
+    debit_total: float
+    credit_total: float
+
+
+class DailySpendReturnList(SQLModel):
+    success: bool = Field(default=True)
+    status: str
+    message: str
+    start_date: date
+    end_date: date
+    data: list[DailySpendDetail] = []
+
+    class Config:
+        from_attributes = True
+
+
+class CategorySpendReturnList(SQLModel):
+    success: bool = Field(default=True)
+    status: str
+    message: str
+    start_date: date
+    end_date: date
+    data: list[CategorySpendDetail] = []
+
+    class Config:
+        from_attributes = True
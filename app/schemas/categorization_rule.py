@@ -0,0 +1,42 @@
+from sqlmodel import SQLModel, Field
+from uuid import UUID
+from datetime import datetime
+from typing import Optional
+
+
+class CategorizationRuleCreate(SQLModel):
+    keyword: str = Field(min_length=2, max_length=100)
+    merchant: Optional[str] = Field(default=None, max_length=100)
+    category: Optional[str] = Field(default=None, max_length=50)
+    priority: int = Field(default=0)
+
+
+class CategorizationRuleDetail(SQLModel):
+    id: UUID
+    user_id: Optional[UUID]
+    keyword: str
+    merchant: Optional[str]
+    category: Optional[str]
+    priority: int
+    created_at: datetime
+    updated_at: datetime
+
+
+class CategorizationRuleReturnDetails(SQLModel):
+    success: bool = Field(default=True)
+    status: str
+    message: str
+    data: CategorizationRuleDetail | None = None
+
+    class Config:
+        from_attributes = True
+
+
+class CategorizationRuleReturnList(SQLModel):
+    success: bool = Field(default=True)
+    status: str
+    message: str
+    data: list[CategorizationRuleDetail] = []
+
+    class Config:
+        from_attributes = True
@@ -1,5 +1,5 @@
 from sqlmodel import SQLModel
-from typing import List
+from typing import List, Optional
 from ..models import Insight
 
 
@@ -10,6 +10,7 @@ class InsightGenerateReturnList(SQLModel):
     message: str  # Message describing the result of the operation
     status: int  # Status of the operation
     insights: List[Insight]  # List of generated insights
+    next_cursor: Optional[str] = None  # Cursor of the next page, if any
 
     class Config:
         """Configuration for the schema."""
@@ -0,0 +1,28 @@
+from sqlmodel import SQLModel, Field
+from uuid import UUID
+from datetime import date
+from typing import Optional
+
+
+class RecurringPaymentDetail(SQLModel):
+    account_id: UUID
+    merchant: str
+    cadence: Optional[str]
+    average_amount: float
+    last_amount: float
+    average_interval_days: Optional[float]
+    charge_count: int
+    streak: int
+    streak_start: date
+    last_date: date
+    next_expected_date: Optional[date]
+
+
+class RecurringPaymentReturnList(SQLModel):
+    success: bool = Field(default=True)
+    status: str
+    message: str
+    data: list[RecurringPaymentDetail] = []
+
+    class Config:
+        from_attributes = True
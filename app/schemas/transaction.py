@@ -20,6 +20,15 @@ class Transaction(SQLModel):
     updated_at: datetime
 
 
+class TransactionFilter(SQLModel):
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    category: Optional[str] = None
+    transaction_type: Optional[str] = None
+    min_amount: Optional[float] = None
+    max_amount: Optional[float] = None
+
+
 class TransactionReturnDetails(SQLModel):
     success: bool = True
     status: str
@@ -56,6 +65,7 @@ class TransactionReturnList(SQLModel):
     status: str
     message: str
     data: list[Transaction] = []
+    next_cursor: Optional[str] = None
 
     class Config:
         from_attributes = True
@@ -63,6 +73,7 @@ class TransactionReturnList(SQLModel):
             "example": {
                 "status": "success",
                 "message": "Transactions retrieved successfully",
+                "next_cursor": "WyIyMDIzLTEwLTAxIiwgIjEyM2U0NTY3Il0",
                 "data": [
                     {
                         "id": "123e4567-e89b-12d3-a456-426614174000",
@@ -103,12 +114,24 @@ class TransactionSyncResponse(SQLModel):
     success: bool = True
     status: str
     message: str
+    job_id: Optional[str] = None
+    state: Optional[str] = None
+    pages_fetched: int = 0
+    inserted: int = 0
+    skipped: int = 0
+    errors: list[str] = []
 
     class Config:
         from_attributes = True
         json_schema_extra = {
             "example": {
-                "status": "success",
-                "message": "Transactions synced successfully.",
+                "status": "200",
+                "message": "Sync job status retrieved successfully",
+                "job_id": "5b1f8a52-7a0e-4c53-9a52-2f3b0b1f7c11",
+                "state": "running",
+                "pages_fetched": 12,
+                "inserted": 1180,
+                "skipped": 20,
+                "errors": [],
             }
         }
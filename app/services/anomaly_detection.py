@@ -0,0 +1,256 @@
+import math
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any, Iterable
+from uuid import UUID
+from sqlmodel import Session
+from app.crud import (
+    apply_category_stats,
+    apply_merchant_activity,
+    get_category_stats,
+    get_merchant_activity,
+    get_user_debit_counts,
+    insert_insights,
+    iter_user_debits,
+    reset_spending_stats,
+)
+from app.crud.crud_daily_spend import UNCATEGORIZED
+from app.models.insight import Insight
+from app.services.normalizer import is_known_merchant, merchant_key
+
+# The period anomaly insights are stored under, one row per transaction and kind
+ANOMALY_PERIOD = "transaction"
+
+# Debits a category needs before its amounts are scored
+MIN_CATEGORY_SAMPLES = 10
+
+# Standard deviations above the category mean that make a charge unusual
+UNUSUAL_AMOUNT_Z_SCORE = 3.0
+
+# Only debits dated within this many days are flagged, so backfilled history
+# updates the statistics without raising stale warnings
+ANOMALY_LOOKBACK_DAYS = 7
+
+
+@dataclass
+class RunningStats:
+    """Count, mean and sum of squared deviations, updated with Welford's method."""
+
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    @property
+    def stddev(self) -> float:
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+
+@dataclass
+class _Batch:
+    """The statistics and merchant activity accumulated from a batch of debits."""
+
+    stats: dict[tuple[UUID, str], RunningStats]
+    activity: dict[tuple[UUID, str], list]
+
+    def add(self, debit: Any, category: str) -> None:
+        self.stats.setdefault((debit.user_id, category), RunningStats()).add(
+            debit.amount
+        )
+        merchant = merchant_key(debit.raw_description, debit.normalized_description)
+        if merchant:
+            day = debit.transaction_date
+            activity = self.activity.setdefault(
+                (debit.user_id, merchant), [0, day, day, debit.amount]
+            )
+            activity[0] += 1
+            activity[1] = min(activity[1], day)
+            if day >= activity[2]:
+                activity[2], activity[3] = day, debit.amount
+
+    def save(self, db: Session) -> None:
+        apply_category_stats(
+            db=db,
+            stats={
+                key: (stats.count, stats.mean, stats.m2)
+                for key, stats in self.stats.items()
+            },
+        )
+        apply_merchant_activity(
+            db=db,
+            activity={key: tuple(value) for key, value in self.activity.items()},
+        )
+
+
+def _anomaly(debit: Any, kind: str, message: str) -> Insight:
+    return Insight(
+        user_id=debit.user_id,
+        period=ANOMALY_PERIOD,
+        kind=f"{kind}:{debit.id.hex}",
+        message=message,
+        type="warning",
+    )
+
+
+def detect_anomalies(db: Session, transactions: Iterable[Any]) -> list[Insight]:
+    """
+    Flag unusual debits among newly inserted transactions.
+
+    Each debit is scored against the running statistics of its user and
+    category before being added to them, so nothing is rescanned. Three
+    anomalies are stored as warning insights:
+
+    - unusual_amount: more than UNUSUAL_AMOUNT_Z_SCORE standard deviations
+      above the category mean.
+    - new_merchant: the first charge from a recognised merchant, for users
+      with history. Transfers and other narrations no merchant was
+      recognised in are not flagged.
+    - duplicate_charge: the same amount from the same merchant or payee on
+      the same day as the previous charge.
+
+    Merchant activity is tracked by merchant key, so a payee whose transfer
+    references change each time has a single row.
+
+    The statistics are then merged into the stored ones. The caller is
+    responsible for committing the session.
+
+    Args:
+        db (Session): The database session.
+        transactions (Iterable): Inserted rows with id, user_id,
+            transaction_date, category, transaction_type, amount,
+            raw_description and normalized_description.
+
+    Returns:
+        list[Insight]: The anomalies found.
+    """
+    debits = sorted(
+        (
+            transaction
+            for transaction in transactions
+            if transaction.transaction_type == "debit" and transaction.amount
+        ),
+        key=lambda debit: debit.transaction_date,
+    )
+    if not debits:
+        return []
+
+    stored_stats = get_category_stats(
+        db=db,
+        keys=list(
+            {(debit.user_id, debit.category or UNCATEGORIZED) for debit in debits}
+        ),
+    )
+    merchants = {
+        debit.id: merchant_key(debit.raw_description, debit.normalized_description)
+        for debit in debits
+    }
+    stored_activity = get_merchant_activity(
+        db=db,
+        keys=list(
+            {
+                (debit.user_id, merchants[debit.id])
+                for debit in debits
+                if merchants[debit.id]
+            }
+        ),
+    )
+    history = get_user_debit_counts(
+        db=db, user_ids=list({debit.user_id for debit in debits})
+    )
+
+    running = {
+        key: RunningStats(stats.count, stats.mean, stats.m2)
+        for key, stats in stored_stats.items()
+    }
+    last_charges = {
+        key: (activity.last_seen, activity.last_amount)
+        for key, activity in stored_activity.items()
+    }
+    recent = date.today() - timedelta(days=ANOMALY_LOOKBACK_DAYS)
+    batch = _Batch(stats={}, activity={})
+    anomalies = []
+    for debit in debits:
+        category = debit.category or UNCATEGORIZED
+        stats = running.setdefault((debit.user_id, category), RunningStats())
+        merchant = merchants[debit.id]
+        last_charge = last_charges.get((debit.user_id, merchant))
+        amount = debit.amount / 100
+
+        if debit.transaction_date >= recent:
+            if (
+                stats.count >= MIN_CATEGORY_SAMPLES
+                and stats.stddev
+                and (debit.amount - stats.mean) / stats.stddev > UNUSUAL_AMOUNT_Z_SCORE
+            ):
+                anomalies.append(
+                    _anomaly(
+                        debit,
+                        "unusual_amount",
+                        f"Unusually large {category} charge of {amount:.2f}"
+                        f"{f' at {merchant}' if merchant else ''} on "
+                        f"{debit.transaction_date}. Your {category} charges "
+                        f"average {stats.mean / 100:.2f}",
+                    )
+                )
+            if merchant and last_charge is None:
+                if (
+                    is_known_merchant(
+                        debit.raw_description, debit.normalized_description
+                    )
+                    and history.get(debit.user_id, 0) >= MIN_CATEGORY_SAMPLES
+                ):
+                    anomalies.append(
+                        _anomaly(
+                            debit,
+                            "new_merchant",
+                            f"First charge from {merchant}: {amount:.2f} on "
+                            f"{debit.transaction_date}",
+                        )
+                    )
+            elif merchant and last_charge == (debit.transaction_date, debit.amount):
+                anomalies.append(
+                    _anomaly(
+                        debit,
+                        "duplicate_charge",
+                        f"Possible duplicate charge of {amount:.2f} at "
+                        f"{merchant} on {debit.transaction_date}",
+                    )
+                )
+
+        stats.add(debit.amount)
+        if merchant:
+            last_charges[(debit.user_id, merchant)] = (
+                debit.transaction_date,
+                debit.amount,
+            )
+        batch.add(debit, category)
+
+    batch.save(db)
+    insert_insights(db=db, insights=anomalies)
+    return anomalies
+
+
+def rebuild_spending_stats(db: Session, user_id: UUID, batch_size: int = 1000) -> int:
+    """
+    Recompute a user's category statistics and merchant activity from their
+    debits, without raising anomalies. Used when categories or merchants of
+    stored transactions change. The caller is responsible for committing the
+    session.
+
+    Returns:
+        int: The number of debits scanned.
+    """
+    reset_spending_stats(db=db, user_id=user_id)
+    batch = _Batch(stats={}, activity={})
+    scanned = 0
+    for debit in iter_user_debits(db=db, user_id=user_id, batch_size=batch_size):
+        if debit.amount:
+            batch.add(debit, debit.category or UNCATEGORIZED)
+        scanned += 1
+    batch.save(db)
+    return scanned
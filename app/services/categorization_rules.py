@@ -0,0 +1,103 @@
+import threading
+import time
+from collections import OrderedDict
+from uuid import UUID
+from sqlmodel import Session
+from app.core import settings
+from app.crud import (
+    get_categorization_rules,
+    get_categorization_rules_version,
+    get_users_with_categorization_rules,
+)
+from app.services.normalizer import NarrationMatcher, default_matcher
+
+
+class CategorizationRuleRegistry:
+    """
+    Compiled categorization rules, kept in step with the database.
+
+    The rules version is read at most once every CATEGORIZATION_RULES_REFRESH_SECONDS,
+    and matchers are only recompiled when it changes, so a rule change is picked
+    up by every worker without a restart or a rebuild per request. Users with
+    their own rules get a matcher layering them over the global rules; at most
+    CATEGORIZATION_RULES_USER_CACHE_SIZE of those are kept compiled.
+    """
+
+    def __init__(
+        self,
+        refresh_seconds: float | None = None,
+        user_cache_size: int | None = None,
+    ):
+        self.refresh_seconds = (
+            settings.CATEGORIZATION_RULES_REFRESH_SECONDS
+            if refresh_seconds is None
+            else refresh_seconds
+        )
+        self.user_cache_size = (
+            user_cache_size or settings.CATEGORIZATION_RULES_USER_CACHE_SIZE
+        )
+        self._lock = threading.Lock()
+        self._version: int | None = None
+        self._checked_at = 0.0
+        self._global_rules: list = []
+        self._global_matcher: NarrationMatcher = default_matcher
+        self._override_users: set[UUID] = set()
+        self._user_matchers: OrderedDict[UUID, NarrationMatcher] = OrderedDict()
+
+    def refresh(self, db: Session, force: bool = False) -> None:
+        """Recompile the rules if their version changed since the last check."""
+        now = time.monotonic()
+        if not force and now - self._checked_at < self.refresh_seconds:
+            return
+        with self._lock:
+            self._checked_at = now
+            version = get_categorization_rules_version(db)
+            if version == self._version:
+                return
+            self._global_rules = get_categorization_rules(db)
+            self._global_matcher = (
+                NarrationMatcher.from_rules(self._global_rules)
+                if self._global_rules
+                else default_matcher
+            )
+            self._override_users = get_users_with_categorization_rules(db)
+            self._user_matchers.clear()
+            self._version = version
+
+    def matcher_for(self, db: Session, user_id: UUID | None = None) -> NarrationMatcher:
+        """
+        Get the compiled rules that apply to a user's transactions.
+
+        Args:
+            db (Session): The database session.
+            user_id (UUID, optional): The user whose own rules should apply.
+
+        Returns:
+            NarrationMatcher: The matcher for the user, or the global one.
+        """
+        self.refresh(db)
+        if user_id is None or user_id not in self._override_users:
+            return self._global_matcher
+
+        with self._lock:
+            matcher = self._user_matchers.get(user_id)
+            if matcher is not None:
+                self._user_matchers.move_to_end(user_id)
+                return matcher
+
+        # User rules go first so they take precedence over the global ones
+        rules = get_categorization_rules(db, user_id=user_id) + self._global_rules
+        matcher = NarrationMatcher.from_rules(rules)
+        with self._lock:
+            self._user_matchers[user_id] = matcher
+            if len(self._user_matchers) > self.user_cache_size:
+                self._user_matchers.popitem(last=False)
+        return matcher
+
+    @property
+    def version(self) -> int | None:
+        """The rules version the compiled matchers were built from."""
+        return self._version
+
+
+categorization_rules = CategorizationRuleRegistry()
@@ -0,0 +1,176 @@
+import io
+from itertools import islice
+from typing import Any, Callable, Iterator
+import pyarrow as pa
+import pyarrow.parquet as pq
+from app.models import Insight, Transaction
+
+COLUMNAR_MEDIA_TYPES = {
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+# Small, repetitive string columns are stored once per batch and referenced
+# by index
+_category = pa.dictionary(pa.int16(), pa.string())
+_code = pa.dictionary(pa.int8(), pa.string())
+
+TRANSACTION_SCHEMA = pa.schema(
+    [
+        ("id", pa.string()),
+        ("account_id", pa.string()),
+        ("transaction_id", pa.string()),
+        ("transaction_date", pa.date32()),
+        ("amount_kobo", pa.int64()),
+        ("currency", _code),
+        ("transaction_type", _code),
+        ("category", _category),
+        ("normalized_description", pa.string()),
+        ("raw_description", pa.string()),
+        ("created_at", pa.timestamp("us")),
+    ]
+)
+TRANSACTION_COLUMNS = [
+    Transaction.id,
+    Transaction.account_id,
+    Transaction.transaction_id,
+    Transaction.transaction_date,
+    Transaction.amount,
+    Transaction.currency,
+    Transaction.transaction_type,
+    Transaction.category,
+    Transaction.normalized_description,
+    Transaction.raw_description,
+    Transaction.created_at,
+]
+
+INSIGHT_SCHEMA = pa.schema(
+    [
+        ("id", pa.string()),
+        ("type", _code),
+        ("message", pa.string()),
+        ("created_at", pa.timestamp("us")),
+    ]
+)
+INSIGHT_COLUMNS = [Insight.id, Insight.type, Insight.message, Insight.created_at]
+
+
+def _transaction_record(row: Any) -> tuple:
+    """Convert a transaction row to the TRANSACTION_SCHEMA field order."""
+    return (str(row[0]), str(row[1]), *row[2:])
+
+
+def _insight_record(row: Any) -> tuple:
+    """Convert an insight row to the INSIGHT_SCHEMA field order."""
+    return (str(row[0]), *row[1:])
+
+
+class _ChunkSink(io.RawIOBase):
+    """A write-only file that buffers what is written until it is drained."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _record_batches(
+    rows: Iterator[Any],
+    schema: pa.Schema,
+    to_record: Callable[[Any], tuple],
+    batch_size: int,
+) -> Iterator[pa.RecordBatch]:
+    """Group rows into record batches of at most batch_size rows."""
+    while True:
+        records = [to_record(row) for row in islice(rows, batch_size)]
+        if not records:
+            return
+        columns = list(zip(*records))
+        yield pa.RecordBatch.from_arrays(
+            [
+                pa.array(column, type=field.type)
+                for column, field in zip(columns, schema)
+            ],
+            schema=schema,
+        )
+
+
+def write_columnar(
+    rows: Iterator[Any],
+    schema: pa.Schema,
+    to_record: Callable[[Any], tuple],
+    export_format: str,
+    compression: str | None,
+    batch_size: int,
+) -> Iterator[bytes]:
+    """
+    Encode rows as Parquet or an Arrow IPC stream, one record batch at a time.
+
+    Every batch is flushed as soon as it is written, so memory is bounded by
+    batch_size and output starts with the first batch. Parquet gets one row
+    group per batch and its footer at the end.
+
+    Args:
+        rows (Iterator): Database rows, in the order of the columns.
+        schema (pa.Schema): The output schema.
+        to_record (Callable): Converts a row to the schema's field order.
+        export_format (str): Either "parquet" or "arrow".
+        compression (str, optional): "zstd", or None to write uncompressed.
+        batch_size (int): Rows per record batch.
+    """
+    sink = _ChunkSink()
+    if export_format == "parquet":
+        writer = pq.ParquetWriter(sink, schema, compression=compression or "none")
+    else:
+        writer = pa.ipc.new_stream(
+            sink, schema, options=pa.ipc.IpcWriteOptions(compression=compression)
+        )
+    with writer:
+        for batch in _record_batches(rows, schema, to_record, batch_size):
+            writer.write_batch(batch)
+            yield sink.drain()
+    yield sink.drain()
+
+
+def transactions_to_columnar(
+    rows: Iterator[Any],
+    export_format: str,
+    compression: str | None,
+    batch_size: int,
+) -> Iterator[bytes]:
+    """Encode rows of TRANSACTION_COLUMNS with TRANSACTION_SCHEMA."""
+    return write_columnar(
+        rows,
+        TRANSACTION_SCHEMA,
+        _transaction_record,
+        export_format,
+        compression,
+        batch_size,
+    )
+
+
+def insights_to_columnar(
+    rows: Iterator[Any],
+    export_format: str,
+    compression: str | None,
+    batch_size: int,
+) -> Iterator[bytes]:
+    """Encode rows of INSIGHT_COLUMNS with INSIGHT_SCHEMA."""
+    return write_columnar(
+        rows, INSIGHT_SCHEMA, _insight_record, export_format, compression, batch_size
+    )
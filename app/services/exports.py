@@ -0,0 +1,146 @@
+import csv
+import io
+import json
+from typing import Iterator
+from uuid import UUID
+from sqlmodel import Session
+from app.core import settings
+from app.crud import iter_insights, iter_transactions
+from app.db.session import engine
+from app.models import Transaction
+from app.schemas import TransactionFilter
+from app.services.columnar_export import (
+    COLUMNAR_MEDIA_TYPES,
+    INSIGHT_COLUMNS,
+    TRANSACTION_COLUMNS,
+    insights_to_columnar,
+    transactions_to_columnar,
+)
+
+# Columns written by every text export, in order
+EXPORT_COLUMNS = [
+    Transaction.id,
+    Transaction.account_id,
+    Transaction.transaction_id,
+    Transaction.transaction_date,
+    Transaction.amount,
+    Transaction.currency,
+    Transaction.transaction_type,
+    Transaction.category,
+    Transaction.normalized_description,
+    Transaction.raw_description,
+]
+EXPORT_FIELDS = [column.key for column in EXPORT_COLUMNS]
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    **COLUMNAR_MEDIA_TYPES,
+}
+
+
+def _transaction_rows(
+    user_id: UUID,
+    account_id: UUID | None,
+    filters: TransactionFilter,
+    columns: list,
+) -> Iterator[tuple]:
+    """
+    Stream the transaction rows to export on a session of their own.
+
+    The request's session is closed before a streaming response body is sent,
+    so the export holds its own connection for as long as the client reads.
+    """
+    with Session(engine) as db:
+        for row in iter_transactions(
+            db=db,
+            user_id=user_id,
+            columns=columns,
+            account_id=account_id,
+            filters=filters,
+            batch_size=settings.EXPORT_BATCH_SIZE,
+        ):
+            yield tuple(row)
+
+
+def _insight_rows(user_id: UUID) -> Iterator[tuple]:
+    """Stream the insight rows to export on a session of their own."""
+    with Session(engine) as db:
+        for row in iter_insights(
+            db=db,
+            user_id=user_id,
+            columns=INSIGHT_COLUMNS,
+            batch_size=settings.EXPORT_BATCH_SIZE,
+        ):
+            yield tuple(row)
+
+
+def _chunked(lines: Iterator[str], size: int) -> Iterator[str]:
+    """Join lines into chunks of `size` so each write to the socket is sizeable."""
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= size:
+            yield "".join(chunk)
+            chunk = []
+    if chunk:
+        yield "".join(chunk)
+
+
+def _ndjson_lines(rows: Iterator[tuple]) -> Iterator[str]:
+    for row in rows:
+        yield json.dumps(dict(zip(EXPORT_FIELDS, row)), default=str) + "\n"
+
+
+def _csv_lines(rows: Iterator[tuple]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    for row in rows:
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerow(row)
+    yield buffer.getvalue()
+
+
+def export_transactions(
+    user_id: UUID,
+    filters: TransactionFilter,
+    export_format: str,
+    account_id: UUID | None = None,
+    compression: str | None = None,
+) -> Iterator[str | bytes]:
+    """
+    Stream a user's transactions, newest first, in the requested format.
+
+    Rows are read from a server side cursor and encoded as they arrive, so
+    memory stays constant however many rows are exported and the first bytes
+    are sent as soon as the first batch is read.
+
+    Args:
+        user_id (UUID): The user whose transactions to export.
+        filters (TransactionFilter): The same filters accepted when listing.
+        export_format (str): "ndjson", "csv", "parquet" or "arrow".
+        account_id (UUID, optional): Only export this linked account.
+        compression (str, optional): "zstd" for the columnar formats.
+    """
+    if export_format in COLUMNAR_MEDIA_TYPES:
+        rows = _transaction_rows(user_id, account_id, filters, TRANSACTION_COLUMNS)
+        return transactions_to_columnar(
+            rows, export_format, compression, settings.EXPORT_BATCH_SIZE
+        )
+    rows = _transaction_rows(user_id, account_id, filters, EXPORT_COLUMNS)
+    lines = _csv_lines(rows) if export_format == "csv" else _ndjson_lines(rows)
+    return _chunked(lines, settings.EXPORT_BATCH_SIZE)
+
+
+def export_insights(
+    user_id: UUID, export_format: str, compression: str | None = None
+) -> Iterator[bytes]:
+    """
+    Stream a user's insights, newest first, as Parquet or an Arrow IPC stream.
+    """
+    return insights_to_columnar(
+        _insight_rows(user_id), export_format, compression, settings.EXPORT_BATCH_SIZE
+    )
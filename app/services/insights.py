@@ -1,35 +1,51 @@
-from sqlmodel import Session, select
+from sqlmodel import Session
 from uuid import UUID
-from app.models.transaction import Transaction
+from app.crud import get_category_totals_for_users, upsert_insights
 from app.models.insight import Insight
+from app.services.spending_analytics import (
+    ROLLING_WINDOWS,
+    SpendingArrays,
+    category_shares,
+    history_start,
+    load_payment_amounts,
+    load_spending_arrays,
+    month_over_month,
+    rolling_spend,
+    spend_percentiles,
+)
 from datetime import date, timedelta
 from collections import defaultdict
 
+# The period current insights are computed over
+INSIGHT_PERIOD = "30d"
+INSIGHT_PERIOD_DAYS = 30
+
+# Naira spent within the period that triggers a high spending warning
+HIGH_SPENDING_THRESHOLD = 100000
+
+# Month over month increase that turns the comparison into a warning
+MONTH_OVER_MONTH_WARNING = 0.25
+
+# Number of categories listed in the spending mix
+CATEGORY_SHARE_COUNT = 3
+
+# Insights that read every payment rather than the rollup, so they are only
+# recomputed by the nightly job and kept as they are by on demand refreshes
+PAYMENT_INSIGHT_KINDS = ("spend_percentiles",)
 
-def generate_insights(db: Session, user_id: UUID) -> list[Insight]:
-    """Generate insights for a user based on their transactions."""
-    # Fetch transactions for the user
-    today = date.today()
-    last_30_days = today - timedelta(days=30)
-    statement = select(Transaction).where(
-        Transaction.user_id == user_id,
-        Transaction.transaction_date >= last_30_days,
-    )
-    transactions = db.exec(statement).all()
 
-    # Group transactions by category
+def _build_insights(
+    user_id: UUID, spent_by_category: dict[str, float]
+) -> list[Insight]:
+    """Build a user's insights from their debits per category, in naira."""
     insights = []
-    total_spent = 0
-    spent_by_category = defaultdict(float)
-    for tx in transactions:
-        amount = tx.amount / 100  # Convert amount from kobo to naira
-        total_spent += amount
-        if tx.amount > 0:
-            spent_by_category[tx.category] += tx.amount
+    total_spent = sum(spent_by_category.values())
 
     insights.append(
         Insight(
             user_id=user_id,
+            period=INSIGHT_PERIOD,
+            kind="total_spent",
             message=f"Total spent in the last 30 days: {total_spent:.2f}",
             type="info",
         )
@@ -37,13 +53,15 @@ def generate_insights(db: Session, user_id: UUID) -> list[Insight]:
 
     # Top category
     if spent_by_category:
-        top_category = max(spent_by_category.items(), key=lambda item: item[1])
-        tom_cat = top_category[0]
-        tom_cat_amount = top_category[1] / 100
+        tom_cat, tom_cat_amount = max(
+            spent_by_category.items(), key=lambda item: item[1]
+        )
 
         insights.append(
             Insight(
                 user_id=user_id,
+                period=INSIGHT_PERIOD,
+                kind="top_category",
                 message=f"Top category in the last 30 days: "
                 f"{tom_cat} with amount {tom_cat_amount:.2f}",
                 type="info",
@@ -52,16 +70,16 @@ def generate_insights(db: Session, user_id: UUID) -> list[Insight]:
 
     # Bottom category
     if spent_by_category:
-        bottom_category = min(
+        bot_cat, bot_cat_amount = min(
             spent_by_category.items(),
             key=lambda item: item[1],
         )
-        bot_cat = bottom_category[0]
-        bot_cat_amount = bottom_category[1] / 100
 
         insights.append(
             Insight(
                 user_id=user_id,
+                period=INSIGHT_PERIOD,
+                kind="bottom_category",
                 message=f"Bottom category in the last 30 days: "
                 f"{bot_cat} with amount {bot_cat_amount:.2f}",
                 type="info",
@@ -69,10 +87,12 @@ def generate_insights(db: Session, user_id: UUID) -> list[Insight]:
         )
 
     # warnings for high spending
-    if total_spent > 100000:
+    if total_spent > HIGH_SPENDING_THRESHOLD:
         insights.append(
             Insight(
                 user_id=user_id,
+                period=INSIGHT_PERIOD,
+                kind="high_spending",
                 message=f"You've spent over 100000 this month."
                 f"Consider reviewing your habits.",
                 type="warning",
@@ -80,3 +100,159 @@ def generate_insights(db: Session, user_id: UUID) -> list[Insight]:
         )
 
     return insights
+
+
+def _build_analytics_insights(
+    user_id: UUID, arrays: SpendingArrays, today: date
+) -> list[Insight]:
+    """Build a user's trend insights from their daily debit totals, in kobo."""
+    insights = []
+
+    rolling = rolling_spend(arrays, today)
+    insights.append(
+        Insight(
+            user_id=user_id,
+            period=INSIGHT_PERIOD,
+            kind="rolling_spend",
+            message="Spent "
+            + ", ".join(
+                f"{total / 100:.2f} in the last {window} days"
+                for window, total in rolling.items()
+            ),
+            type="info",
+        )
+    )
+
+    previous, before = month_over_month(arrays, today)
+    if previous and before:
+        change = (previous - before) / before
+        previous_month = (today.replace(day=1) - timedelta(days=1)).strftime("%B")
+        insights.append(
+            Insight(
+                user_id=user_id,
+                period=INSIGHT_PERIOD,
+                kind="month_over_month",
+                message=f"Spending in {previous_month} was {abs(change):.0%} "
+                f"{'higher' if change >= 0 else 'lower'} than the month before "
+                f"({previous / 100:.2f} vs {before / 100:.2f})",
+                type="warning" if change > MONTH_OVER_MONTH_WARNING else "info",
+            )
+        )
+
+    shares = category_shares(
+        arrays.window(today - timedelta(days=INSIGHT_PERIOD_DAYS), today)
+    )
+    if shares:
+        mix = list(shares.items())[:CATEGORY_SHARE_COUNT]
+        insights.append(
+            Insight(
+                user_id=user_id,
+                period=INSIGHT_PERIOD,
+                kind="category_share",
+                message="Spending mix in the last 30 days: "
+                + ", ".join(f"{category} {share:.0%}" for category, share in mix),
+                type="info",
+            )
+        )
+
+    return insights
+
+
+def _build_payment_insights(user_id: UUID, amounts) -> list[Insight]:
+    """Build a user's insights from their individual payments, in kobo."""
+    percentiles = spend_percentiles(amounts)
+    if not percentiles:
+        return []
+    return [
+        Insight(
+            user_id=user_id,
+            period=INSIGHT_PERIOD,
+            kind="spend_percentiles",
+            message=f"Your typical payment in the last 90 days was "
+            f"{percentiles[50] / 100:.2f}; 90% were under "
+            f"{percentiles[90] / 100:.2f} and 99% under "
+            f"{percentiles[99] / 100:.2f}",
+            type="info",
+        )
+    ]
+
+
+def compute_insights(
+    db: Session, user_ids: list[UUID], payments: bool = True
+) -> dict[UUID, list[Insight]]:
+    """
+    Compute the current insights of many users from the daily spending
+    rollup: one query for the period's category totals, and one loading the
+    daily totals the trend insights need into arrays.
+
+    Args:
+        db (Session): The database session.
+        user_ids (list[UUID]): The users to compute insights for.
+        payments (bool, optional): Also compute the PAYMENT_INSIGHT_KINDS,
+            which load every debit of the last 90 days.
+
+    Returns:
+        dict[UUID, list[Insight]]: Each user's insights, not yet saved.
+    """
+    today = date.today()
+    last_30_days = today - timedelta(days=INSIGHT_PERIOD_DAYS)
+    totals = get_category_totals_for_users(
+        db=db, user_ids=user_ids, start_date=last_30_days
+    )
+    arrays = load_spending_arrays(
+        db=db, user_ids=user_ids, start_date=history_start(today)
+    )
+
+    # Convert amounts from kobo to naira once, after aggregating
+    spent_by_user: dict[UUID, dict[str, float]] = defaultdict(dict)
+    for row in totals:
+        if row.debit_total:
+            spent_by_user[row.user_id][row.category] = row.debit_total / 100
+
+    insights = {
+        user_id: _build_insights(user_id, spent_by_user.get(user_id, {}))
+        for user_id in user_ids
+    }
+    for user_id, user_arrays in arrays.items():
+        insights[user_id] += _build_analytics_insights(user_id, user_arrays, today)
+    if payments:
+        amounts = load_payment_amounts(
+            db=db,
+            user_ids=user_ids,
+            start_date=today - timedelta(days=max(ROLLING_WINDOWS) - 1),
+        )
+        for user_id, user_amounts in amounts.items():
+            insights[user_id] += _build_payment_insights(user_id, user_amounts)
+    return insights
+
+
+def generate_insights(db: Session, user_id: UUID) -> list[Insight]:
+    """Generate insights for a user based on their transactions."""
+    return compute_insights(db=db, user_ids=[user_id], payments=False)[user_id]
+
+
+def refresh_insights(
+    db: Session, user_ids: list[UUID], payments: bool = True
+) -> list[Insight]:
+    """
+    Recompute and store the current insights of many users. Without
+    `payments`, their stored PAYMENT_INSIGHT_KINDS are kept as they are.
+    The caller is responsible for committing the session.
+
+    Returns:
+        list[Insight]: The stored insights.
+    """
+    insights = [
+        insight
+        for user_insights in compute_insights(
+            db=db, user_ids=user_ids, payments=payments
+        ).values()
+        for insight in user_insights
+    ]
+    return upsert_insights(
+        db=db,
+        user_ids=user_ids,
+        period=INSIGHT_PERIOD,
+        insights=insights,
+        keep_kinds=() if payments else PAYMENT_INSIGHT_KINDS,
+    )
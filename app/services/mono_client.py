@@ -1,31 +1,222 @@
+import asyncio
+import random
 import httpx
-import os
-from dotenv import load_dotenv
-from mono_connect import MonoConnectClient
+from datetime import date
+from typing import Any, AsyncIterator, NamedTuple
 from app.core import settings
+from app.utils.logger import logger
 
-load_dotenv()
-secret_key = settings.MONO_SECRET_KEY
 
-client = MonoConnectClient(sec_key=str(secret_key))
+# Mono expects date filters as DD-MM-YYYY
+MONO_DATE_FORMAT = "%d-%m-%Y"
+
+# Responses worth retrying: rate limiting and transient server errors
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class MonoAPIError(Exception):
+    """Raised when the Mono API returns an error response."""
+
+    def __init__(self, status_code: int, message: str):
+        self.status_code = status_code
+        super().__init__(f"{status_code}: {message}")
+
+
+class TransactionPage(NamedTuple):
+    """A single page of transactions returned by Mono."""
+
+    page: int
+    data: list[dict[str, Any]]
+    has_next: bool
+
+
+class MonoClient:
+    """
+    Async client for the Mono Connect API.
+
+    A single instance shares one connection pool. The API process opens it in
+    the application lifespan; background workers, which run their own event
+    loops, should use a short lived instance as an async context manager.
+    """
+
+    def __init__(
+        self,
+        base_url: str | None = None,
+        secret_key: str | None = None,
+        timeout: float | None = None,
+        connect_timeout: float | None = None,
+        max_retries: int | None = None,
+        backoff_base: float | None = None,
+        backoff_max: float | None = None,
+        max_connections: int | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+        rate_limiter: Any | None = None,
+    ):
+        self.base_url = base_url or settings.MONO_BASE_URL
+        self.secret_key = secret_key or settings.MONO_SECRET_KEY
+        self.timeout = httpx.Timeout(
+            timeout or settings.MONO_TIMEOUT_SECONDS,
+            connect=connect_timeout or settings.MONO_CONNECT_TIMEOUT_SECONDS,
+        )
+        self.max_retries = (
+            settings.MONO_MAX_RETRIES if max_retries is None else max_retries
+        )
+        self.backoff_base = backoff_base or settings.MONO_BACKOFF_BASE_SECONDS
+        self.backoff_max = backoff_max or settings.MONO_BACKOFF_MAX_SECONDS
+        self.limits = httpx.Limits(
+            max_connections=max_connections or settings.MONO_MAX_CONNECTIONS,
+            max_keepalive_connections=max_connections or settings.MONO_MAX_CONNECTIONS,
+        )
+        self.transport = transport
+        # Any object with an async acquire(), awaited before every request
+        self.rate_limiter = rate_limiter
+        self._client: httpx.AsyncClient | None = None
+
+    async def open(self) -> None:
+        """Create the underlying connection pool."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers={"mono-sec-key": str(self.secret_key)},
+                timeout=self.timeout,
+                limits=self.limits,
+                transport=self.transport,
+            )
+
+    async def aclose(self) -> None:
+        """Close the underlying connection pool."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def __aenter__(self) -> "MonoClient":
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    def _backoff(self, attempt: int, response: httpx.Response | None) -> float:
+        """Delay before the next attempt, honouring Retry-After when present."""
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after and retry_after.isdigit():
+                return min(float(retry_after), self.backoff_max)
+        # Full jitter exponential backoff
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
+
+    async def _request(self, method: str, url: str, **kwargs) -> dict:
+        """Send a request, retrying rate limited and transient failures."""
+        if self._client is None:
+            await self.open()
+
+        attempt = 0
+        while True:
+            response = None
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire()
+            try:
+                response = await self._client.request(method, url, **kwargs)
+                if response.status_code not in RETRYABLE_STATUS_CODES:
+                    break
+            except httpx.TransportError as e:
+                if attempt >= self.max_retries:
+                    raise MonoAPIError(503, f"Mono request failed: {e}") from e
+            if attempt >= self.max_retries:
+                break
+            delay = self._backoff(attempt, response)
+            logger.warning(
+                f"Mono {method} {url} failed (attempt {attempt + 1}), "
+                f"retrying in {delay:.2f}s"
+            )
+            await asyncio.sleep(delay)
+            attempt += 1
+
+        if response.is_error:
+            raise MonoAPIError(response.status_code, response.text)
+        return response.json()
+
+    async def token_exchange(self, code: str) -> dict:
+        """Exchange a Mono Connect code for an account ID."""
+        return await self._request("POST", "/v2/accounts/auth", json={"code": code})
+
+    async def get_account_details(self, account_id: str) -> dict:
+        """Retrieve the details of a linked account."""
+        return await self._request("GET", f"/v2/accounts/{account_id}")
+
+    async def get_transactions(
+        self,
+        account_id: str,
+        start: date | None = None,
+        end: date | None = None,
+        page: int | None = None,
+    ) -> dict:
+        """Retrieve a page of transactions for a linked account."""
+        params: dict[str, Any] = {}
+        if start:
+            params["start"] = start.strftime(MONO_DATE_FORMAT)
+        if end:
+            params["end"] = end.strftime(MONO_DATE_FORMAT)
+        if page:
+            params["paginate"] = "true"
+            params["page"] = page
+        return await self._request(
+            "GET", f"/v2/accounts/{account_id}/transactions", params=params
+        )
+
+    async def iter_transaction_pages(
+        self,
+        account_id: str,
+        start: date | None = None,
+        end: date | None = None,
+        page: int = 1,
+    ) -> AsyncIterator[TransactionPage]:
+        """
+        Iterate over Mono's paginated transactions, one page at a time.
+
+        Args:
+            account_id (str): The Mono account ID.
+            start (date, optional): Only return transactions from this date.
+            end (date, optional): Only return transactions up to this date.
+            page (int, optional): The page to start from. Defaults to 1.
+        """
+        while True:
+            response = await self.get_transactions(
+                account_id, start=start, end=end, page=page
+            )
+            meta = response.get("meta") or {}
+            has_next = bool(meta.get("next"))
+            yield TransactionPage(
+                page=page, data=response.get("data", []), has_next=has_next
+            )
+            if not has_next:
+                return
+            page += 1
+
+
+mono_client = MonoClient()
 
 
 async def exchange_code_for_token(code: str) -> dict:
     """Exchange the authorization code for Users ID"""
     if not code:
         raise ValueError("Authorization code is required for token exchange.")
-    return client.token_exchange(code=code)
+    return await mono_client.token_exchange(code=code)
 
 
 async def fetch_account_details(account_id: str) -> dict:
     """Fetch account details using the Mono API"""
     if not account_id:
         raise ValueError("Account ID is required to fetch details.")
-    return client.get_account_details(account_id=account_id)
+    return await mono_client.get_account_details(account_id=account_id)
 
 
-async def fetch_transactions(account_id: str) -> dict:
-    """Fetch transactions using the Mono API"""
+async def fetch_transactions(
+    account_id: str,
+    start: date | None = None,
+    end: date | None = None,
+) -> dict:
+    """Fetch transactions using the Mono API, optionally within a date range"""
     if not account_id:
         raise ValueError("Account ID is required to fetch transactions.")
-    return client.get_transactions(account_id=account_id)
+    return await mono_client.get_transactions(account_id, start=start, end=end)
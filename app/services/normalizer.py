@@ -1,4 +1,5 @@
 import re
+from collections import OrderedDict
 
 merchant_app = {
     "JUMIA": "Jumia",
@@ -51,32 +52,264 @@ category_rules = {
 }
 
 
+# Sentinel priority for "no keyword matched"
+NO_MATCH = 1 << 30
+
+# Distinct narrations remembered across batches
+MATCH_CACHE_SIZE = 10_000
+
+# Separators between the words of a narration, e.g. "NIP/TRF TO JOHN-DOE"
+NARRATION_SEPARATORS = re.compile(r"[\s/|:;,*#_-]+")
+
+
+def _trie_pattern(keywords: list[str]) -> str:
+    """
+    Build a regex alternation of keywords factored into a trie, so the regex
+    engine branches on one character at a time instead of trying every
+    keyword at every position. Optional suffixes are greedy, so the longest
+    keyword starting at a position wins.
+    """
+    trie: dict = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        branches = [
+            re.escape(char) + build(child)
+            for char, child in sorted(node.items())
+            if char
+        ]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+class NarrationMatcher:
+    """
+    Matches a narration against merchant and category keywords in one pass.
+
+    All keywords are compiled once into a single regex. Scanning a narration
+    yields the longest keyword starting at every position, and each keyword
+    carries the best merchant and category priority of itself and any shorter
+    keyword it starts with, so the lowest priorities found are exactly the
+    first merchant and first category whose keyword occurs in the narration.
+    This keeps the first-match semantics of scanning the rule dicts in order.
+    """
+
+    @classmethod
+    def from_rules(cls, rules: list) -> "NarrationMatcher":
+        """
+        Build a matcher from categorization rules layered over the built-in
+        merchant_app and category_rules.
+
+        Rules are applied in the given order, ahead of the built-ins. A rule
+        may name a merchant, a category or both; a rule with both also
+        categorizes the merchant's standardized name.
+        """
+        merchants = {}
+        categories = []
+        for rule in rules:
+            keyword = rule.keyword.upper()
+            if rule.merchant:
+                merchants.setdefault(keyword, rule.merchant)
+            if rule.category:
+                keywords = [keyword]
+                if rule.merchant:
+                    keywords.append(rule.merchant.upper())
+                categories.append((rule.category, keywords))
+        for keyword, merchant in merchant_app.items():
+            merchants.setdefault(keyword, merchant)
+        categories.extend(category_rules.items())
+        return cls(merchants, categories)
+
+    def __init__(
+        self,
+        merchants: dict[str, str],
+        categories: dict[str, list[str]] | list[tuple[str, list[str]]],
+        cache_size: int = MATCH_CACHE_SIZE,
+    ):
+        self._cache: OrderedDict[str, tuple[str, str]] = OrderedDict()
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+
+        # keyword -> (merchant priority, category priority)
+        priorities: dict[str, tuple[int, int]] = {}
+        for priority, keyword in enumerate(merchants):
+            merchant, category = priorities.get(keyword.upper(), (NO_MATCH, NO_MATCH))
+            priorities[keyword.upper()] = (min(merchant, priority), category)
+        # Categories may be given as ordered (name, keywords) pairs so the same
+        # category can appear at several priorities
+        if isinstance(categories, dict):
+            categories = list(categories.items())
+        for priority, (_, keywords) in enumerate(categories):
+            for keyword in keywords:
+                merchant, category = priorities.get(
+                    keyword.upper(), (NO_MATCH, NO_MATCH)
+                )
+                priorities[keyword.upper()] = (merchant, min(category, priority))
+        priorities.pop("", None)
+
+        self._priorities = {}
+        for keyword in priorities:
+            prefixes = [
+                priority
+                for prefix, priority in priorities.items()
+                if keyword.startswith(prefix)
+            ]
+            self._priorities[keyword] = (
+                min(merchant for merchant, _ in prefixes),
+                min(category for _, category in prefixes),
+            )
+        # A lookahead reports overlapping keywords, one per start position
+        self._pattern = re.compile(f"(?=({_trie_pattern(list(priorities))}))")
+        self._merchant_names = list(merchants.values())
+        self._category_names = [name for name, _ in categories]
+
+        # A merchant's category is the category of its standardized name
+        self._merchant_categories = [
+            self._category_name(self._scan(name)[1]) for name in self._merchant_names
+        ]
+
+    def _scan(self, description: str) -> tuple[int, int]:
+        """Get the best merchant and category priority found in description."""
+        best_merchant = best_category = NO_MATCH
+        priorities = self._priorities
+        for keyword in self._pattern.findall(description.upper()):
+            merchant, category = priorities[keyword]
+            if merchant < best_merchant:
+                best_merchant = merchant
+            if category < best_category:
+                best_category = category
+        return best_merchant, best_category
+
+    def _category_name(self, priority: int) -> str:
+        return self._category_names[priority] if priority < NO_MATCH else "other"
+
+    def match(self, description: str) -> tuple[str, str]:
+        """
+        Get the normalized description and category of a narration.
+
+        Returns:
+            tuple[str, str]: The standardized merchant name, or the original
+                description when no merchant is known, and the category.
+        """
+        merchant, category = self._scan(description)
+        if merchant < NO_MATCH:
+            return self._merchant_names[merchant], self._merchant_categories[merchant]
+        return description, self._category_name(category)
+
+    def match_many(self, descriptions: list[str]) -> list[tuple[str, str]]:
+        """
+        Match a batch of narrations, scanning each distinct narration once.
+
+        Results are kept in a bounded LRU cache shared across batches, since
+        the same POS terminals, subscriptions and transfer prefixes recur
+        constantly.
+        """
+        cache = self._cache
+        results = {}
+        for description in dict.fromkeys(descriptions):
+            result = cache.get(description)
+            if result is None:
+                self.misses += 1
+                result = self.match(description)
+                cache[description] = result
+                if len(cache) > self.cache_size:
+                    cache.popitem(last=False)
+            else:
+                self.hits += 1
+                cache.move_to_end(description)
+            results[description] = result
+        return [results[description] for description in descriptions]
+
+    def cache_info(self) -> dict[str, int]:
+        """Get the hit and miss counters and size of the match cache."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._cache),
+            "max_size": self.cache_size,
+        }
+
+
+default_matcher = NarrationMatcher(merchant_app, category_rules)
+
+
+def match_description(description: str) -> tuple[str, str]:
+    """
+    Normalize and categorize a transaction description in a single pass.
+    """
+    return default_matcher.match(description)
+
+
+def categorize_batch(
+    descriptions: list[str],
+    matcher: NarrationMatcher | None = None,
+) -> list[tuple[str, str]]:
+    """
+    Normalize and categorize a batch of transaction descriptions.
+
+    Args:
+        descriptions (list[str]): The descriptions to categorize.
+        matcher (NarrationMatcher, optional): The compiled rules to apply.
+            Defaults to the built-in rules.
+
+    Returns:
+        list[tuple[str, str]]: The (normalized description, category) of each
+            description, in the same order.
+    """
+    return (matcher or default_matcher).match_many(descriptions)
+
+
+def categorization_cache_info() -> dict[str, int]:
+    """Get the hit and miss counters of the categorization cache."""
+    return default_matcher.cache_info()
+
+
 def normalize_description(description: str) -> str:
     """
     Normalize the transaction description by replacing known merchant names
     with their standardized names.
     """
-    # Replace known merchants with their standardized names
-    for key, value in merchant_app.items():
-        if key in description.upper():
-            return value
-
-    # If no known merchant is found, return the original description
-    return description
+    return default_matcher.match(description)[0]
 
 
 def categorize_transaction(description: str) -> str:
     """
     Categorize the transaction based on the description.
     """
-    # Normalize the description
-    normalized_description = normalize_description(description)
+    return default_matcher.match(description)[1]
 
-    # Check each category rule
-    for category, keywords in category_rules.items():
-        for keyword in keywords:
-            if keyword.upper() in normalized_description.upper():
-                return category
 
-    # If no category matches, return 'other'
-    return "other"
+def is_known_merchant(raw_description: str | None, normalized: str | None) -> bool:
+    """Whether a merchant keyword was recognised in a transaction's narration."""
+    return bool(normalized) and normalized != raw_description
+
+
+def merchant_key(raw_description: str | None, normalized: str | None) -> str | None:
+    """
+    Get the key a transaction's merchant or payee is tracked under.
+
+    A recognised merchant is keyed by its standardized name. Other narrations
+    are stored verbatim as their normalized description, usually with a
+    reference that changes on every payment, so they are keyed by their
+    words without digits, e.g. "NIP TRF TO JOHN DOE".
+
+    Returns:
+        str | None: The key, or None when only references are left.
+    """
+    if is_known_merchant(raw_description, normalized):
+        return normalized
+    words = [
+        word
+        for word in NARRATION_SEPARATORS.split((normalized or "").upper())
+        if word and not any(char.isdigit() for char in word)
+    ]
+    return " ".join(words) or None
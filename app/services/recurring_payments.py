@@ -0,0 +1,180 @@
+from datetime import date, datetime, timedelta
+from sqlmodel import Session
+from app.crud import (
+    get_merchant_debits,
+    get_new_debits,
+    get_recurring_payment_states,
+)
+from app.models import LinkedAccount, RecurringPayment
+from app.services.normalizer import merchant_key
+
+# Consecutive regular charges before a merchant counts as recurring
+MIN_RECURRING_CHARGES = 3
+
+# Relative difference from the average amount a regular charge may have
+AMOUNT_TOLERANCE = 0.2
+
+# Relative difference from the average interval a regular charge may have,
+# and the smallest allowed difference in days
+INTERVAL_TOLERANCE = 0.15
+MIN_INTERVAL_TOLERANCE_DAYS = 2
+
+# Intervals, in days, that can make up a recurring payment
+MIN_INTERVAL_DAYS = 5
+MAX_INTERVAL_DAYS = 400
+
+# Named cadences by their typical interval range in days
+CADENCES = (
+    ("weekly", 6, 8),
+    ("biweekly", 13, 16),
+    ("monthly", 27, 33),
+    ("quarterly", 85, 95),
+    ("yearly", 355, 375),
+)
+
+
+def _within(value: float, expected: float, tolerance: float) -> bool:
+    return abs(value - expected) <= tolerance
+
+
+def cadence(interval_days: float | None) -> str | None:
+    """Name the cadence of an average interval, e.g. "monthly"."""
+    if interval_days is None:
+        return None
+    for name, low, high in CADENCES:
+        if low <= interval_days <= high:
+            return name
+    return f"every {round(interval_days)} days"
+
+
+def _start_payment(
+    linked_account: LinkedAccount, merchant: str, day: date, amount: float
+) -> RecurringPayment:
+    """The state of a merchant after its first charge."""
+    return RecurringPayment(
+        account_id=linked_account.id,
+        user_id=linked_account.user_id,
+        merchant=merchant,
+        charge_count=1,
+        streak=1,
+        streak_start=day,
+        average_amount=amount,
+        last_amount=amount,
+        last_date=day,
+    )
+
+
+def _advance(payment: RecurringPayment, day: date, amount: float) -> None:
+    """
+    Add a charge, dated on or after the last one, to a merchant's state.
+
+    A charge extends the streak when its interval and amount are within
+    tolerance of the streak's averages. Otherwise a new streak starts, from
+    the previous charge when the two amounts are alike.
+    """
+    payment.charge_count += 1
+    interval = (day - payment.last_date).days
+    if interval == 0:
+        return
+
+    expected = payment.average_interval_days
+    if (
+        payment.streak >= 2
+        and _within(
+            interval,
+            expected,
+            max(expected * INTERVAL_TOLERANCE, MIN_INTERVAL_TOLERANCE_DAYS),
+        )
+        and _within(
+            amount, payment.average_amount, payment.average_amount * AMOUNT_TOLERANCE
+        )
+    ):
+        payment.streak += 1
+        payment.average_amount += (amount - payment.average_amount) / payment.streak
+        payment.average_interval_days += (interval - expected) / (payment.streak - 1)
+    elif _within(amount, payment.last_amount, payment.last_amount * AMOUNT_TOLERANCE):
+        payment.streak = 2
+        payment.streak_start = payment.last_date
+        payment.average_amount = (payment.last_amount + amount) / 2
+        payment.average_interval_days = interval
+    else:
+        payment.streak = 1
+        payment.streak_start = day
+        payment.average_amount = amount
+        payment.average_interval_days = None
+
+    payment.last_date = day
+    payment.last_amount = amount
+    interval_days = payment.average_interval_days
+    payment.is_recurring = (
+        payment.streak >= MIN_RECURRING_CHARGES
+        and MIN_INTERVAL_DAYS <= interval_days <= MAX_INTERVAL_DAYS
+    )
+    payment.next_expected_date = (
+        day + timedelta(days=round(interval_days)) if interval_days else None
+    )
+
+
+def detect_recurring_payments(db: Session, linked_account: LinkedAccount) -> int:
+    """
+    Update the recurring payments of an account with the debits stored since
+    its last scan.
+
+    Debits are grouped by merchant key, so payments to the same merchant or
+    payee group even when their references change, and debits with nothing
+    but references in their narration are skipped. Each merchant's state is
+    advanced with its new charges only, so the cost is linear in new
+    transactions. A merchant is replayed from its full
+    history only when a backfill stored charges older than its last one. The
+    caller is responsible for committing the session.
+
+    Returns:
+        int: The number of debits scanned.
+    """
+    debits = get_new_debits(
+        db=db,
+        account_id=linked_account.id,
+        since=linked_account.recurring_scanned_at,
+    )
+    if not debits:
+        return 0
+
+    charges: dict[str, list[tuple[date, float]]] = {}
+    for debit in debits:
+        merchant = merchant_key(debit.raw_description, debit.normalized_description)
+        if merchant and debit.amount:
+            charges.setdefault(merchant, []).append(
+                (debit.transaction_date, debit.amount)
+            )
+    states = get_recurring_payment_states(
+        db=db, account_id=linked_account.id, merchants=list(charges)
+    )
+
+    for merchant, new_charges in charges.items():
+        payment = states.get(merchant)
+        if payment and new_charges[0][0] < payment.last_date:
+            # Out of order, replay the merchant from its stored history
+            new_charges = [
+                (debit.transaction_date, debit.amount)
+                for debit in get_merchant_debits(
+                    db=db, account_id=linked_account.id, merchant=merchant
+                )
+                if debit.amount
+                and merchant_key(debit.raw_description, debit.normalized_description)
+                == merchant
+            ]
+            db.delete(payment)
+            db.flush()
+            payment = None
+        if payment is None:
+            day, amount = new_charges[0]
+            payment = _start_payment(linked_account, merchant, day, amount)
+            new_charges = new_charges[1:]
+        for day, amount in new_charges:
+            _advance(payment, day, amount)
+        payment.updated_at = datetime.now()
+        db.add(payment)
+
+    linked_account.recurring_scanned_at = max(debit.created_at for debit in debits)
+    db.add(linked_account)
+    return len(debits)
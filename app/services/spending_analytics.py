@@ -0,0 +1,191 @@
+from dataclasses import dataclass
+from datetime import date, timedelta
+from uuid import UUID
+import numpy as np
+from sqlalchemy import String, type_coerce
+from sqlmodel import Session, select
+from app.models import DailySpend, Transaction
+
+# Trailing windows, in days, that rolling spend is reported over
+ROLLING_WINDOWS = (7, 30, 90)
+
+# Percentiles of individual payment sizes that are reported
+SPEND_PERCENTILES = (50, 90, 99)
+
+# date.toordinal() of the datetime64 epoch, 1970-01-01
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+@dataclass
+class SpendingArrays:
+    """
+    A user's daily debit totals as parallel arrays: amounts in kobo, days as
+    proleptic Gregorian ordinals, and category codes into `category_names`.
+    """
+
+    amounts: np.ndarray
+    days: np.ndarray
+    categories: np.ndarray
+    category_names: list[str]
+
+    def window(self, start: date, end: date) -> "SpendingArrays":
+        """The totals of the days from start to end inclusive."""
+        mask = (self.days >= start.toordinal()) & (self.days <= end.toordinal())
+        return SpendingArrays(
+            self.amounts[mask],
+            self.days[mask],
+            self.categories[mask],
+            self.category_names,
+        )
+
+
+def _factorize(values) -> tuple[np.ndarray, list]:
+    """Encode values as integer codes into the list of distinct values."""
+    codes: dict = {}
+    encoded = np.fromiter(
+        (codes.setdefault(value, len(codes)) for value in values),
+        dtype=np.int32,
+        count=len(values),
+    )
+    return encoded, list(codes)
+
+
+def _split_by_user(user_column) -> dict[UUID, np.ndarray]:
+    """The row indices of each user, parsing each distinct user ID once."""
+    user_codes, users = _factorize(user_column)
+    order = np.argsort(user_codes, kind="stable")
+    slices = np.split(order, np.flatnonzero(np.diff(user_codes[order])) + 1)
+    return {UUID(str(users[user_codes[indices[0]]])): indices for indices in slices}
+
+
+def history_start(today: date) -> date:
+    """The earliest date the analytics need: 90 days, and two full months."""
+    previous_month_start = (today.replace(day=1) - timedelta(days=1)).replace(day=1)
+    month_before_start = (previous_month_start - timedelta(days=1)).replace(day=1)
+    return min(today - timedelta(days=max(ROLLING_WINDOWS) - 1), month_before_start)
+
+
+def load_spending_arrays(
+    db: Session, user_ids: list[UUID], start_date: date
+) -> dict[UUID, SpendingArrays]:
+    """
+    Load the daily debit totals of many users since start_date into compact
+    arrays.
+
+    They are read from the daily spending rollup, so the rows loaded depend
+    on days times categories rather than the number of transactions. The
+    user ID is read as its raw database value and only the distinct values
+    are parsed.
+
+    Returns:
+        dict[UUID, SpendingArrays]: The arrays of each user with debits.
+    """
+    statement = select(
+        type_coerce(DailySpend.user_id, String),
+        DailySpend.debit_total,
+        DailySpend.day,
+        DailySpend.category,
+    ).where(
+        DailySpend.user_id.in_(user_ids),
+        DailySpend.day >= start_date,
+        DailySpend.debit_total > 0,
+    )
+    rows = db.exec(statement).all()
+    if not rows:
+        return {}
+
+    user_column, amount_column, date_column, category_column = zip(*rows)
+    amounts = np.array(amount_column, dtype=np.int64)
+    days = np.array(date_column, dtype="datetime64[D]").astype(np.int32) + EPOCH_ORDINAL
+    categories, category_names = _factorize(category_column)
+    categories = categories.astype(np.int16)
+    return {
+        user_id: SpendingArrays(
+            amounts[indices], days[indices], categories[indices], category_names
+        )
+        for user_id, indices in _split_by_user(user_column).items()
+    }
+
+
+def load_payment_amounts(
+    db: Session, user_ids: list[UUID], start_date: date
+) -> dict[UUID, np.ndarray]:
+    """
+    Load the amount of every debit of many users since start_date, in kobo.
+
+    Percentiles need each payment rather than daily totals, so this reads the
+    transactions themselves; only the user ID and amount columns are fetched.
+
+    Returns:
+        dict[UUID, np.ndarray]: The debit amounts of each user with debits.
+    """
+    statement = select(
+        type_coerce(Transaction.user_id, String), Transaction.amount
+    ).where(
+        Transaction.user_id.in_(user_ids),
+        Transaction.transaction_type == "debit",
+        Transaction.transaction_date >= start_date,
+    )
+    rows = db.exec(statement).all()
+    if not rows:
+        return {}
+
+    user_column, amount_column = zip(*rows)
+    amounts = np.array(amount_column, dtype=np.int64)
+    return {
+        user_id: amounts[indices]
+        for user_id, indices in _split_by_user(user_column).items()
+    }
+
+
+def rolling_spend(arrays: SpendingArrays, today: date) -> dict[int, int]:
+    """Total kobo spent in each trailing window ending today."""
+    longest = max(ROLLING_WINDOWS)
+    offsets = today.toordinal() - arrays.days
+    in_range = (offsets >= 0) & (offsets < longest)
+    # Kobo spent per day, most recent first, then running totals over them
+    per_day = np.bincount(
+        offsets[in_range], weights=arrays.amounts[in_range], minlength=longest
+    )
+    running = np.cumsum(per_day)
+    return {window: int(running[window - 1]) for window in ROLLING_WINDOWS}
+
+
+def month_over_month(arrays: SpendingArrays, today: date) -> tuple[int, int]:
+    """Kobo spent in the previous full month and in the month before it."""
+    previous_end = today.replace(day=1) - timedelta(days=1)
+    previous_start = previous_end.replace(day=1)
+    before_end = previous_start - timedelta(days=1)
+    before_start = before_end.replace(day=1)
+    return (
+        int(arrays.window(previous_start, previous_end).amounts.sum()),
+        int(arrays.window(before_start, before_end).amounts.sum()),
+    )
+
+
+def category_shares(arrays: SpendingArrays) -> dict[str, float]:
+    """Each category's share of the total spent, largest first."""
+    totals = np.bincount(
+        arrays.categories,
+        weights=arrays.amounts,
+        minlength=len(arrays.category_names),
+    )
+    spent = totals.sum()
+    if not spent:
+        return {}
+    order = np.argsort(totals)[::-1]
+    return {
+        arrays.category_names[code]: float(totals[code] / spent)
+        for code in order
+        if totals[code]
+    }
+
+
+def spend_percentiles(amounts: np.ndarray) -> dict[int, int]:
+    """The SPEND_PERCENTILES of individual payment sizes, in kobo."""
+    if not len(amounts):
+        return {}
+    values = np.percentile(amounts, SPEND_PERCENTILES)
+    return {
+        percentile: int(value) for percentile, value in zip(SPEND_PERCENTILES, values)
+    }
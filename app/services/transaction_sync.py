@@ -0,0 +1,165 @@
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any, Callable
+from uuid import uuid4
+from sqlmodel import Session, func, select
+from app.core import settings
+from app.crud import bulk_insert_transactions
+from app.models import LinkedAccount, Transaction
+from app.services import security
+from app.services.anomaly_detection import detect_anomalies
+from app.services.categorization_rules import categorization_rules
+from app.services.mono_client import MonoClient, mono_client
+from app.services.normalizer import categorize_batch
+from app.services.recurring_payments import detect_recurring_payments
+
+
+@dataclass
+class SyncProgress:
+    """Running totals for a single account sync."""
+
+    pages_fetched: int = 0
+    inserted: int = 0
+    skipped: int = 0
+    errors: list[str] = field(default_factory=list)
+
+
+def build_transaction_row(
+    transaction: dict[str, Any],
+    linked_account: LinkedAccount,
+    normalized_description: str,
+    category: str,
+    now: datetime,
+) -> dict[str, Any]:
+    """
+    Convert a categorized Mono transaction into a row for bulk insert.
+    """
+    narration = transaction.get("narration", "")
+    posted_at = transaction.get("date")
+    return {
+        "id": uuid4(),
+        "account_id": linked_account.id,
+        "user_id": linked_account.user_id,
+        "transaction_id": transaction.get("id"),
+        "category": category,
+        "transaction_type": transaction.get("type"),
+        "amount": transaction.get("amount"),
+        "currency": transaction.get("currency"),
+        "raw_description": narration,
+        "normalized_description": normalized_description,
+        "transaction_date": datetime.fromisoformat(
+            posted_at.replace("Z", "+00:00"),
+        ).date(),
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+def _latest_transaction_date(db: Session, linked_account: LinkedAccount) -> date | None:
+    """Get the most recent stored transaction date for the account."""
+    statement = select(func.max(Transaction.transaction_date)).where(
+        Transaction.account_id == linked_account.id
+    )
+    return db.exec(statement).one()
+
+
+async def sync_account_transactions(
+    db: Session,
+    linked_account: LinkedAccount,
+    full: bool = False,
+    client: MonoClient = mono_client,
+    on_progress: Callable[[SyncProgress], None] | None = None,
+) -> SyncProgress:
+    """
+    Stream an account's Mono transactions into the database page by page.
+
+    Each page is normalized, categorized and bulk inserted as soon as it is
+    fetched, and its new debits are scored for anomalies. The session is
+    committed every SYNC_COMMIT_CHUNK_SIZE rows together with the next page to
+    fetch. Memory therefore stays bounded by a page regardless of history
+    length, and if the sync fails partway a retry resumes from the last
+    committed page. The account's watermark only advances once every page has
+    been stored, together with the recurring payments detected in the new
+    debits.
+
+    Args:
+        db (Session): The database session.
+        linked_account (LinkedAccount): The account to sync.
+        full (bool, optional): Ignore the watermark and backfill all history.
+        client (MonoClient, optional): The Mono client to fetch pages with.
+        on_progress (Callable, optional): Called with the totals after each page.
+
+    Returns:
+        SyncProgress: The pages fetched and rows inserted and skipped.
+    """
+    progress = SyncProgress()
+    provider_account_id = security.decrypt(
+        encrypted_data=linked_account.provider_account_id
+    )
+
+    # Resume an interrupted sync over the same window, unless a full backfill
+    # was requested over an incremental one. The window's end is stored with
+    # it, since the resume page only points at the same rows while the window
+    # is unchanged
+    resuming = linked_account.sync_resume_page is not None and (
+        not full or linked_account.sync_window_start is None
+    )
+    if resuming:
+        start = linked_account.sync_window_start
+        end = linked_account.sync_window_end
+        first_page = linked_account.sync_resume_page
+    else:
+        start = None if full else linked_account.last_transaction_date
+        end = date.today()
+        first_page = 1
+    linked_account.sync_window_start = start
+    linked_account.sync_window_end = end
+    matcher = categorization_rules.matcher_for(db, linked_account.user_id)
+
+    uncommitted = 0
+    try:
+        async for page in client.iter_transaction_pages(
+            provider_account_id,
+            start=start,
+            end=end,
+            page=first_page,
+        ):
+            now = datetime.now()
+            matches = categorize_batch(
+                [transaction.get("narration", "") for transaction in page.data],
+                matcher=matcher,
+            )
+            rows = [
+                build_transaction_row(
+                    transaction, linked_account, normalized, category, now
+                )
+                for transaction, (normalized, category) in zip(page.data, matches)
+            ]
+            inserted, skipped = bulk_insert_transactions(db=db, transactions=rows)
+            detect_anomalies(db=db, transactions=inserted)
+            progress.pages_fetched += 1
+            progress.inserted += len(inserted)
+            progress.skipped += skipped
+            uncommitted += len(rows)
+
+            if page.has_next and uncommitted >= settings.SYNC_COMMIT_CHUNK_SIZE:
+                linked_account.sync_resume_page = page.page + 1
+                db.add(linked_account)
+                db.commit()
+                uncommitted = 0
+
+            if on_progress:
+                on_progress(progress)
+    except Exception:
+        db.rollback()
+        raise
+
+    detect_recurring_payments(db=db, linked_account=linked_account)
+    linked_account.last_transaction_date = _latest_transaction_date(db, linked_account)
+    linked_account.last_synced_at = datetime.now()
+    linked_account.sync_resume_page = None
+    linked_account.sync_window_start = None
+    linked_account.sync_window_end = None
+    db.add(linked_account)
+    db.commit()
+    return progress
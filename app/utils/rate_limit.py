@@ -0,0 +1,80 @@
+import asyncio
+import time
+from app.db.redis import get_redis
+
+# Takes a slot in a Redis sorted set used as a counting semaphore, after
+# dropping slots whose holders stopped refreshing them
+ACQUIRE_SLOT_SCRIPT = """
+redis.call("zremrangebyscore", KEYS[1], "-inf", ARGV[4])
+if redis.call("zscore", KEYS[1], ARGV[1]) then
+    redis.call("zadd", KEYS[1], ARGV[2], ARGV[1])
+    return 1
+end
+if redis.call("zcard", KEYS[1]) < tonumber(ARGV[3]) then
+    redis.call("zadd", KEYS[1], ARGV[2], ARGV[1])
+    return 1
+end
+return 0
+"""
+
+
+class RedisSemaphore:
+    """
+    A counting semaphore shared by every process using the same Redis.
+    Slots not released within `timeout` seconds are reclaimed.
+    """
+
+    def __init__(self, key: str, limit: int, timeout: int):
+        self.key = key
+        self.limit = limit
+        self.timeout = timeout
+
+    def acquire(self, holder: str) -> bool:
+        """Take a slot for holder, returning False when all slots are in use."""
+        now = time.time()
+        return bool(
+            get_redis().eval(
+                ACQUIRE_SLOT_SCRIPT,
+                1,
+                self.key,
+                holder,
+                now,
+                self.limit,
+                now - self.timeout,
+            )
+        )
+
+    def refresh(self, holder: str) -> bool:
+        """
+        Keep holder's slot from being reclaimed for another `timeout` seconds,
+        returning False when it no longer holds one.
+        """
+        return bool(get_redis().zadd(self.key, {holder: time.time()}, xx=True, ch=True))
+
+    def release(self, holder: str) -> None:
+        """Give back the slot held by holder."""
+        get_redis().zrem(self.key, holder)
+
+
+class RedisRateLimiter:
+    """
+    A fixed window rate limiter shared by every process using the same Redis.
+    """
+
+    def __init__(self, key: str, limit: int, period: int = 60):
+        self.key = key
+        self.limit = limit
+        self.period = period
+
+    async def acquire(self) -> None:
+        """Wait until a request is allowed in the current window."""
+        redis = get_redis()
+        while True:
+            window = int(time.time() // self.period)
+            key = f"{self.key}:{window}"
+            count = redis.incr(key)
+            if count == 1:
+                redis.expire(key, self.period * 2)
+            if count <= self.limit:
+                return
+            await asyncio.sleep((window + 1) * self.period - time.time())
@@ -0,0 +1,135 @@
+"""
+Benchmark insight generation for a user with many recent transactions.
+
+Seeds one user with synthetic transactions dated within the last 30 days,
+then times the previous approach, which hydrated every Transaction and
+summed in Python, against generate_insights, which reads the daily spending
+rollup, and against the nightly job's computation, which also loads every
+payment for the percentile insights.
+Run it against a scratch database, since it creates tables and rows:
+
+    ENV=testing DATABASE_URL=sqlite:////tmp/insights.db \\
+        python scripts/bench_insights.py [--rows 100000] [--repeat 5]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from uuid import UUID, uuid4
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlmodel import Session, SQLModel, select  # noqa: E402
+from app.crud import bulk_insert_transactions  # noqa: E402
+from app.db.session import engine  # noqa: E402
+from app.models import LinkedAccount, Transaction, User  # noqa: E402
+from app.services.insights import compute_insights, generate_insights  # noqa: E402
+
+SEED_BATCH_SIZE = 10_000
+CATEGORIES = ["food & drink", "transport", "bills", "shopping", "entertainment"]
+
+
+def seed(rows: int) -> UUID:
+    """Create a user with `rows` transactions spread over the last 30 days."""
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as db:
+        user = User(
+            encrypted_email=f"insights-{uuid4()}",
+            hashed_email=f"insights-{uuid4()}",
+            first_name="Insights",
+            last_name="Bench",
+            hashed_password="x",
+        )
+        account = LinkedAccount(
+            user_id=user.id,
+            provider_account_id="insights-bench",
+            account_name="Insights Bench",
+            account_type="SAVINGS_ACCOUNT",
+            balance="0",
+            institution={},
+        )
+        db.add(user)
+        db.add(account)
+        db.commit()
+        user_id, account_id = user.id, account.id
+
+        now = datetime.now()
+        today = date.today()
+        for start in range(0, rows, SEED_BATCH_SIZE):
+            batch = [
+                {
+                    "id": uuid4(),
+                    "account_id": account_id,
+                    "user_id": user_id,
+                    "transaction_id": f"insights_{i:08d}",
+                    "category": CATEGORIES[i % len(CATEGORIES)],
+                    "transaction_type": "debit" if i % 5 else "credit",
+                    "amount": 500 + (i * 7919) % 2_500_000,
+                    "currency": "NGN",
+                    "raw_description": f"POS PURCHASE MERCHANT {i % 997} LAGOS",
+                    "normalized_description": f"Merchant {i % 997}",
+                    "transaction_date": today - timedelta(days=i % 30),
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for i in range(start, min(start + SEED_BATCH_SIZE, rows))
+            ]
+            bulk_insert_transactions(db=db, transactions=batch)
+            db.commit()
+    return user_id
+
+
+def previous_generate_insights(db: Session, user_id: UUID) -> dict:
+    """The previous implementation's query and Python loop."""
+    last_30_days = date.today() - timedelta(days=30)
+    statement = select(Transaction).where(
+        Transaction.user_id == user_id,
+        Transaction.transaction_date >= last_30_days,
+    )
+    total_spent = 0
+    spent_by_category = defaultdict(float)
+    for tx in db.exec(statement).all():
+        total_spent += tx.amount / 100
+        if tx.amount > 0:
+            spent_by_category[tx.category] += tx.amount
+    return spent_by_category
+
+
+def nightly_insights(db: Session, user_id: UUID) -> list:
+    """The nightly job's computation, including the payment insights."""
+    return compute_insights(db=db, user_ids=[user_id])[user_id]
+
+
+def timed(func, user_id: UUID, repeat: int) -> float:
+    """Median seconds for func over `repeat` runs, each on a fresh session."""
+    timings = []
+    for _ in range(repeat):
+        with Session(engine) as db:
+            started = time.perf_counter()
+            func(db, user_id)
+            timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    user_id = seed(args.rows)
+    previous = timed(previous_generate_insights, user_id, args.repeat)
+    current = timed(generate_insights, user_id, args.repeat)
+    nightly = timed(nightly_insights, user_id, args.repeat)
+    print(f"rows: {args.rows}")
+    print(f"hydrate and loop: {previous * 1000:9.1f} ms")
+    print(f"rollup queries:   {current * 1000:9.1f} ms ({previous / current:.1f}x)")
+    print(f"nightly job:      {nightly * 1000:9.1f} ms ({previous / nightly:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
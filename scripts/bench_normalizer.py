@@ -0,0 +1,110 @@
+"""
+Benchmark transaction narration matching.
+
+Compares the previous nested-loop normalize_description/categorize_transaction
+pair, as called by sync, with the compiled single pass match_description and
+the memoized categorize_batch over synthetic bank narrations.
+
+    ENV=testing python scripts/bench_normalizer.py [--count 1000000] [--batch 100] \
+        [--distinct 5000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.normalizer import (  # noqa: E402
+    categorization_cache_info,
+    categorize_batch,
+    category_rules,
+    match_description,
+    merchant_app,
+)
+
+NARRATION_TEMPLATES = [
+    "POS PURCHASE {merchant} {place} {ref}",
+    "WEB PURCHASE {merchant}.COM {ref}",
+    "NIP TRANSFER TO {name} {ref}",
+    "TRF FROM {name} SALARY {ref}",
+    "{merchant} {place} CARD PAYMENT {ref}",
+    "ATM WDL {place} {ref}",
+    "AIRTIME RECHARGE {ref}",
+    "SMS ALERT CHARGE {ref}",
+]
+MERCHANTS = list(merchant_app) + ["SHOPRITE", "MTN", "GLO", "BOLT", "KFC", "HOTEL"]
+PLACES = ["LEKKI", "IKEJA", "VI", "ABUJA", "YABA", "SURULERE"]
+NAMES = ["JOHN DOE", "ADA OBI", "TUNDE BAKARE", "CHIOMA EZE"]
+
+
+def legacy_normalize(description: str) -> str:
+    for key, value in merchant_app.items():
+        if key in description.upper():
+            return value
+    return description
+
+
+def legacy_categorize(description: str) -> str:
+    normalized_description = legacy_normalize(description)
+    for category, keywords in category_rules.items():
+        for keyword in keywords:
+            if keyword.upper() in normalized_description.upper():
+                return category
+    return "other"
+
+
+def legacy_match(description: str) -> tuple[str, str]:
+    normalized_description = legacy_normalize(description)
+    return normalized_description, legacy_categorize(normalized_description)
+
+
+def narrations(count: int, distinct: int) -> list[str]:
+    """Sample count narrations from a pool of distinct ones, as banks repeat."""
+    rng = random.Random(42)
+    pool = [
+        rng.choice(NARRATION_TEMPLATES).format(
+            merchant=rng.choice(MERCHANTS),
+            place=rng.choice(PLACES),
+            name=rng.choice(NAMES),
+            ref=rng.randrange(10**9),
+        )
+        for _ in range(distinct)
+    ]
+    return rng.choices(pool, k=count)
+
+
+def timed(label: str, func, data: list[str]) -> list:
+    start = time.perf_counter()
+    results = [func(narration) for narration in data]
+    elapsed = time.perf_counter() - start
+    print(f"{label:<10} {elapsed:8.3f}s  {len(data) / elapsed:12,.0f} narrations/s")
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=1_000_000)
+    parser.add_argument("--batch", type=int, default=100)
+    parser.add_argument("--distinct", type=int, default=5_000)
+    args = parser.parse_args()
+
+    data = narrations(args.count, args.distinct)
+    legacy = timed("legacy", legacy_match, data)
+    compiled = timed("compiled", match_description, data)
+    assert legacy == compiled, "compiled matcher disagrees with the legacy rules"
+
+    # Sync categorizes a page of narrations at a time
+    batches = [data[i : i + args.batch] for i in range(0, len(data), args.batch)]
+    start = time.perf_counter()
+    batched = [result for batch in batches for result in categorize_batch(batch)]
+    elapsed = time.perf_counter() - start
+    print(f"{'batched':<10} {elapsed:8.3f}s  {len(data) / elapsed:12,.0f} narrations/s")
+    print(f"cache      {categorization_cache_info()}")
+    assert legacy == batched, "batched matcher disagrees with the legacy rules"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Benchmark the transaction sync insert path.
+
+Compares the previous per-row ingestion (one SELECT per transaction followed by
+``session.add``) with ``bulk_insert_transactions`` for a 10k row sync, both on
+an empty table and on a re-sync where every row already exists.
+
+Run from the project root with an environment file configured:
+
+    ENV=testing python scripts/bench_transaction_sync.py [--rows 10000] [--db-url URL]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from uuid import uuid4
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlmodel import Session, SQLModel, create_engine, delete  # noqa: E402
+
+from app.crud import (  # noqa: E402
+    bulk_insert_transactions,
+    get_transaction_by_transaction_id,
+)
+from app.db.categories import transaction_categories  # noqa: E402
+from app.models import LinkedAccount, Transaction, User  # noqa: E402
+
+
+def make_rows(account_id, user_id, count: int) -> list[dict]:
+    now = datetime.now()
+    today = date.today()
+    return [
+        {
+            "id": uuid4(),
+            "account_id": account_id,
+            "user_id": user_id,
+            "transaction_id": f"txn_{i:08d}",
+            "category": "other",
+            "transaction_type": "debit" if i % 3 else "credit",
+            "amount": 100 + i % 50_000,
+            "currency": "NGN",
+            "raw_description": f"POS PURCHASE {i % 97}",
+            "normalized_description": "POS Withdrawal",
+            "transaction_date": today - timedelta(days=i % 365),
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i in range(count)
+    ]
+
+
+def per_row_sync(session: Session, rows: list[dict]) -> int:
+    inserted = 0
+    transaction_categories.register(db=session, names={row["category"] for row in rows})
+    session.commit()
+    for row in rows:
+        if get_transaction_by_transaction_id(
+            db=session, transaction_id=row["transaction_id"]
+        ):
+            continue
+        session.add(Transaction(**row))
+        inserted += 1
+    session.commit()
+    return inserted
+
+
+def bulk_sync(session: Session, rows: list[dict]) -> int:
+    inserted, _ = bulk_insert_transactions(db=session, transactions=rows)
+    session.commit()
+    return len(inserted)
+
+
+def timed(label: str, func, session: Session, rows: list[dict]) -> None:
+    start = time.perf_counter()
+    inserted = func(session, rows)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<32} {elapsed:8.3f}s  inserted={inserted}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--db-url", default=None)
+    args = parser.parse_args()
+
+    db_url = args.db_url
+    if not db_url:
+        db_url = f"sqlite:///{tempfile.mkdtemp()}/bench_sync.db"
+    engine = create_engine(db_url)
+    SQLModel.metadata.create_all(engine)
+
+    with Session(engine) as session:
+        user = User(
+            encrypted_email=f"bench-{uuid4()}",
+            hashed_email=f"bench-{uuid4()}",
+            first_name="Bench",
+            last_name="User",
+            hashed_password="x",
+        )
+        account = LinkedAccount(
+            user_id=user.id,
+            provider_account_id="bench",
+            account_name="bench",
+            account_type="savings",
+            balance="0",
+            institution={},
+        )
+        session.add(user)
+        session.add(account)
+        session.commit()
+
+        for label, func in (("per-row", per_row_sync), ("bulk", bulk_sync)):
+            session.exec(delete(Transaction))
+            session.commit()
+            rows = make_rows(account.id, user.id, args.rows)
+            timed(f"{label} ({args.rows} new rows)", func, session, rows)
+            rows = make_rows(account.id, user.id, args.rows)
+            timed(f"{label} ({args.rows} existing rows)", func, session, rows)
+
+
+if __name__ == "__main__":
+    main()
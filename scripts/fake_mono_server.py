@@ -0,0 +1,129 @@
+"""
+A local stand-in for the Mono API, for exercising MonoClient and the sync
+pipeline without touching the real service.
+
+Serves deterministic synthetic transactions, paginated like Mono's v2 API, and
+can inject rate limiting and server errors. Point MONO_BASE_URL at it:
+
+    FAKE_MONO_TRANSACTIONS=50000 FAKE_MONO_FAILURE_RATE=0.05 \\
+        uvicorn fake_mono_server:app --app-dir scripts --port 9999
+    MONO_BASE_URL=http://localhost:9999
+"""
+
+import os
+import random
+from datetime import datetime, timedelta, timezone
+
+from fastapi import FastAPI, Query, Request
+from fastapi.responses import JSONResponse
+
+TRANSACTION_COUNT = int(os.getenv("FAKE_MONO_TRANSACTIONS", "1000"))
+PAGE_SIZE = int(os.getenv("FAKE_MONO_PAGE_SIZE", "100"))
+FAILURE_RATE = float(os.getenv("FAKE_MONO_FAILURE_RATE", "0"))
+MONO_DATE_FORMAT = "%d-%m-%Y"
+
+NARRATIONS = [
+    "POS PURCHASE SPAR LEKKI",
+    "NETFLIX.COM SUBSCRIPTION",
+    "UBER TRIP LAGOS",
+    "TRANSFER TO JOHN DOE",
+    "DSTV PREMIUM RENEWAL",
+    "JUMIA ONLINE ORDER",
+    "IKEJA ELECTRICITY PREPAID",
+    "CHICKEN REPUBLIC VI",
+    "ATM WITHDRAWAL",
+    "SALARY CREDIT",
+]
+
+app = FastAPI(title="Fake Mono")
+
+
+def transaction(index: int) -> dict:
+    """Build the synthetic transaction at position index, newest first."""
+    posted = datetime(2025, 6, 30, tzinfo=timezone.utc) - timedelta(hours=index * 7)
+    narration = NARRATIONS[index % len(NARRATIONS)]
+    return {
+        "id": f"fake_txn_{index:08d}",
+        "narration": narration,
+        "amount": 500 + (index * 7919) % 2_500_000,
+        "type": "credit" if narration == "SALARY CREDIT" else "debit",
+        "balance": 10_000_000,
+        "date": posted.isoformat().replace("+00:00", "Z"),
+        "category": "unknown",
+        "currency": "NGN",
+    }
+
+
+@app.middleware("http")
+async def inject_failures(request: Request, call_next):
+    if FAILURE_RATE and random.random() < FAILURE_RATE:
+        status_code = random.choice([429, 503])
+        return JSONResponse(
+            {"status": "failed", "message": "Injected failure"},
+            status_code=status_code,
+            headers={"Retry-After": "1"} if status_code == 429 else None,
+        )
+    return await call_next(request)
+
+
+@app.post("/v2/accounts/auth")
+async def token_exchange():
+    return {"status": "successful", "data": {"id": "fake_account"}}
+
+
+@app.get("/v2/accounts/{account_id}")
+async def account_details(account_id: str):
+    return {
+        "status": "successful",
+        "data": {
+            "account": {
+                "id": account_id,
+                "name": "Fake Account",
+                "type": "SAVINGS_ACCOUNT",
+                "account_number": "0123456789",
+                "balance": 10_000_000,
+                "currency": "NGN",
+                "institution": {"name": "Fake Bank", "bank_code": "000"},
+            }
+        },
+    }
+
+
+@app.get("/v2/accounts/{account_id}/transactions")
+async def transactions(
+    request: Request,
+    account_id: str,
+    start: str | None = None,
+    end: str | None = None,
+    paginate: bool = True,
+    page: int = Query(1, ge=1),
+):
+    start_date = datetime.strptime(start, MONO_DATE_FORMAT).date() if start else None
+    end_date = datetime.strptime(end, MONO_DATE_FORMAT).date() if end else None
+
+    # The data set is ordered newest first, so matching rows are contiguous
+    rows = [transaction(i) for i in range(TRANSACTION_COUNT)]
+    rows = [
+        row
+        for row in rows
+        if (not start_date or row["date"][:10] >= start_date.isoformat())
+        and (not end_date or row["date"][:10] <= end_date.isoformat())
+    ]
+    if not paginate:
+        return {"status": "successful", "data": rows, "meta": {"total": len(rows)}}
+
+    offset = (page - 1) * PAGE_SIZE
+    has_next = offset + PAGE_SIZE < len(rows)
+    next_url = None
+    if has_next:
+        next_url = str(request.url.include_query_params(page=page + 1))
+    return {
+        "status": "successful",
+        "data": rows[offset : offset + PAGE_SIZE],
+        "meta": {
+            "total": len(rows),
+            "page": page,
+            "previous": None,
+            "next": next_url,
+        },
+    }
@@ -0,0 +1,49 @@
+"""
+Copy a local SQLite primary into a replica file, to try read replica routing
+without a PostgreSQL standby.
+
+With --interval the copy repeats, so the replica lags the primary by up to
+that many seconds, like asynchronous streaming replication:
+
+    python scripts/sync_sqlite_replica.py primary.db replica.db [--interval 5]
+"""
+
+import argparse
+import sqlite3
+import time
+
+
+def copy_database(primary: str, replica: str) -> None:
+    """Replace the replica with a consistent snapshot of the primary."""
+    source = sqlite3.connect(primary)
+    target = sqlite3.connect(replica)
+    try:
+        with target:
+            source.backup(target)
+    finally:
+        target.close()
+        source.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("primary", help="Path of the primary SQLite database")
+    parser.add_argument("replica", help="Path of the replica SQLite database")
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=0,
+        help="Seconds between copies, copy once when 0",
+    )
+    args = parser.parse_args()
+
+    while True:
+        copy_database(args.primary, args.replica)
+        print(f"Copied {args.primary} to {args.replica}")
+        if not args.interval:
+            break
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
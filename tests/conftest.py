@@ -0,0 +1,39 @@
+import os
+import tempfile
+from cryptography.fernet import Fernet
+
+# Settings are read when app is first imported, so the required ones get
+# throwaway values here unless the environment provides them. The tests
+# create tables and rows, so they default to a scratch SQLite database
+os.environ.setdefault("ENV", "testing")
+os.environ.setdefault(
+    "DATABASE_URL",
+    f"sqlite:///{os.path.join(tempfile.gettempdir(), 'trackify_tests.db')}",
+)
+for name in (
+    "MONO_BASE_URL",
+    "MONO_SECRET_KEY",
+    "MONO_WEBHOOK_SECRET",
+    "GOOGLE_API_KEY",
+    "CELERY_TIME_ZONE",
+    "SECRET_KEY",
+    "EMAIL_USER",
+    "EMAIL_PASSWORD",
+):
+    os.environ.setdefault(name, "test")
+os.environ.setdefault("CELERY_BROKER_URL", "redis://localhost:6379/0")
+os.environ.setdefault("CELERY_RESULT_BACKEND", "redis://localhost:6379/1")
+os.environ.setdefault("ENCRYPTION_KEY", Fernet.generate_key().decode())
+
+import pytest  # noqa: E402
+from sqlmodel import SQLModel  # noqa: E402
+from app.db.session import engine  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def database():
+    """Create every table on the scratch database for the test session."""
+    SQLModel.metadata.drop_all(engine)
+    SQLModel.metadata.create_all(engine)
+    yield engine
+    SQLModel.metadata.drop_all(engine)
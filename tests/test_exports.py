@@ -0,0 +1,93 @@
+import tracemalloc
+from datetime import date, datetime, timedelta
+from uuid import uuid4
+import pytest
+from sqlmodel import Session
+from app.core import settings
+from app.crud import bulk_insert_transactions
+from app.models import LinkedAccount, User
+from app.schemas import TransactionFilter
+from app.services.exports import export_transactions
+
+# Scaled down from the 500k row bound, with batches scaled down to match so
+# the export still spans many of them
+EXPORT_ROWS = 20_000
+EXPORT_BATCH_SIZE = 500
+EXPORT_PEAK_CEILING_MB = 8
+
+SEED_BATCH_SIZE = 5_000
+
+
+@pytest.fixture(scope="module")
+def export_account(database):
+    """A user with a linked account holding EXPORT_ROWS transactions."""
+    with Session(database) as db:
+        user = User(
+            encrypted_email=f"export-{uuid4()}",
+            hashed_email=f"export-{uuid4()}",
+            first_name="Export",
+            last_name="Test",
+            hashed_password="x",
+        )
+        account = LinkedAccount(
+            user_id=user.id,
+            provider_account_id="export-test",
+            account_name="Export Test",
+            account_type="SAVINGS_ACCOUNT",
+            balance="0",
+            institution={},
+        )
+        db.add(user)
+        db.add(account)
+        db.commit()
+        user_id, account_id = user.id, account.id
+
+        now = datetime.now()
+        for start in range(0, EXPORT_ROWS, SEED_BATCH_SIZE):
+            batch = [
+                {
+                    "id": uuid4(),
+                    "account_id": account_id,
+                    "user_id": user_id,
+                    "transaction_id": f"export_{i:08d}",
+                    "category": ["food & drink", "transport", "bills"][i % 3],
+                    "transaction_type": "debit" if i % 5 else "credit",
+                    "amount": 500 + (i * 7919) % 2_500_000,
+                    "currency": "NGN",
+                    "raw_description": f"POS PURCHASE MERCHANT {i % 997} LAGOS",
+                    "normalized_description": f"Merchant {i % 997}",
+                    "transaction_date": date(2015, 1, 1) + timedelta(days=i // 100),
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for i in range(start, min(start + SEED_BATCH_SIZE, EXPORT_ROWS))
+            ]
+            bulk_insert_transactions(db=db, transactions=batch)
+            db.commit()
+    return user_id, account_id
+
+
+@pytest.mark.parametrize("export_format", ["ndjson", "csv", "parquet", "arrow"])
+def test_export_streams_in_bounded_memory(export_account, export_format, monkeypatch):
+    """An export's peak Python heap stays within a ceiling, however many rows."""
+    monkeypatch.setattr(settings, "EXPORT_BATCH_SIZE", EXPORT_BATCH_SIZE)
+    user_id, account_id = export_account
+
+    tracemalloc.start()
+    try:
+        size = sum(
+            len(chunk)
+            for chunk in export_transactions(
+                user_id=user_id,
+                filters=TransactionFilter(),
+                export_format=export_format,
+                account_id=account_id,
+                compression="zstd",
+            )
+        )
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert size > 0
+    assert peak / 1024 / 1024 <= EXPORT_PEAK_CEILING_MB
@@ -0,0 +1,290 @@
+"""
+Check that the hot CRUD queries are served by indexes.
+
+The scratch database is seeded with users, linked accounts, transactions,
+insights and OTPs and analyzed, then each hot CRUD function is called while
+capturing the SELECT statements it sends. Every captured statement is run
+again under EXPLAIN, and fails the test when its plan reads a whole table
+with a sequential scan. SQLite databases are checked with EXPLAIN QUERY PLAN;
+point DATABASE_URL at a scratch PostgreSQL database to check its plans.
+"""
+
+import re
+from datetime import date, datetime, timedelta
+from uuid import uuid4
+import pytest
+from sqlalchemy import event, insert, text
+from sqlmodel import Session
+from app.api.deps import get_user_by_email
+from app.crud import (
+    get_category_totals,
+    get_category_totals_for_users,
+    get_current_insights,
+    get_daily_totals,
+    get_insights_page,
+    get_linked_account_by_id,
+    get_linked_accounts_by_user_id,
+    get_new_debits,
+    get_recurring_payments,
+    get_transaction_by_transaction_id,
+    get_transactions_page,
+    iter_transactions,
+    iter_user_debits,
+    rebuild_daily_spend,
+)
+from app.crud.crud_otp import get_otp_by_user_id_and_is_used
+from app.db.categories import transaction_categories
+from app.models import OTP, Insight, LinkedAccount, Transaction, User
+from app.schemas import TransactionFilter
+from app.services.spending_analytics import (
+    load_payment_amounts,
+    load_spending_arrays,
+)
+from app.utils.helpers import hash_email
+
+# Enough rows that a planner with statistics prefers an index to a scan
+PLAN_USERS = 50
+PLAN_TRANSACTIONS = 50
+
+CATEGORIES = ["food & drink", "transport", "bills", "shopping", "entertainment"]
+
+# A full table read in SQLite's EXPLAIN QUERY PLAN, e.g. "SCAN transactions"
+SQLITE_TABLE_SCAN = re.compile(r"^SCAN (?:TABLE )?(\w+)(?: AS \w+)?$")
+
+
+def _month_ago() -> date:
+    return date.today() - timedelta(days=30)
+
+
+def _second_page(db, ids):
+    _, cursor = get_transactions_page(db=db, account_id=ids["account_id"], limit=20)
+    return get_transactions_page(
+        db=db, account_id=ids["account_id"], limit=20, cursor=cursor
+    )
+
+
+# The CRUD calls made on every request or sync, by name
+HOT_QUERIES = {
+    "user by email": lambda db, ids: get_user_by_email(db, ids["email"]),
+    "linked account by id": lambda db, ids: get_linked_account_by_id(
+        db=db, account_id=ids["account_id"]
+    ),
+    "linked accounts of a user": lambda db, ids: get_linked_accounts_by_user_id(
+        db=db, user_id=ids["user_id"]
+    ),
+    "transactions page": lambda db, ids: get_transactions_page(
+        db=db, account_id=ids["account_id"], limit=20
+    ),
+    "transactions second page": _second_page,
+    "transactions page by category": lambda db, ids: get_transactions_page(
+        db=db,
+        account_id=ids["account_id"],
+        limit=20,
+        filters=TransactionFilter(category="bills"),
+    ),
+    "transactions page by type": lambda db, ids: get_transactions_page(
+        db=db,
+        account_id=ids["account_id"],
+        limit=20,
+        filters=TransactionFilter(transaction_type="credit"),
+    ),
+    "transaction by provider id": lambda db, ids: get_transaction_by_transaction_id(
+        db=db, transaction_id=ids["transaction_id"]
+    ),
+    "transactions export": lambda db, ids: list(
+        iter_transactions(
+            db=db,
+            user_id=ids["user_id"],
+            columns=[Transaction.id, Transaction.amount],
+            filters=TransactionFilter(start_date=_month_ago()),
+        )
+    ),
+    "category totals of many users": lambda db, ids: get_category_totals_for_users(
+        db=db, user_ids=[ids["user_id"]], start_date=_month_ago()
+    ),
+    "daily totals of many users": lambda db, ids: load_spending_arrays(
+        db=db, user_ids=[ids["user_id"]], start_date=_month_ago()
+    ),
+    "payments of many users": lambda db, ids: load_payment_amounts(
+        db=db, user_ids=[ids["user_id"]], start_date=_month_ago()
+    ),
+    "category totals": lambda db, ids: get_category_totals(
+        db=db, user_id=ids["user_id"], start_date=_month_ago()
+    ),
+    "daily totals": lambda db, ids: get_daily_totals(
+        db=db, user_id=ids["user_id"], start_date=_month_ago()
+    ),
+    "current insights": lambda db, ids: get_current_insights(
+        db=db, user_id=ids["user_id"], period="30d"
+    ),
+    "insights page": lambda db, ids: get_insights_page(
+        db=db, user_id=ids["user_id"], limit=20
+    ),
+    "unused OTP": lambda db, ids: get_otp_by_user_id_and_is_used(
+        db=db, user_id=ids["user_id"]
+    ),
+    "new debits of an account": lambda db, ids: get_new_debits(
+        db=db,
+        account_id=ids["account_id"],
+        since=datetime.now() - timedelta(days=1),
+    ),
+    "recurring payments": lambda db, ids: get_recurring_payments(
+        db=db, user_id=ids["user_id"]
+    ),
+    "debits of a user": lambda db, ids: list(
+        iter_user_debits(db=db, user_id=ids["user_id"])
+    ),
+}
+
+
+@pytest.fixture(scope="module")
+def plan_ids(database):
+    """
+    Create PLAN_USERS users with two linked accounts of PLAN_TRANSACTIONS
+    rows each, ten insights and two OTPs, and return the ids the hot queries
+    filter on.
+    """
+    now = datetime.now()
+    today = date.today()
+    sample = {}
+    with Session(database) as db:
+        transaction_categories.register(db=db, names=CATEGORIES)
+        db.commit()
+        for number in range(PLAN_USERS):
+            user_id = uuid4()
+            user_rows = [
+                {
+                    "id": user_id,
+                    "encrypted_email": f"plans-{user_id}",
+                    "hashed_email": hash_email(f"plans-{user_id}@example.com"),
+                    "first_name": "Query",
+                    "last_name": "Plans",
+                    "hashed_password": "x",
+                }
+            ]
+            account_rows = [
+                {
+                    "id": uuid4(),
+                    "user_id": user_id,
+                    "provider_account_id": f"plans-{uuid4()}",
+                    "account_name": "Query Plans",
+                    "account_type": "SAVINGS_ACCOUNT",
+                    "balance": "0",
+                    "institution": {},
+                }
+                for _ in range(2)
+            ]
+            transaction_rows = [
+                {
+                    "id": uuid4(),
+                    "account_id": account["id"],
+                    "user_id": user_id,
+                    "transaction_id": f"plans_{account['id'].hex}_{i:06d}",
+                    "category": CATEGORIES[i % len(CATEGORIES)],
+                    "transaction_type": "debit" if i % 5 else "credit",
+                    "amount": 500 + (i * 7919) % 2_500_000,
+                    "currency": "NGN",
+                    "raw_description": f"POS PURCHASE MERCHANT {i % 97} LAGOS",
+                    "normalized_description": f"Merchant {i % 97}",
+                    "transaction_date": today - timedelta(days=i % 365),
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for account in account_rows
+                for i in range(PLAN_TRANSACTIONS)
+            ]
+            insight_rows = [
+                {
+                    "id": uuid4(),
+                    "user_id": user_id,
+                    "period": ["7d", "30d"][i % 2],
+                    "kind": f"kind_{i}",
+                    "message": "Query plan insight",
+                    "type": "info",
+                    "created_at": now - timedelta(hours=i),
+                    "updated_at": now,
+                }
+                for i in range(10)
+            ]
+            otp_rows = [
+                {
+                    "id": uuid4(),
+                    "user_id": user_id,
+                    "otp_code": "x",
+                    "is_used": is_used,
+                    "created_at": now,
+                }
+                for is_used in (True, False)
+            ]
+            db.execute(insert(User), user_rows)
+            db.execute(insert(LinkedAccount), account_rows)
+            db.execute(insert(Transaction), transaction_rows)
+            db.execute(insert(Insight), insight_rows)
+            db.execute(insert(OTP), otp_rows)
+            if number == PLAN_USERS // 2:
+                sample = {
+                    "user_id": user_id,
+                    "email": f"plans-{user_id}@example.com",
+                    "account_id": account_rows[0]["id"],
+                    "transaction_id": transaction_rows[0]["transaction_id"],
+                }
+        db.commit()
+        rebuild_daily_spend(db=db)
+        db.commit()
+        db.execute(text("ANALYZE"))
+        db.commit()
+    return sample
+
+
+def _capture_selects(db: Session, query) -> list[tuple[str, object]]:
+    """Run a CRUD call and return the SELECT statements it executed."""
+    statements = []
+    engine = db.get_bind()
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        query(db)
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    return statements
+
+
+def _postgresql_seq_scans(plan: dict) -> list[str]:
+    tables = []
+    if plan.get("Node Type") == "Seq Scan":
+        tables.append(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        tables.extend(_postgresql_seq_scans(child))
+    return tables
+
+
+def _sequential_scans(db: Session, statement: str, parameters) -> list[str]:
+    """The tables a statement's plan reads in full."""
+    connection = db.connection()
+    if connection.dialect.name == "postgresql":
+        plan = connection.exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {statement}", parameters
+        ).scalar()
+        return _postgresql_seq_scans(plan[0]["Plan"])
+    rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+    return [
+        match.group(1) for row in rows if (match := SQLITE_TABLE_SCAN.match(row[-1]))
+    ]
+
+
+@pytest.mark.parametrize("name", list(HOT_QUERIES))
+def test_hot_query_uses_an_index(database, plan_ids, name):
+    """A hot query never reads a whole table, however many rows it holds."""
+    with Session(database) as db:
+        statements = _capture_selects(db, lambda db: HOT_QUERIES[name](db, plan_ids))
+        assert statements, f"{name} executed no SELECT"
+        tables = {
+            table
+            for statement, parameters in statements
+            for table in _sequential_scans(db, statement, parameters)
+        }
+    assert not tables, f"{name} reads whole tables: {', '.join(sorted(tables))}"
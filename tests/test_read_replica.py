@@ -0,0 +1,81 @@
+import asyncio
+from types import SimpleNamespace
+from uuid import uuid4
+import pytest
+import redis
+from sqlalchemy.ext.asyncio import create_async_engine
+from app.api import deps
+from app.core import settings
+from app.db import session as db_session
+
+
+class FakeRedis:
+    """The subset of the Redis client that read routing uses."""
+
+    def __init__(self):
+        self.keys = {}
+
+    def set(self, key, value, ex=None):
+        self.keys[key] = value
+
+    def exists(self, key):
+        return int(key in self.keys)
+
+
+@pytest.fixture
+def replica(monkeypatch, tmp_path):
+    """
+    Configure a replica with its own async engine, distinct from the
+    primary's, and an in-memory Redis for the recent write markers.
+    """
+    path = tmp_path / "replica.db"
+    replica_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    fake_redis = FakeRedis()
+    monkeypatch.setattr(settings, "DATABASE_REPLICA_URL", f"sqlite:///{path}")
+    monkeypatch.setattr(deps, "async_replica_engine", replica_engine)
+    monkeypatch.setattr(db_session, "get_redis", lambda: fake_redis)
+    yield replica_engine
+    asyncio.run(replica_engine.dispose())
+
+
+def _read_session_bind(user_id):
+    """The engine a user's read session is bound to."""
+
+    async def bind():
+        sessions = deps.get_user_read_session(SimpleNamespace(id=user_id))
+        session = await anext(sessions)
+        try:
+            return session.bind
+        finally:
+            await sessions.aclose()
+
+    return asyncio.run(bind())
+
+
+def test_reads_go_to_the_replica(replica):
+    assert _read_session_bind(uuid4()) is replica
+
+
+def test_reads_go_to_the_primary_after_a_write(replica):
+    writer, other = uuid4(), uuid4()
+    db_session.mark_recent_write(writer)
+
+    assert _read_session_bind(writer) is deps.async_engine
+    assert _read_session_bind(other) is replica
+
+
+def test_reads_go_to_the_primary_when_redis_is_down(replica, monkeypatch):
+    def unavailable():
+        raise redis.ConnectionError("Redis is down")
+
+    monkeypatch.setattr(db_session, "get_redis", unavailable)
+
+    assert _read_session_bind(uuid4()) is deps.async_engine
+
+
+def test_reads_go_to_the_primary_without_a_replica(monkeypatch):
+    monkeypatch.setattr(settings, "DATABASE_REPLICA_URL", None)
+    user_id = uuid4()
+    db_session.mark_recent_write(user_id)
+
+    assert _read_session_bind(user_id) is deps.async_engine